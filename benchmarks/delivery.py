@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Subscriber Delivery Benchmark
+=============================
+
+Measure commit throughput in a running event loop with per-subscriber delivery workers against
+the previous task per commit scheduling, and count deliveries which did not match the commit
+sequence. The task per commit rounds read the latest reference when they run, so subscribers see
+duplicated, skipped and reordered commits.
+
+.. code-block:: console
+
+    python3 -m benchmarks.delivery --commits 20000 --subscribers 4
+"""
+
+import time
+import random
+import asyncio
+import logging
+import argparse
+from typing import Any, Dict, List
+
+from myosin import State, StateModel
+from myosin.state.ssm import SSM
+
+
+class Counter(StateModel):
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.count = 0
+
+    def serialize(self) -> Dict[str, Any]:
+        return {'id': self.id, 'count': self.count}
+
+    def deserialize(self, **kwargs) -> None:
+        for k, v in kwargs.items():
+            setattr(self, k, v)
+
+
+class Consumer:
+
+    def __init__(self, jitter: bool) -> None:
+        self.jitter = jitter
+        self.received: List[int] = []
+
+    async def __call__(self, counter: Counter) -> None:
+        if self.jitter and random.random() < 0.5:
+            await asyncio.sleep(0)
+        self.received.append(counter.count)
+
+    @property
+    def misdelivered(self) -> int:
+        """
+        Number of deliveries which were not the expected commit in sequence
+        """
+        return sum(1 for expected, count in enumerate(self.received, 1) if count != expected)
+
+
+async def run(commits: int, subscribers: int, legacy: bool) -> None:
+    State._ssm.clear()
+    with State() as state:
+        state.load(Counter())
+        consumers = [Consumer(jitter=True) for _ in range(subscribers)]
+        for consumer in consumers:
+            state.subscribe(Counter, consumer)
+    ssm = State._ssm[hash(Counter)]
+    if legacy:
+        # previous behaviour: a new delivery round task per commit
+        def execute(self: SSM = ssm, future: bool = False) -> None:
+            asyncio.get_running_loop().create_task(self.cb_runner())
+        ssm.execute = execute  # type: ignore
+    counter = Counter()
+    start = time.perf_counter()
+    state = State(Counter)
+    for i in range(1, commits + 1):
+        counter.count = i
+        with state:
+            state.commit(counter)
+        if i % 100 == 0:
+            # yield so deliveries interleave with commits as in a live system
+            await asyncio.sleep(0)
+    committed = time.perf_counter() - start
+    while any(len(c.received) < commits for c in consumers):
+        await asyncio.sleep(0)
+    delivered = time.perf_counter() - start
+    label = "task per commit" if legacy else "subscriber workers"
+    print(f"{label:<20}{commits / committed:>12.0f} commits/s{commits / delivered:>12.0f} delivered/s"
+          f"{sum(c.misdelivered for c in consumers):>10} misdelivered")
+    State._ssm.clear()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--commits", type=int, default=20000, help="number of commits")
+    parser.add_argument("--subscribers", type=int, default=4, help="number of subscribers")
+    args = parser.parse_args()
+    logging.disable()
+    asyncio.run(run(args.commits, args.subscribers, legacy=True))
+    asyncio.run(run(args.commits, args.subscribers, legacy=False))
+
+
+if __name__ == "__main__":
+    main()
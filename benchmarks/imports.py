@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Import Time Benchmark
+=====================
+
+Measure the time to ``import myosin`` in fresh interpreters with the metrics backend disabled and
+check that optional dependencies and feature modules which are imported on first use are not
+imported by the engine. Exits with a non-zero status if a deferred module was imported or the
+fastest import exceeds ``--limit``.
+
+.. code-block:: console
+
+    python3 -m benchmarks.imports --runs 20 --limit 0.1
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+from typing import List, Tuple
+
+#: modules which must not be imported by ``import myosin``
+DEFERRED = (
+    "prometheus_client",
+    "numpy",
+    "msgpack",
+    "pickle",
+    "mmap",
+    "tracemalloc",
+    "multiprocessing",
+    "concurrent.futures.process",
+    "myosin.state.stream",
+    "myosin.state.window",
+    "myosin.state.history",
+    "myosin.state.columns",
+    "myosin.state.replay",
+    "myosin.state.ingest",
+    "myosin.state.loader",
+    "myosin.state.partition",
+)
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+import myosin
+elapsed = time.perf_counter() - start
+print(elapsed)
+print(",".join(name for name in {deferred!r} if name in sys.modules))
+"""
+
+
+def probe() -> Tuple[float, List[str]]:
+    env = dict(os.environ, MYOSIN_METRICS="none")
+    output = subprocess.run([sys.executable, "-c", _PROBE.format(deferred=DEFERRED)], env=env, check=True,
+                            capture_output=True, text=True).stdout.splitlines()
+    return float(output[0]), [name for name in output[1].split(",") if name]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--runs", type=int, default=20, help="number of fresh interpreters")
+    parser.add_argument("--limit", type=float, default=None, help="maximum import time in seconds")
+    args = parser.parse_args()
+    # the first run writes the bytecode cache
+    probe()
+    timings = []
+    imported: List[str] = []
+    for _ in range(args.runs):
+        elapsed, imported = probe()
+        timings.append(elapsed)
+    timings.sort()
+    print(f"{'import myosin':<20}{timings[0] * 1000:>10.1f} ms min{timings[len(timings) // 2] * 1000:>10.1f} ms median")
+    failed = False
+    if imported:
+        print(f"deferred modules imported: {', '.join(imported)}")
+        failed = True
+    if args.limit is not None and timings[0] > args.limit:
+        print(f"import time exceeds the {args.limit * 1000:.0f} ms limit")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
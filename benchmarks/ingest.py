@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Ingestion Throughput Benchmark
+==============================
+
+Measure how many samples producer threads can hand to the engine with a checkout and commit per
+sample, a ``State.update`` per sample and an ingestion ring, and how many commits each method makes.
+Ingestion rounds finish once the applier has committed or dropped every sample.
+
+.. code-block:: console
+
+    python3 -m benchmarks.ingest --samples 20000 --producers 2 --fields 50
+"""
+
+import time
+import logging
+import argparse
+from threading import Thread
+from typing import Any, Callable, Dict
+
+from myosin import State, StateModel
+
+
+class Telemetry(StateModel):
+
+    def __init__(self, fields: int) -> None:
+        super().__init__()
+        self.tp = 0.0
+        for i in range(fields):
+            setattr(self, f"field_{i}", float(i))
+
+    def serialize(self) -> Dict[str, Any]:
+        return {k: v for k, v in vars(self).items() if not k.startswith("_")}
+
+    def deserialize(self, **kwargs) -> None:
+        for k, v in kwargs.items():
+            setattr(self, k, v)
+
+
+def commit(sample: float) -> None:
+    with State(Telemetry) as state:
+        telemetry = state.checkout(Telemetry)
+        telemetry.tp = sample
+        state.commit(telemetry)
+
+
+def update(sample: float) -> None:
+    State().update(Telemetry, tp=sample)
+
+
+def run(label: str, samples: int, producers: int, produce: Callable[[float], None]) -> None:
+    version = State().version(Telemetry)
+
+    def producer() -> None:
+        for i in range(samples):
+            produce(float(i))
+
+    threads = [Thread(target=producer) for _ in range(producers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    pushed = time.perf_counter() - start
+    total = samples * producers
+    print(f"{label:<20}{total / pushed:>12.0f} samples/s{State().version(Telemetry) - version:>10} commits")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--samples", type=int, default=20000, help="number of samples per producer")
+    parser.add_argument("--producers", type=int, default=2, help="number of producer threads")
+    parser.add_argument("--fields", type=int, default=50, help="number of model fields")
+    parser.add_argument("--capacity", type=int, default=4096, help="ingestion ring slots")
+    args = parser.parse_args()
+    logging.disable()
+    State._ssm.clear()
+    with State() as state:
+        state.load(Telemetry(args.fields))
+    run("checkout/commit", args.samples, args.producers, commit)
+    run("update", args.samples, args.producers, update)
+    start = time.perf_counter()
+    ingest = State().ingest(Telemetry, capacity=args.capacity)
+    run("ingest push", args.samples, args.producers, lambda sample: ingest.push(tp=sample))
+    ingest.stop()
+    elapsed = time.perf_counter() - start
+    total = args.samples * args.producers
+    print(f"{'ingest applied':<20}{total / elapsed:>12.0f} samples/s{ingest.dropped:>10} dropped")
+    State._ssm.clear()
+
+
+if __name__ == "__main__":
+    main()
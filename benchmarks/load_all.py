@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Startup Registration Benchmark
+==============================
+
+Compare sequential :func:`myosin.state.state.State.load` registration against batched
+:func:`myosin.state.state.State.load_all` registration for a registry of cached models.
+
+.. code-block:: console
+
+    python3 -m benchmarks.load_all --models 500 --fields 200
+"""
+
+import os
+import time
+import logging
+import argparse
+import tempfile
+from typing import Any, Callable, Dict, List, Type
+
+from myosin import State, StateModel
+from myosin.models.state import BP_ENV_VAR
+
+
+def build_types(count: int, fields: int) -> List[Type[StateModel]]:
+    """
+    Generate distinct model types, each with a fixed number of float fields.
+    """
+    def __init__(self) -> None:
+        StateModel.__init__(self)
+        self.values = {f"f{i}": 0.0 for i in range(fields)}
+
+    def serialize(self) -> Dict[str, Any]:
+        return {'id': self.id, 'values': self.values}
+
+    def deserialize(self, **kwargs) -> None:
+        for k, v in kwargs.items():
+            setattr(self, k, v)
+
+    namespace = {'__init__': __init__, 'serialize': serialize, 'deserialize': deserialize}
+    return [type(f"Model{i}", (StateModel,), namespace) for i in range(count)]
+
+
+def populate(types: List[Type[StateModel]]) -> None:
+    """
+    Write a cached document for every model type.
+    """
+    for model_type in types:
+        model = model_type()
+        model.values = {k: float(i) for i, k in enumerate(model.values)}  # type: ignore
+        model.cache()
+
+
+def timed(label: str, types: List[Type[StateModel]], register: Callable[[State, List[StateModel]], None]) -> float:
+    State._ssm.clear()
+    models = [model_type() for model_type in types]
+    start = time.perf_counter()
+    with State() as state:
+        register(state, models)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24}{elapsed * 1e3:>10.2f} ms")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--models", type=int, default=500, help="number of cached models")
+    parser.add_argument("--fields", type=int, default=200, help="number of fields per model")
+    parser.add_argument("--workers", type=int, default=None, help="worker pool size")
+    args = parser.parse_args()
+    logging.disable()
+    with tempfile.TemporaryDirectory() as base_path:
+        os.environ[BP_ENV_VAR] = base_path
+        types = build_types(args.models, args.fields)
+        populate(types)
+        print(f"{args.models} cached models with {args.fields} fields each")
+
+        def sequential(state: State, models: List[StateModel]) -> None:
+            for model in models:
+                state.load(model)
+
+        def threads(state: State, models: List[StateModel]) -> None:
+            state.load_all(models, max_workers=args.workers)
+
+        def processes(state: State, models: List[StateModel]) -> None:
+            state.load_all(models, processes=True, max_workers=args.workers)
+
+        baseline = timed("sequential load", types, sequential)
+        threaded = timed("load_all (threads)", types, threads)
+        processed = timed("load_all (processes)", types, processes)
+        print(f"thread speedup: {baseline / threaded:.2f}x, process speedup: {baseline / processed:.2f}x")
+        State._ssm.clear()
+
+
+if __name__ == "__main__":
+    main()
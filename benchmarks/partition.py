@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Partitioned Registry Benchmark
+==============================
+
+Measure batched update throughput of a sensor fleet registered in a single process ``State``
+against the same fleet partitioned across an increasing number of worker processes. Every round
+updates one field of every sensor, partitioned rounds send one batch per partition.
+
+.. code-block:: console
+
+    python3 -m benchmarks.partition --sensors 256 --fields 50 --rounds 20 --workers 1 2 4
+"""
+
+import time
+import logging
+import argparse
+import multiprocessing
+from typing import Any, Dict, List, Type
+
+from myosin import State, StateModel
+from myosin.state.partition import Partitions
+
+#: maximum fleet size, sensor types are created at import so worker processes can unpickle them
+FLEET = 1024
+
+
+class Sensor(StateModel):
+
+    def __init__(self, _id: int, fields: int) -> None:
+        super().__init__(_id)
+        self.tp = 0.0
+        for i in range(fields):
+            setattr(self, f"field_{i}", float(i))
+
+    def serialize(self) -> Dict[str, Any]:
+        return {k: v for k, v in vars(self).items() if not k.startswith("_")}
+
+    def deserialize(self, **kwargs) -> None:
+        for k, v in kwargs.items():
+            setattr(self, k, v)
+
+
+SENSORS: List[Type[Sensor]] = []
+for _index in range(FLEET):
+    _sensor = type(f"Sensor{_index}", (Sensor,), {'__module__': __name__})
+    globals()[_sensor.__name__] = _sensor
+    SENSORS.append(_sensor)
+
+
+def single(sensors: int, fields: int, rounds: int) -> float:
+    State._ssm.clear()
+    with State() as state:
+        for i, sensor in enumerate(SENSORS[:sensors]):
+            state.load(sensor(i, fields))
+    start = time.perf_counter()
+    for r in range(rounds):
+        for sensor in SENSORS[:sensors]:
+            State().update(sensor, tp=float(r))
+    elapsed = time.perf_counter() - start
+    State._ssm.clear()
+    return sensors * rounds / elapsed
+
+
+def partitioned(sensors: int, fields: int, rounds: int, workers: int) -> float:
+    with Partitions(workers) as partitions:
+        for i, sensor in enumerate(SENSORS[:sensors]):
+            partitions.load(sensor(i, fields))
+        start = time.perf_counter()
+        for r in range(rounds):
+            partitions.update_all({sensor: {'tp': float(r)} for sensor in SENSORS[:sensors]})
+        elapsed = time.perf_counter() - start
+    return sensors * rounds / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--sensors", type=int, default=256, help=f"number of sensors, at most {FLEET}")
+    parser.add_argument("--fields", type=int, default=50, help="number of fields per sensor")
+    parser.add_argument("--rounds", type=int, default=20, help="number of update rounds")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="partition counts")
+    args = parser.parse_args()
+    logging.disable()
+    sensors = min(args.sensors, FLEET)
+    print(f"{multiprocessing.cpu_count()} CPUs, {sensors} sensors with {args.fields} fields")
+    print(f"{'single process':<20}{single(sensors, args.fields, args.rounds):>12.0f} updates/s")
+    for workers in args.workers:
+        label = f"{workers} partitions"
+        print(f"{label:<20}{partitioned(sensors, args.fields, args.rounds, workers):>12.0f} updates/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+Commit Replay Benchmark
+=======================
+
+Replay a commit recording captured with ``State.record`` against the engine and report throughput
+and commit latency percentiles. The recorded model types are imported and registered before the
+replay starts.
+
+.. code-block:: console
+
+    python3 -m benchmarks.replay commits.jsonl --model app.models:Telemetry --speed 0
+"""
+
+import logging
+import argparse
+import importlib
+
+from myosin import State
+from myosin.state.replay import Replayer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("recording", help="commit recording file")
+    parser.add_argument("--model", action="append", default=[], metavar="MODULE:CLASS",
+                        help="recorded model type to register, repeat for each model")
+    parser.add_argument("--speed", type=float, default=0,
+                        help="pace relative to the recording, 0 replays as fast as possible")
+    args = parser.parse_args()
+    logging.disable()
+    with State() as state:
+        for target in args.model:
+            module, _, name = target.partition(":")
+            state.load(getattr(importlib.import_module(module), name)())
+    report = Replayer(args.recording, speed=args.speed).run()
+    print(f"{report['commits']} commits ({report['skipped']} skipped) in {report['elapsed']:.3f}s: "
+          f"{report['throughput']:.0f} commits/s")
+    print(f"latency p50 {report['p50'] * 1e6:.1f}us p90 {report['p90'] * 1e6:.1f}us "
+          f"p99 {report['p99'] * 1e6:.1f}us max {report['max'] * 1e6:.1f}us")
+    if args.speed:
+        print(f"max lag behind schedule {report['lag'] * 1e3:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,4 @@
 
-import time
 import asyncio
 import logging
 import random
@@ -24,10 +23,10 @@ class MQTTHandler:
         self._logger.info(" ++++ CALLBACK TEST")
 
     def report_loop(self) -> NoReturn:
+        version = 0
         while True:
-            time.sleep(1)
-            with State(Telemetry) as state:
-                telemetry = state.checkout(Telemetry)
+            # block until a new telemetry commit lands instead of polling
+            version, telemetry = State().wait_for_version(Telemetry, after_version=version)
             try:
                 self._logger.info(f"Telemetry report: {telemetry}")
                 rc = random.randint(0, 1)
@@ -13,17 +13,16 @@ import logging
 from myosin.state import State
 from myosin.__version__ import __version__
 from myosin.models.state import StateModel
-from myosin.utils.metrics import Metrics as metrics
+from myosin.utils.metrics import metrics
 
 __all__ = [
     '__version__',
     '__author__',
     'StateModel',
-    'State'
+    'State',
+    'metrics'
 ]
 __author__ = "Christian Sargusingh <christian@leapsystems.online>"
 
 _log = logging.getLogger(__name__)
 _log.info("Myosin version %s", __version__)
-# export version to prometheus
-metrics.meta.info({'version': __version__})
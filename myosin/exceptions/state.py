@@ -35,3 +35,13 @@ class ModelNotFound(StateException):
 
     def __init__(self, msg: str = "The requested model is not found") -> None:
         super().__init__(msg=msg)
+
+
+class FrozenModelError(StateException, AttributeError):
+    """
+    Raised if an attribute of a frozen model is assigned or deleted. Models committed with
+    ``transfer=True`` are owned by the state registry and frozen. Check out a copy to modify the model.
+    """
+
+    def __init__(self, msg: str = "The model is frozen") -> None:
+        super().__init__(msg=msg)
@@ -13,17 +13,35 @@ import json
 import uuid
 import logging
 from json import JSONDecodeError
+from concurrent.futures import Future
 from typing import Any, Dict, Optional
 from abc import ABC, abstractmethod
 
 from myosin.typing import PrimaryKey
-from myosin.utils.funcs import pformat
-from myosin.utils.metrics import Metrics as metrics
+from myosin.utils import codecs
+from myosin.utils.metrics import metrics
+from myosin.exceptions.state import FrozenModelError
 from myosin.exceptions.cache import CachePathError, NullCachePathError
 
 BP_ENV_VAR = "MYOSIN_CACHE_BASE_PATH"
 
 
+def read_cache(path: str) -> Dict[str, Any]:
+    """
+    Read and decode a cached model document. Kept at module level so it can be dispatched to a
+    thread or process pool by :func:`myosin.state.state.State.load_all`.
+
+    :param path: path to the cached json document
+    :type path: str
+    :raises FileNotFoundError: if the document does not exist
+    :raises JSONDecodeError: if the document is corrupt
+    :return: decoded cache document
+    :rtype: Dict[str, Any]
+    """
+    with open(path, 'r') as json_file:
+        return json.load(json_file)
+
+
 class StateModel(ABC):
     """
     System state model base class. Provides methods and properties required for use with the global
@@ -75,6 +93,39 @@ class StateModel(ABC):
         self.cache_base_path = os.environ.get(BP_ENV_VAR)
         self._cpath = f'{self.cache_base_path}/{self.__class__.__name__}.json'
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        if self.__dict__.get('_StateModel__frozen'):
+            raise FrozenModelError(f"Cannot set {name} of frozen {self.__class__.__qualname__} model")
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name: str) -> None:
+        if self.__dict__.get('_StateModel__frozen'):
+            raise FrozenModelError(f"Cannot delete {name} of frozen {self.__class__.__qualname__} model")
+        super().__delattr__(name)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # copies of a frozen model are writable
+        state = self.__dict__.copy()
+        state.pop('_StateModel__frozen', None)
+        return state
+
+    @property
+    def frozen(self) -> bool:
+        """
+        Get the model freeze status
+
+        :return: True if attribute assignment is disabled
+        :rtype: bool
+        """
+        return self.__dict__.get('_StateModel__frozen', False)
+
+    def freeze(self) -> None:
+        """
+        Disable attribute assignment and deletion on this model. Copies of a frozen model are not
+        frozen. Only attributes of the model itself are guarded; nested mutable values are not.
+        """
+        self.__dict__['_StateModel__frozen'] = True
+
     def __typehash__(self) -> int:
         """
         Get hash of state model type
@@ -100,7 +151,7 @@ class StateModel(ABC):
         return False
 
     def __repr__(self) -> str:
-        return pformat(self.serialize())
+        return self.encode(codecs.PRETTY)
 
     @property
     def id(self) -> PrimaryKey:
@@ -129,26 +180,31 @@ class StateModel(ABC):
         :raises NullCachePathError: if cache base path is not set 
         :raises CachePathError: if cache base path is not valid
         """
-        with metrics.cache_latency.labels(f"{self.__class__.__name__}").time():
+        with metrics.time("cache_latency", self.__class__.__name__):
             if not self.cache_base_path:
                 raise NullCachePathError(
                     f"Caching basepath is unset. set the {BP_ENV_VAR} environment variable before using model caching")
             if not os.path.exists(self.cache_base_path):
                 raise CachePathError(f"Caching base path {self.cache_base_path} does not exist")
-            with open(self._cpath, 'w+') as json_file:
-                cached_payload = self.serialize()
-                json.dump(cached_payload, json_file)
+            with open(self._cpath, 'wb') as json_file:
+                json_file.write(self.encode(codecs.JSON))
             self._logger.debug("Cached state model: %s", self)
 
-    def load(self) -> None:
+    def load(self, document: Optional["Future[Dict[str, Any]]"] = None) -> None:
         """
         Load contents from json into :class:`~StateModel` using :func:`~StateModel.deserialize`.
         If document is not found, log a warning and continue. If the cached model fails to be read
         into the runtime context remove the document.
+
+        :param document: pending read of the cached document submitted to a worker pool, if unset
+            the document is read in the calling thread, defaults to None
+        :type document: Optional[Future[Dict[str, Any]]], optional
         """
         try:
-            with open(self._cpath, 'r') as json_file:
-                payload: Dict[str, Any] = json.load(json_file)
+            if document is None:
+                payload = read_cache(self._cpath)
+            else:
+                payload = document.result()
         except JSONDecodeError as exc:
             self._logger.error("Model cache document corrupt:\n%s", exc)
             self.clear()
@@ -166,6 +222,30 @@ class StateModel(ABC):
             os.remove(self._cpath)
             self._logger.debug("Removed cached document: %s", self._cpath)
 
+    def encode(self, codec: str = codecs.JSON) -> Any:
+        """
+        Encode the serialized model. Encodings of a committed model are computed once per commit
+        and shared by all consumers until the next commit, so subscribers should prefer this over
+        encoding :func:`StateModel.serialize` themselves. Shared encodings must not be modified.
+
+        .. code-block:: python
+
+            async def uplink(telemetry: Telemetry) -> None:
+                await mqtt.publish("telemetry", telemetry.encode("json"))
+
+        :param codec: codec name, see :mod:`myosin.utils.codecs`, defaults to compact json bytes
+        :type codec: str, optional
+        :raises KeyError: if the codec is not registered
+        :return: encoded model
+        :rtype: Any
+        """
+        # deferred to avoid a circular import
+        from myosin.state.state import State
+        ssm = State._ssm.get(self.__typehash__())
+        if ssm is None:
+            return codecs.encode(self.serialize(), codec)
+        return ssm.encode(self, codec)
+
     @abstractmethod
     def serialize(self) -> Dict[str, Any]:
         """
@@ -1,4 +1,5 @@
 
 from myosin.state.state import State
+from myosin.state.watchdog import Watchdog
 
-__all__ = ["State"]
+__all__ = ["State", "Watchdog"]
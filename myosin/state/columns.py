@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+Columnar Views
+==============
+
+Columnar mirror of numeric and boolean fields across every registered model of a type and its
+subclasses. Each field is a contiguous array with one row per model which is updated in place on
+every commit, so fleet wide queries are single vectorized operations instead of one checkout per
+model.
+
+.. code-block:: python
+
+    with State() as state:
+        fleet = state.columns(Sensor, ["tp", "online"])
+    ...
+    logging.info("Mean temperature: %s, offline: %s", fleet["tp"].mean(), (~fleet["online"]).sum())
+
+Copyright © 2022 Christian Sargusingh. All rights reserved.
+"""
+
+import math
+import logging
+from array import array
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Sequence, Type
+
+from myosin.models.state import StateModel
+from myosin.utils.funcs import import_numpy
+from myosin.exceptions.state import ModelNotFound
+
+if TYPE_CHECKING:
+    from myosin.state.ssm import SSM
+
+
+class Columns:
+    """
+    Live columnar view of model fields. Created by :func:`myosin.state.state.State.columns`.
+    Boolean fields are stored as bytes, all other fields as float64. Values which cannot be
+    converted are stored as NaN or False. Models of the type registered after the view is created
+    are added as new rows and models which are registered again replace their row.
+
+    :param state_type: user-defined state model base type
+    :type state_type: Type[StateModel]
+    :param ssms: registered model wrappers, one row each
+    :type ssms: Sequence[SSM]
+    :param fields: model attributes to mirror
+    :type fields: Sequence[str]
+    :raises ValueError: if no models or fields are given
+    """
+
+    def __init__(self, state_type: Type[StateModel], ssms: Sequence["SSM"], fields: Sequence[str]) -> None:
+        if not ssms or not fields:
+            raise ValueError("Columns require at least one model and one field")
+        self._logger = logging.getLogger(__name__)
+        self.state_type = state_type
+        self._ssms: List["SSM"] = []
+        self.fields: List[str] = list(fields)
+        #: model names by row
+        self.models: List[str] = []
+        self._lock = Lock()
+        self._closed = False
+        #: number of times rows were added since the view was created, column views fetched in an
+        #: earlier generation are detached from the columns and must be fetched again
+        self.generation = 0
+        reference = ssms[0].ref
+        self._columns: Dict[str, array] = {}
+        for field in self.fields:
+            boolean = isinstance(getattr(reference, field, None), bool)
+            self._columns[field] = array('B' if boolean else 'd')
+        self._observers: Dict["SSM", Callable[[int, StateModel], None]] = {}
+        for ssm in ssms:
+            self.attach(ssm)
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self._ssms)
+
+    def __repr__(self) -> str:
+        return f"Columns({self.models}, {self.fields})"
+
+    def __getitem__(self, field: str) -> Any:
+        """
+        Get a live read-only view of a column. Adding a model to the view replaces the columns and
+        detaches views fetched before, which keep their values but stop following commits. Fetch the
+        column again once :attr:`generation` changed.
+
+        .. code-block:: python
+
+            generation, tp = fleet.generation, fleet["tp"]
+            ...
+            if fleet.generation != generation:
+                generation, tp = fleet.generation, fleet["tp"]
+
+        :param field: mirrored field
+        :type field: str
+        :raises KeyError: if the field is not mirrored
+        :return: NumPy array if NumPy is installed otherwise a ``memoryview``
+        :rtype: Any
+        """
+        column = self._columns[field]
+        numpy = import_numpy()
+        if numpy is None:
+            return memoryview(column).toreadonly()
+        view = numpy.frombuffer(column, dtype=numpy.bool_ if column.typecode == 'B' else numpy.float64)
+        view.flags.writeable = False
+        return view
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def matches(self, model_type: type) -> bool:
+        """
+        Check if a model type is covered by the view
+
+        :param model_type: registered model type
+        :type model_type: type
+        :return: True if the model type is the view type or one of its subclasses
+        :rtype: bool
+        """
+        return issubclass(model_type, self.state_type)
+
+    def attach(self, ssm: "SSM") -> None:
+        """
+        Mirror a registered model, replacing the row of a previously registered model of its type
+
+        :param ssm: registered model wrapper
+        :type ssm: SSM
+        """
+        with self._lock:
+            if self._closed:
+                return
+            for row, existing in enumerate(self._ssms):
+                if existing.typehash == ssm.typehash:
+                    self._detach(existing)
+                    self._ssms[row] = ssm
+                    break
+            else:
+                row = len(self._ssms)
+                self._ssms.append(ssm)
+                self.models.append(str(ssm))
+                # exported arrays cannot be resized, grow copies which detaches outstanding views
+                self._columns = {field: column + array(column.typecode, [0])
+                                 for field, column in self._columns.items()}
+                self.generation += 1
+            self._write(row, ssm.ref)
+            observer = self._observer(row)
+            self._observers[ssm] = observer
+            ssm.observers.append(observer)
+
+    def _detach(self, ssm: "SSM") -> None:
+        observer = self._observers.pop(ssm, None)
+        if observer in ssm.observers:
+            ssm.observers.remove(observer)
+
+    def _observer(self, row: int) -> Callable[[int, StateModel], None]:
+        def update(version: int, ref: StateModel) -> None:
+            self.update(row, ref)
+        return update
+
+    def update(self, row: int, ref: StateModel) -> None:
+        """
+        Write the fields of a committed model to its row
+
+        :param row: row of the model
+        :type row: int
+        :param ref: committed model
+        :type ref: StateModel
+        """
+        with self._lock:
+            self._write(row, ref)
+
+    def _write(self, row: int, ref: StateModel) -> None:
+        for field, column in self._columns.items():
+            value = getattr(ref, field, None)
+            try:
+                column[row] = bool(value) if column.typecode == 'B' else float(value)  # type: ignore
+            except (TypeError, ValueError):
+                self._logger.warning("Skipped non-numeric %s.%s value: %s", self.models[row], field, value)
+                column[row] = 0 if column.typecode == 'B' else math.nan  # type: ignore
+
+    def row(self, state_type: Type[StateModel]) -> int:
+        """
+        Get the row of a model
+
+        :param state_type: user-defined registered state model type
+        :type state_type: Type[StateModel]
+        :raises ModelNotFound: if the model is not part of the view
+        :return: row index
+        :rtype: int
+        """
+        for row, ssm in enumerate(self._ssms):
+            if ssm.typehash == hash(state_type):
+                return row
+        raise ModelNotFound(f"Model of type {state_type} is not part of the view")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Copy all columns at once so fields of the same row belong to the same commit
+
+        :return: column copies keyed by field name, NumPy arrays if NumPy is installed otherwise
+            ``array.array``
+        :rtype: Dict[str, Any]
+        """
+        with self._lock:
+            copies = {field: array(column.typecode, column) for field, column in self._columns.items()}
+        numpy = import_numpy()
+        if numpy is None:
+            return copies
+        return {field: numpy.frombuffer(column, dtype=numpy.bool_ if column.typecode == 'B' else numpy.float64)
+                for field, column in copies.items()}
+
+    def close(self) -> None:
+        """
+        Stop updating the view
+        """
+        with self._lock:
+            self._closed = True
+            for ssm in list(self._observers):
+                self._detach(ssm)
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Memory Footprint
+================
+
+Memory accounting of the state registry. The deep size of every registered model is estimated on
+registration and on every :data:`SAMPLE_INTERVAL` th commit and exported with the number of pending
+deliveries as gauges. Allocations made by checkouts and commits can be traced with
+:class:`Allocations`:
+
+.. code-block:: python
+
+    with Allocations() as allocations:
+        ...
+    for site in allocations.report(limit=5):
+        logging.info("%(location)s %(size)s bytes in %(count)s blocks: %(source)s", site)
+
+Copyright © 2022 Christian Sargusingh. All rights reserved.
+"""
+
+import os
+import sys
+import logging
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import tracemalloc
+
+#: number of commits between model size estimates
+SAMPLE_INTERVAL = 64
+
+# shared objects which are not owned by a model
+_SHARED = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType, logging.Logger)
+# source file of the checkout and commit entry points
+_STATE_FILE = os.path.join(os.path.dirname(__file__), "state.py")
+
+
+def sizeof(obj: Any) -> int:
+    """
+    Estimate the deep size of an object in bytes by summing :func:`sys.getsizeof` over the objects
+    reachable through containers, instance dictionaries and slots. Each object is counted once. Types,
+    modules, functions and loggers are shared and not counted.
+
+    :param obj: object to measure
+    :type obj: Any
+    :return: estimated size in bytes
+    :rtype: int
+    """
+    seen = set()
+    stack = [obj]
+    size = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, _SHARED):
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, (str, bytes, bytearray, int, float, bool)) or item is None:
+            continue
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)) or type(item).__name__ == "deque":
+            stack.extend(item)
+        if hasattr(item, '__dict__'):
+            stack.append(vars(item))
+        for cls in type(item).__mro__:
+            for slot in getattr(cls, '__slots__', ()):
+                if hasattr(item, slot):
+                    stack.append(getattr(item, slot))
+    return size
+
+
+class Allocations:
+    """
+    Trace the memory allocated by :func:`myosin.state.state.State.checkout` and
+    :func:`myosin.state.state.State.commit` with :mod:`tracemalloc` while the context is active.
+    Tracing slows down every allocation in the process and should only be enabled while profiling.
+
+    :param frames: number of stack frames stored per allocation, defaults to 16
+    :type frames: int, optional
+    """
+
+    def __init__(self, frames: int = 16) -> None:
+        self.frames = frames
+        self._started = False
+        self._before: Optional["tracemalloc.Snapshot"] = None
+        self._after: Optional["tracemalloc.Snapshot"] = None
+
+    def __enter__(self) -> "Allocations":
+        # deferred, tracing is only used while profiling
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started = True
+        self._before = tracemalloc.take_snapshot()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        import tracemalloc
+        self._after = tracemalloc.take_snapshot()
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+    def report(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Report the memory allocated inside the traced context by state access line, largest first.
+        Allocations are attributed to the innermost frame in :mod:`myosin.state.state`.
+
+        :param limit: maximum number of lines to report, defaults to all lines
+        :type limit: Optional[int], optional
+        :return: allocation sites with the net allocated ``size`` in bytes and block ``count``
+        :rtype: List[Dict[str, Any]]
+        """
+        if self._before is None or self._after is None:
+            return []
+        import linecache
+        sites: Dict["tracemalloc.Frame", List[int]] = {}
+        for stat in self._after.compare_to(self._before, 'traceback'):
+            frame = next((frame for frame in reversed(stat.traceback) if frame.filename == _STATE_FILE), None)
+            if frame is None or stat.size_diff <= 0:
+                continue
+            site = sites.setdefault(frame, [0, 0])
+            site[0] += stat.size_diff
+            site[1] += stat.count_diff
+        report = [{
+            'location': f"{frame.filename}:{frame.lineno}",
+            'source': linecache.getline(frame.filename, frame.lineno).strip(),
+            'size': size,
+            'count': count
+        } for frame, (size, count) in sites.items()]
+        report.sort(key=lambda x: x['size'], reverse=True)
+        return report[:limit]
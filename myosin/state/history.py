@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+History Store
+=============
+
+Columnar time-series history of numeric model fields. Every commit appends one row: a timestamp
+column and one float64 column per recorded field, each stored in its own preallocated memory-mapped
+file of the history directory. Range queries binary search the timestamp column and copy out only
+the requested rows.
+
+.. code-block:: python
+
+    with State() as state:
+        history = state.history(Telemetry, ["tp"])
+    ...
+    rows = history.range(start=time.time() - 3600)
+    logging.info("Mean temperature over the last hour: %s", rows["tp"].mean())
+
+Copyright © 2022 Christian Sargusingh. All rights reserved.
+"""
+
+import os
+import mmap
+import time
+import bisect
+import struct
+import logging
+from array import array
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+from myosin.models.state import StateModel
+from myosin.utils.funcs import import_numpy
+
+if TYPE_CHECKING:
+    from myosin.state.ssm import SSM
+
+#: timestamp column name
+TIMESTAMP = "timestamp"
+# bytes per row in each column
+_WIDTH = 8
+
+
+class _Column:
+    """
+    Preallocated float64 column file mapped into memory.
+    """
+
+    def __init__(self, path: str, capacity: int) -> None:
+        self.path = path
+        self._file = open(path, 'a+b')
+        size = max(os.fstat(self._file.fileno()).st_size, capacity * _WIDTH)
+        self._file.truncate(size)
+        self.map = mmap.mmap(self._file.fileno(), size)
+        self.capacity = size // _WIDTH
+
+    def grow(self, capacity: int) -> None:
+        self.map.flush()
+        self.map.close()
+        self._file.truncate(capacity * _WIDTH)
+        self.map = mmap.mmap(self._file.fileno(), capacity * _WIDTH)
+        self.capacity = capacity
+
+    def view(self, rows: int) -> memoryview:
+        return memoryview(self.map)[:rows * _WIDTH].cast('d')
+
+    def close(self) -> None:
+        self.map.flush()
+        self.map.close()
+        self._file.close()
+
+
+class History:
+    """
+    Append-only columnar history of numeric model fields. Created by
+    :func:`myosin.state.state.State.history`.
+
+    :param ssm: registered model wrapper to record
+    :type ssm: SSM
+    :param fields: numeric model attributes to record
+    :type fields: Sequence[str]
+    :param path: directory of the history column files. Existing history is appended to
+    :type path: str
+    :param capacity: number of preallocated rows, doubled whenever the columns are full, defaults to 65536
+    :type capacity: int, optional
+    :raises ValueError: if a field name collides with the timestamp column
+    """
+
+    def __init__(self, ssm: "SSM", fields: Sequence[str], path: str, capacity: int = 65536) -> None:
+        if TIMESTAMP in fields:
+            raise ValueError(f"'{TIMESTAMP}' is reserved for the timestamp column")
+        self._logger = logging.getLogger(__name__)
+        self._ssm = ssm
+        self.fields: List[str] = list(fields)
+        self.path = path
+        self._lock = Lock()
+        os.makedirs(path, exist_ok=True)
+        self._columns = {name: _Column(os.path.join(path, f"{name}.f64"), capacity)
+                         for name in [*self.fields, TIMESTAMP]}
+        capacity = max(column.capacity for column in self._columns.values())
+        for column in self._columns.values():
+            if column.capacity < capacity:
+                column.grow(capacity)
+        # rows are committed by their timestamp, unwritten rows are zero
+        with self._columns[TIMESTAMP].view(self._columns[TIMESTAMP].capacity) as stamps:
+            self._rows = bisect.bisect_left(_Descending(stamps), 0)
+            self._last = stamps[self._rows - 1] if self._rows else 0.0
+        ssm.observers.append(self.append)
+        self._logger.info("Recording %s history of %s to %s with %s existing rows", ssm, self.fields, path,
+                          self._rows)
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def close(self) -> None:
+        """
+        Stop recording and unmap the column files
+        """
+        if self.append in self._ssm.observers:
+            self._ssm.observers.remove(self.append)
+        with self._lock:
+            for column in self._columns.values():
+                column.close()
+            self._columns = {}
+
+    def append(self, version: int, model: StateModel) -> None:
+        """
+        Append the recorded fields of a committed model
+
+        :param version: commit sequence number
+        :type version: int
+        :param model: committed model
+        :type model: StateModel
+        """
+        values = [float(getattr(model, field)) for field in self.fields]
+        with self._lock:
+            if not self._columns:
+                return
+            # keep the timestamp column sorted for range queries
+            now = self._last = max(time.time(), self._last)
+            row = self._rows
+            offset = row * _WIDTH
+            if row == self._columns[TIMESTAMP].capacity:
+                for column in self._columns.values():
+                    column.grow(2 * column.capacity)
+            for field, value in zip(self.fields, values):
+                struct.pack_into('d', self._columns[field].map, offset, value)
+            # the timestamp is written last so readers in this process only see complete rows. The
+            # mapped pages are written back in no particular order, a row recovered after a crash
+            # may have a timestamp but stale field values
+            struct.pack_into('d', self._columns[TIMESTAMP].map, offset, now)
+            self._rows += 1
+
+    def range(self, start: Optional[float] = None, end: Optional[float] = None,
+              fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Copy the rows recorded in the time range ``[start, end)``. Only the timestamp column is
+        searched, the selected rows of the requested columns are copied out of the mapped files.
+
+        :param start: start of the range as a unix timestamp, defaults to the first row
+        :type start: Optional[float], optional
+        :param end: end of the range as a unix timestamp, defaults to after the last row
+        :type end: Optional[float], optional
+        :param fields: fields to return, defaults to all recorded fields
+        :type fields: Optional[Sequence[str]], optional
+        :return: column arrays keyed by field name including the ``timestamp`` column. Columns are
+            NumPy arrays if NumPy is installed otherwise ``array.array``
+        :rtype: Dict[str, Any]
+        :raises ValueError: if the history was closed
+        """
+        names = [*(self.fields if fields is None else fields), TIMESTAMP]
+        with self._lock:
+            if not self._columns:
+                raise ValueError("history closed")
+            rows = self._rows
+            with self._columns[TIMESTAMP].view(rows) as stamps:
+                lo = 0 if start is None else bisect.bisect_left(stamps, start)  # type: ignore
+                hi = rows if end is None else bisect.bisect_left(stamps, end)  # type: ignore
+            out = {}
+            for name in names:
+                with self._columns[name].view(rows) as column:
+                    out[name] = array('d', column[lo:hi])
+        numpy = import_numpy()
+        if numpy is not None:
+            return {name: numpy.frombuffer(values, dtype=numpy.float64) for name, values in out.items()}
+        return out
+
+
+class _Descending:
+    """
+    Sequence adapter ordering committed (positive) timestamps before unwritten (zero) rows so the
+    number of committed rows can be found with a binary search.
+    """
+
+    def __init__(self, stamps: memoryview) -> None:
+        self._stamps = stamps
+
+    def __len__(self) -> int:
+        return len(self._stamps)
+
+    def __getitem__(self, idx: int) -> int:
+        return -1 if self._stamps[idx] > 0 else 0
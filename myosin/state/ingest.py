@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+Ingestion Ring
+==============
+
+Ingestion channel for high frequency producers. Producers push field updates into a preallocated
+ring buffer without acquiring the model lock or copying the model. A single applier thread folds
+the pending updates into one set of field assignments and commits them with
+:func:`myosin.state.state.State.update`, so a burst of samples costs one lock acquisition, one copy
+and one subscriber dispatch.
+
+.. code-block:: python
+
+    with State() as state:
+        ingest = state.ingest(Telemetry, capacity=4096)
+    ...
+    while True:
+        ingest.push(tp=uart.read_temperature())
+
+Pushing never blocks. When producers lap the applier the oldest pending updates are overwritten and
+counted as drops. Updates of the same field within a batch are conflated, only the latest value is
+committed.
+
+Copyright © 2022 Christian Sargusingh. All rights reserved.
+"""
+
+import time
+import logging
+import itertools
+from threading import Event, Thread
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from myosin.models.state import StateModel
+from myosin.utils.metrics import metrics
+
+#: ring slot holding the producer sequence number, push timestamp and field updates
+Entry = Tuple[int, float, Dict[str, Any]]
+
+
+class Ingest:
+    """
+    Multi-producer, single-applier ring of field updates for a registered model. Created by
+    :func:`myosin.state.state.State.ingest`.
+
+    :param state_type: user-defined registered state model type
+    :type state_type: Type[StateModel]
+    :param capacity: number of ring slots, rounded up to a power of two, defaults to 4096
+    :type capacity: int, optional
+    :param batch: maximum number of updates folded into one commit, defaults to 256
+    :type batch: int, optional
+    :param interval: applier poll interval in seconds while the ring is empty, defaults to 0.001
+    :type interval: float, optional
+    :raises ValueError: if the capacity or batch size is not positive
+    """
+
+    def __init__(self, state_type: Type[StateModel], capacity: int = 4096, batch: int = 256,
+                 interval: float = 0.001) -> None:
+        if capacity < 1 or batch < 1:
+            raise ValueError("Ingest capacity and batch size must be positive")
+        self._logger = logging.getLogger(__name__)
+        self.state_type = state_type
+        self.capacity = 1 << (capacity - 1).bit_length()
+        self.batch = batch
+        self.interval = interval
+        self._mask = self.capacity - 1
+        self._slots: List[Optional[Entry]] = [None] * self.capacity
+        # next() on a count is atomic under the GIL so producers claim distinct slots without a lock
+        self._sequence = itertools.count()
+        # next sequence number to apply, only advanced by the applier
+        self._tail = 0
+        #: number of updates overwritten before they were applied
+        self.dropped = 0
+        #: number of applied updates
+        self.applied = 0
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+    def __enter__(self) -> "Ingest":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def push(self, **fields: Any) -> None:
+        """
+        Queue field updates for the next commit without blocking
+
+        :param fields: model attributes and their new values
+        :type fields: Any
+        """
+        sequence = next(self._sequence)
+        self._slots[sequence & self._mask] = (sequence, time.perf_counter(), fields)
+
+    def apply(self) -> int:
+        """
+        Fold up to ``batch`` pending updates into the model and commit them
+
+        :return: number of applied updates
+        :rtype: int
+        """
+        fields: Dict[str, Any] = {}
+        oldest: Optional[float] = None
+        count = 0
+        dropped = 0
+        while count < self.batch:
+            entry = self._slots[self._tail & self._mask]
+            if entry is None or entry[0] < self._tail:
+                # not yet written
+                break
+            if entry[0] > self._tail:
+                # producers lapped the applier, skip to the oldest update which may survive
+                lapped = entry[0] - self.capacity + 1
+                dropped += lapped - self._tail
+                self._tail = lapped
+                continue
+            self._tail += 1
+            fields.update(entry[2])
+            if oldest is None:
+                oldest = entry[1]
+            count += 1
+        if dropped:
+            self.dropped += dropped
+            metrics.inc("ingest_drop", self.state_type.__qualname__, amount=dropped)
+            self._logger.warning("Dropped %s %s updates, the applier fell behind", dropped,
+                                 self.state_type.__qualname__)
+        if not count:
+            return 0
+        # deferred to avoid a circular import
+        from myosin.state.state import State
+        State().update(self.state_type, **fields)
+        self.applied += count
+        metrics.observe("ingest_lag", time.perf_counter() - oldest, self.state_type.__qualname__)  # type: ignore
+        return count
+
+    def flush(self) -> int:
+        """
+        Apply every pending update
+
+        :return: number of applied updates
+        :rtype: int
+        """
+        applied = 0
+        while True:
+            count = self.apply()
+            if not count:
+                return applied
+            applied += count
+
+    def start(self) -> None:
+        """
+        Start the applier thread
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name=f"myosin_ingest_{self.state_type.__qualname__}", daemon=True)
+        self._thread.start()
+        self._logger.info("Started %s ingestion with %s slots", self.state_type.__qualname__, self.capacity)
+
+    def stop(self) -> None:
+        """
+        Stop the applier thread and apply the remaining updates
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self.apply():
+                    continue
+            except Exception as exc:
+                self._logger.error("Failed to apply %s updates: %s", self.state_type.__qualname__, exc)
+            self._stop.wait(self.interval)
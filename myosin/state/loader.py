@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Read-Through Models
+===================
+
+Registered models which mirror a slow external source such as a configuration file or a sysfs
+reading. The model is registered with a loader function and a time to live. Checkouts serve the
+committed model while it is fresh and call the loader once it expires. Concurrent checkouts of an
+expired model are coalesced so only one thread runs the loader while the others wait for its
+result.
+
+.. code-block:: python
+
+    def read_config() -> Dict[str, Any]:
+        with open("/etc/device.json") as config:
+            return json.load(config)
+
+    with State() as state:
+        state.load(Config(), loader=read_config, ttl=30.0, stale=True)
+
+With ``stale`` an expired model is served immediately while a background thread revalidates it, so
+readers never wait on the source once it has been loaded. The first checkout always waits for the
+initial load.
+
+Copyright © 2022 Christian Sargusingh. All rights reserved.
+"""
+
+import time
+import logging
+from threading import Lock, Thread, get_ident
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Union
+
+from myosin.models.state import StateModel
+from myosin.utils.metrics import metrics
+
+if TYPE_CHECKING:
+    from myosin.state.ssm import SSM
+
+#: loader function returning a model of the registered type or a dictionary of changed fields
+LoaderFunction = Callable[[], Union[StateModel, Dict[str, Any]]]
+
+
+class Loader:
+    """
+    Loader and expiry policy of a read-through model. Created by :func:`myosin.state.state.State.load`.
+
+    :param ssm: registered model wrapper
+    :type ssm: SSM
+    :param fn: loader function
+    :type fn: LoaderFunction
+    :param ttl: seconds a loaded model is served before it is reloaded, defaults to never reloading
+    :type ttl: Optional[float], optional
+    :param stale: serve expired models while they are reloaded in the background, defaults to False
+    :type stale: bool, optional
+    :raises ValueError: if the time to live is negative
+    """
+
+    def __init__(self, ssm: "SSM", fn: LoaderFunction, ttl: Optional[float] = None, stale: bool = False) -> None:
+        if ttl is not None and ttl < 0:
+            raise ValueError("Loader time to live must not be negative")
+        self._logger = logging.getLogger(__name__)
+        self._ssm = ssm
+        self.fn = fn
+        self.ttl = ttl
+        self.stale = stale
+        #: :func:`time.monotonic` timestamp of the latest load, None until the model is first loaded
+        self.loaded: Optional[float] = None
+        # held for the duration of a load so concurrent refreshes are coalesced
+        self._lock = Lock()
+
+    @property
+    def fresh(self) -> bool:
+        if self.loaded is None:
+            return False
+        return self.ttl is None or time.monotonic() - self.loaded < self.ttl
+
+    @property
+    def refreshing(self) -> bool:
+        return self._lock.locked()
+
+    def access(self) -> None:
+        """
+        Reload the model if it expired. Blocks until the model is loaded unless stale models may be
+        served, in which case a reload is started in the background.
+
+        :raises Exception: any exception raised by a blocking call to the loader function
+        """
+        if self.fresh:
+            return
+        if self.stale and self.loaded is not None:
+            if self._lock.acquire(blocking=False):
+                Thread(target=self._revalidate, name=f"myosin_loader_{self._ssm}", daemon=True).start()
+            return
+        holder = self._ssm.holder
+        if holder is not None and holder[0] == get_ident():
+            # a refresh in progress needs the model lock held by this thread to commit
+            if not self._lock.acquire(blocking=False):
+                self._logger.warning("Serving expired %s, its lock is held while it is reloaded", self._ssm)
+                return
+            try:
+                if not self.fresh:
+                    self._load()
+            finally:
+                self._lock.release()
+            return
+        self.refresh()
+
+    def refresh(self) -> None:
+        """
+        Reload the model unless a concurrent refresh already did
+
+        :raises Exception: any exception raised by the loader function
+        """
+        with self._lock:
+            if not self.fresh:
+                self._load()
+
+    def _revalidate(self) -> None:
+        try:
+            self._load()
+        except Exception as exc:
+            self._logger.error("Failed to reload %s: %s", self._ssm, exc)
+        finally:
+            self._lock.release()
+
+    def _load(self) -> None:
+        model = str(self._ssm)
+        state_type = self._ssm.model_type
+        try:
+            with metrics.time("loader_latency", model):
+                result = self.fn()
+        except Exception:
+            metrics.inc("loader_error", model)
+            raise
+        # deferred to avoid a circular import
+        from myosin.state.state import State
+        if isinstance(result, StateModel):
+            State().update(state_type, lambda _: result)
+        else:
+            State().update(state_type, **result)
+        self.loaded = time.monotonic()
+        self._logger.info("Loaded %s from its source", model)
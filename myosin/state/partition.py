@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+"""
+Partitioned Registry
+====================
+
+Registry mode for very large model collections which spreads the models over a pool of worker
+processes, each running its own :class:`myosin.state.state.State`, so commits are not limited by a
+single interpreter lock. Models are sharded by a stable hash of their ``id`` and a thin router in
+the calling process forwards checkouts, commits and subscriptions to the partition owning the model.
+Batched operations send one request to every involved partition before collecting the responses, so
+the partitions work on them in parallel.
+
+.. code-block:: python
+
+    with Partitions(workers=4) as partitions:
+        for sensor in sensors:
+            partitions.load(sensor)
+        partitions.subscribe(Indoor, uplink.report)
+        partitions.commit_all(readings)
+        online = partitions.query([Indoor, Outdoor], ["online"])
+
+Models and field values cross process boundaries and must be picklable, and model types
+must be importable by the workers. Subscriber callbacks run in the router process.
+
+Copyright © 2022 Christian Sargusingh. All rights reserved.
+"""
+
+import time
+import zlib
+import asyncio
+import logging
+import itertools
+import multiprocessing
+from threading import Lock, Thread
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type, TypeVar
+
+from myosin.typing import AsyncCallback
+from myosin.models.state import StateModel
+from myosin.state.projection import Projection
+from myosin.state.subscriber import Subscriber
+from myosin.exceptions.state import ModelNotFound
+
+
+_S = TypeVar('_S', bound=StateModel)
+#: operation name and arguments
+Request = Tuple[str, Tuple[Any, ...]]
+
+
+def partition(model: StateModel, workers: int) -> int:
+    """
+    Get the partition of a model. The hash is stable across processes and interpreter runs.
+
+    :param model: user-defined state model
+    :type model: StateModel
+    :param workers: number of partitions
+    :type workers: int
+    :return: partition index
+    :rtype: int
+    """
+    return zlib.crc32(str(model.id).encode()) % workers
+
+
+def _serve(connection: Connection, events: Any) -> None:
+    # worker process entrypoint, deferred import so the worker registry is created in the worker
+    from myosin.state.state import State
+
+    def forward(token: int) -> Callable[[StateModel], AsyncCallback]:
+        async def callback(model: StateModel) -> None:
+            events.put((token, time.perf_counter(), model))
+        return callback
+
+    def execute(op: str, args: Tuple[Any, ...]) -> Any:
+        state = State()
+        if op == 'load':
+            state.load(*args)
+            return None
+        if op == 'checkout':
+            return state.checkout(*args)
+        if op == 'commit':
+            model, cache = args
+            with State(type(model)) as context:
+                context.commit(model, cache=cache, transfer=True)
+            return None
+        if op == 'update':
+            state_type, fields = args
+            state.update(state_type, **fields)
+            return None
+        if op == 'read':
+            state_type, fields = args
+            return state.read(state_type, fields).serialize()
+        if op == 'subscribe':
+            state_type, token = args
+            state.subscribe(state_type, forward(token))
+            return None
+        raise ValueError(f"Unknown partition operation: {op}")
+
+    while True:
+        op, args = connection.recv()
+        if op == 'stop':
+            connection.close()
+            return
+        try:
+            if op == 'batch':
+                result: Any = [execute(*request) for request in args]
+            else:
+                result = execute(op, args)
+        except Exception as exc:
+            connection.send((False, exc))
+        else:
+            connection.send((True, result))
+
+
+class Partitions:
+    """
+    Router of a registry partitioned across worker processes.
+
+    :param workers: number of worker processes, defaults to the number of CPUs
+    :type workers: Optional[int], optional
+    :param context: multiprocessing start method, defaults to the platform default
+    :type context: Optional[str], optional
+    :raises ValueError: if the number of workers is not positive
+    """
+
+    def __init__(self, workers: Optional[int] = None, context: Optional[str] = None) -> None:
+        workers = workers or multiprocessing.cpu_count()
+        if workers < 1:
+            raise ValueError("Partitions require at least one worker")
+        self._logger = logging.getLogger(__name__)
+        ctx = multiprocessing.get_context(context)
+        self._events = ctx.Queue()
+        self._connections: List[Connection] = []
+        self._locks: List[Lock] = []
+        self._processes: List[Any] = []
+        for index in range(workers):
+            router, worker = ctx.Pipe()
+            process = ctx.Process(target=_serve, args=(worker, self._events), name=f"myosin_partition_{index}",
+                                  daemon=True)
+            process.start()
+            worker.close()
+            self._connections.append(router)
+            self._locks.append(Lock())
+            self._processes.append(process)
+        # partition of every registered model type
+        self._routes: Dict[Type[StateModel], int] = {}
+        self._subscribers: Dict[int, Tuple[str, Subscriber]] = {}
+        self._tokens = itertools.count()
+        self._listener = Thread(target=self._listen, name="myosin_partition_events", daemon=True)
+        self._listener.start()
+        self._logger.info("Started %s registry partitions", workers)
+
+    def __enter__(self) -> "Partitions":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._connections)
+
+    def _call(self, index: int, op: str, *args: Any) -> Any:
+        with self._locks[index]:
+            self._connections[index].send((op, args))
+            return self._receive(index)
+
+    def _receive(self, index: int) -> Any:
+        ok, result = self._connections[index].recv()
+        if not ok:
+            raise result
+        return result
+
+    def _batch(self, requests: Dict[int, List[Request]]) -> Dict[int, List[Any]]:
+        # send every request before collecting any response so the partitions work in parallel
+        indices = sorted(requests)
+        for index in indices:
+            self._locks[index].acquire()
+        try:
+            for index in indices:
+                self._connections[index].send(('batch', requests[index]))
+            # drain every response before raising so no connection is left with a pending response
+            responses = {index: self._connections[index].recv() for index in indices}
+        finally:
+            for index in indices:
+                self._locks[index].release()
+        for ok, result in responses.values():
+            if not ok:
+                raise result
+        return {index: result for index, (_, result) in responses.items()}
+
+    def _route(self, state_type: Type[StateModel]) -> int:
+        try:
+            return self._routes[state_type]
+        except KeyError:
+            raise ModelNotFound(f"Could not identify model of type {state_type}. Model is not registered.") from None
+
+    def load(self, model: StateModel) -> int:
+        """
+        Register a model with the partition owning its ``id``. Requests are routed by model type, so
+        only one model of each type can be registered.
+
+        :param model: user-defined state model
+        :type model: StateModel
+        :raises ValueError: if a model of the same type is already registered
+        :raises UninitializedStateError: if user-defined state model cannot be serialized
+        :return: partition index
+        :rtype: int
+        """
+        if type(model) in self._routes:
+            raise ValueError(f"A model of type {type(model)} is already registered with partition "
+                             f"{self._routes[type(model)]}")
+        index = partition(model, len(self))
+        self._call(index, 'load', model)
+        self._routes[type(model)] = index
+        return index
+
+    def checkout(self, state_type: Type[_S]) -> _S:
+        """
+        Return a copy of a registered model
+
+        :param state_type: user-defined registered state model type
+        :type state_type: Type[_S]
+        :raises ModelNotFound: if the requested state type does not exist
+        :return: copy of the committed model
+        :rtype: _S
+        """
+        return self._call(self._route(state_type), 'checkout', state_type)
+
+    def commit(self, model: StateModel, cache: bool = False) -> None:
+        """
+        Commit a model to its partition
+
+        :param model: modified copy of state
+        :type model: StateModel
+        :param cache: cache the state to disk once updated, defaults to False
+        :type cache: bool, optional
+        :raises ModelNotFound: if system state has no state registered of the requested type
+        """
+        self._call(self._route(type(model)), 'commit', model, cache)
+
+    def update(self, state_type: Type[StateModel], **fields: Any) -> None:
+        """
+        Assign fields of a registered model in its partition, see :func:`myosin.state.state.State.update`
+
+        :param state_type: user-defined registered state model type
+        :type state_type: Type[StateModel]
+        :raises ModelNotFound: if the requested state type does not exist
+        """
+        self._call(self._route(state_type), 'update', state_type, fields)
+
+    def commit_all(self, models: Iterable[StateModel], cache: bool = False) -> None:
+        """
+        Commit a batch of models with one request per partition
+
+        :param models: modified copies of state
+        :type models: Iterable[StateModel]
+        :param cache: cache the states to disk once updated, defaults to False
+        :type cache: bool, optional
+        :raises ModelNotFound: if system state has no state registered of a model type
+        """
+        requests: Dict[int, List[Request]] = {}
+        for model in models:
+            requests.setdefault(self._route(type(model)), []).append(('commit', (model, cache)))
+        self._batch(requests)
+
+    def update_all(self, updates: Dict[Type[StateModel], Dict[str, Any]]) -> None:
+        """
+        Assign fields of several registered models with one request per partition
+
+        :param updates: fields to assign keyed by model type
+        :type updates: Dict[Type[StateModel], Dict[str, Any]]
+        :raises ModelNotFound: if a requested state type does not exist
+        """
+        requests: Dict[int, List[Request]] = {}
+        for state_type, fields in updates.items():
+            requests.setdefault(self._route(state_type), []).append(('update', (state_type, fields)))
+        self._batch(requests)
+
+    def query(self, state_types: Sequence[Type[_S]], fields: Sequence[str]) -> Dict[Type[_S], Projection[_S]]:
+        """
+        Read fields of several registered models with one request per partition
+
+        :param state_types: user-defined registered state model types
+        :type state_types: Sequence[Type[_S]]
+        :param fields: model attributes to read
+        :type fields: Sequence[str]
+        :raises ModelNotFound: if a requested state type does not exist
+        :raises AttributeError: if a model has no attribute of a requested field
+        :return: projections keyed by model type
+        :rtype: Dict[Type[_S], Projection[_S]]
+        """
+        requests: Dict[int, List[Request]] = {}
+        order: Dict[int, List[Type[_S]]] = {}
+        for state_type in state_types:
+            index = self._route(state_type)
+            requests.setdefault(index, []).append(('read', (state_type, list(fields))))
+            order.setdefault(index, []).append(state_type)
+        results = self._batch(requests)
+        return {state_type: Projection(state_type, values)
+                for index, types in order.items() for state_type, values in zip(types, results[index])}
+
+    def subscribe(self, state_type: Type[_S], callback: Callable[[_S], AsyncCallback],
+                  **kwargs: Any) -> Subscriber[_S]:
+        """
+        Subscribe a listener in the router process to the commits of a registered model
+
+        :param state_type: model type to subscribe to
+        :type state_type: Type[_S]
+        :param callback: state change listener callback
+        :type callback: Callable[[_S], AsyncCallback]
+        :param kwargs: :class:`myosin.state.subscriber.Subscriber` delivery options
+        :raises ModelNotFound: if the requested state type does not exist
+        :raises ValueError: if the timeout policy is unknown
+        :return: registered subscriber
+        :rtype: Subscriber[_S]
+        """
+        index = self._route(state_type)
+        subscriber = Subscriber[_S](callback, **kwargs)
+        token = next(self._tokens)
+        self._subscribers[token] = (state_type.__qualname__, subscriber)
+        self._call(index, 'subscribe', state_type, token)
+        return subscriber
+
+    def _listen(self) -> None:
+        loop = asyncio.new_event_loop()
+        try:
+            while True:
+                event = self._events.get()
+                if event is None:
+                    return
+                token, committed, model = event
+                if token not in self._subscribers:
+                    continue
+                label, subscriber = self._subscribers[token]
+                if subscriber.closed:
+                    # unsubscribed, the worker keeps forwarding commits which are ignored
+                    del self._subscribers[token]
+                    continue
+                if subscriber.suspended:
+                    continue
+                try:
+                    loop.run_until_complete(subscriber.deliver(label, model, committed))
+                except Exception as exc:
+                    subscriber.report(label, exc)
+        finally:
+            loop.close()
+
+    def close(self) -> None:
+        """
+        Stop the worker processes and the subscriber delivery thread
+        """
+        for index, connection in enumerate(self._connections):
+            with self._locks[index]:
+                if not connection.closed:
+                    connection.send(('stop', ()))
+                    connection.close()
+        for process in self._processes:
+            process.join()
+        if self._listener.is_alive():
+            self._events.put(None)
+            self._listener.join()
+        self._logger.info("Stopped %s registry partitions", len(self))
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Model Projection
+================
+
+Read-only view of selected fields of a committed model returned by
+:func:`myosin.state.state.State.checkout` with ``fields`` and by :func:`myosin.state.state.State.read`.
+Only the requested fields are copied, which is considerably cheaper than a deep copy of a wide model.
+
+.. code-block:: python
+
+    with State(System) as state:
+        system = state.checkout(System, fields=["online"])
+    if system.online:
+        ...
+
+Copyright © 2022 Christian Sargusingh. All rights reserved.
+"""
+
+import copy
+from typing import Any, Dict, Generic, Iterable, Type, TypeVar
+
+from myosin.models.state import StateModel
+
+
+_S = TypeVar('_S', bound=StateModel)
+
+
+class Projection(Generic[_S]):
+    """
+    Selected fields of a model. Fields are read as attributes and cannot be reassigned.
+
+    :param state_type: projected model type
+    :type state_type: Type[_S]
+    :param values: field values keyed by field name
+    :type values: Dict[str, Any]
+    """
+
+    __slots__ = ('_type', '_values')
+
+    def __init__(self, state_type: Type[_S], values: Dict[str, Any]) -> None:
+        object.__setattr__(self, '_type', state_type)
+        object.__setattr__(self, '_values', values)
+
+    @classmethod
+    def of(cls, model: _S, fields: Iterable[str], deep: bool = True) -> "Projection[_S]":
+        """
+        Project fields of a model
+
+        :param model: model to project
+        :type model: _S
+        :param fields: model attributes to project
+        :type fields: Iterable[str]
+        :param deep: deep copy the field values, otherwise the values are shared with the model,
+            defaults to True
+        :type deep: bool, optional
+        :raises AttributeError: if the model has no attribute of a requested field
+        :return: projection of the model
+        :rtype: Projection[_S]
+        """
+        values = {field: getattr(model, field) for field in fields}
+        if deep:
+            # one memo so values shared between fields stay shared in the projection
+            memo: Dict[int, Any] = {}
+            values = {field: copy.deepcopy(value, memo) for field, value in values.items()}
+        return cls(type(model), values)
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(f"{self._type.__qualname__} projection has no field {name}") from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{self._type.__qualname__} projection is read-only")
+
+    def __repr__(self) -> str:
+        return f"Projection({self._type.__qualname__}, {self._values})"
+
+    def __eq__(self, o: object) -> bool:
+        if not isinstance(o, Projection):
+            return False
+        return self._type is o._type and self._values == o._values
+
+    @property
+    def fields(self) -> Iterable[str]:
+        return self._values.keys()
+
+    def serialize(self) -> Dict[str, Any]:
+        """
+        Serialize the projected fields
+
+        :return: field values keyed by field name
+        :rtype: Dict[str, Any]
+        """
+        return dict(self._values)
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Commit Record and Replay
+========================
+
+Capture the commit stream of registered models to a JSON lines file and replay it against
+:func:`myosin.state.state.State.commit` to benchmark the engine with production traffic. Every
+recorded line holds the offset of the commit from the start of the recording in seconds, the model
+type and its serialized payload.
+
+.. code-block:: python
+
+    with State() as state:
+        recorder = state.record("commits.jsonl", Telemetry)
+    ...
+    recorder.close()
+
+    report = Replayer("commits.jsonl", speed=10.0).run()
+
+Copyright © 2022 Christian Sargusingh. All rights reserved.
+"""
+
+import json
+import math
+import time
+import logging
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Type
+
+from myosin.utils import codecs
+from myosin.models.state import StateModel
+
+if TYPE_CHECKING:
+    from myosin.state.ssm import SSM
+
+
+class Recorder:
+    """
+    Append the commits of registered models to a JSON lines file. Created by
+    :func:`myosin.state.state.State.record`.
+
+    :param ssms: registered model wrappers to record
+    :type ssms: Iterable[SSM]
+    :param path: recording file path. Existing recordings are overwritten
+    :type path: str
+    """
+
+    def __init__(self, ssms: Iterable["SSM"], path: str) -> None:
+        self._logger = logging.getLogger(__name__)
+        self.path = path
+        self._lock = Lock()
+        self._file = open(path, 'w', encoding='utf-8')
+        self._start = time.perf_counter()
+        #: number of recorded commits
+        self.count = 0
+        self._observers: Dict["SSM", Callable[[int, StateModel], None]] = {}
+        for ssm in ssms:
+            observer = self._observer(str(ssm))
+            self._observers[ssm] = observer
+            ssm.observers.append(observer)
+        self._logger.info("Recording commits of %s to %s", [str(ssm) for ssm in self._observers], path)
+
+    def __enter__(self) -> "Recorder":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _observer(self, model: str) -> Callable[[int, StateModel], None]:
+        def record(version: int, ref: StateModel) -> None:
+            self.record(model, ref)
+        return record
+
+    def record(self, model: str, ref: StateModel) -> None:
+        """
+        Append a committed model to the recording
+
+        :param model: qualified name of the model type
+        :type model: str
+        :param ref: committed model
+        :type ref: StateModel
+        """
+        offset = time.perf_counter() - self._start
+        line = json.dumps({'t': offset, 'model': model, 'payload': ref.encode(codecs.DICT)})
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(line + "\n")
+            self.count += 1
+
+    def close(self) -> None:
+        """
+        Stop recording and close the recording file
+        """
+        for ssm, observer in self._observers.items():
+            if observer in ssm.observers:
+                ssm.observers.remove(observer)
+        self._observers = {}
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+                self._logger.info("Recorded %s commits to %s", self.count, self.path)
+
+
+class Replayer:
+    """
+    Replay a recording against the registered models. Each recorded payload is deserialized into a
+    checkout of its model and committed, and the commit latency is measured including lock
+    acquisition. Models which are not registered are skipped.
+
+    :param path: recording file path
+    :type path: str
+    :param speed: pace relative to the recording, ``2.0`` replays twice as fast. ``None`` or ``0``
+        commits as fast as possible, defaults to 1.0
+    :type speed: Optional[float], optional
+    """
+
+    def __init__(self, path: str, speed: Optional[float] = 1.0) -> None:
+        if speed is not None and speed < 0:
+            raise ValueError("Replay speed must not be negative")
+        self._logger = logging.getLogger(__name__)
+        self.path = path
+        self.speed = speed or None
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Replay the recording in the calling thread
+
+        :return: report of the number of replayed and skipped commits, the elapsed time and throughput,
+            commit latency percentiles in seconds and the maximum lag behind the recorded schedule
+        :rtype: Dict[str, Any]
+        """
+        # deferred to avoid a circular import
+        from myosin.state.state import State
+        types: Dict[str, Type[StateModel]] = {str(ssm): type(ssm.ref) for ssm in State._ssm.values()}
+        latencies: List[float] = []
+        skipped = 0
+        lag = 0.0
+        start = time.perf_counter()
+        with open(self.path, 'r', encoding='utf-8') as recording:
+            for line in recording:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                state_type = types.get(entry['model'])
+                if state_type is None:
+                    skipped += 1
+                    continue
+                if self.speed is not None:
+                    delay = start + entry['t'] / self.speed - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    else:
+                        lag = max(lag, -delay)
+                requested = time.perf_counter()
+                with State(state_type) as state:
+                    model = state.checkout(state_type)
+                    model.deserialize(**entry['payload'])
+                    state.commit(model)
+                latencies.append(time.perf_counter() - requested)
+        elapsed = time.perf_counter() - start
+        latencies.sort()
+        report = {
+            'commits': len(latencies),
+            'skipped': skipped,
+            'elapsed': elapsed,
+            'throughput': len(latencies) / elapsed if elapsed > 0 else 0.0,
+            'p50': _percentile(latencies, 50),
+            'p90': _percentile(latencies, 90),
+            'p99': _percentile(latencies, 99),
+            'max': latencies[-1] if latencies else math.nan,
+            'lag': lag
+        }
+        self._logger.info("Replayed %s: %s", self.path, report)
+        return report
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    # nearest rank percentile of sorted samples
+    if not ordered:
+        return math.nan
+    rank = math.ceil(percent / 100 * len(ordered))
+    return ordered[max(rank, 1) - 1]
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Multi-Version Snapshots
+=======================
+
+Consistent point-in-time views of several models which never block writers. Every commit is
+stamped with a tick of a global commit clock and appended to a short chain of immutable versions of
+its model. A snapshot reads the clock and picks the newest version of every requested model at or
+before that tick, so it observes every commit up to the tick and none after it, without acquiring
+the model locks.
+
+Versions which are older than the newest version are only retained while a snapshot is being
+built. Built snapshots hold plain references, so old versions are reclaimed as soon as no snapshot
+refers to them.
+
+.. code-block:: python
+
+    snapshot = State().snapshot(System, Telemetry)
+    if snapshot[System].online:
+        publish(snapshot[Telemetry])
+
+Copyright © 2022 Christian Sargusingh. All rights reserved.
+"""
+
+import copy
+from threading import Lock
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, Type, TypeVar
+
+from myosin.models.state import StateModel
+from myosin.exceptions.state import ModelNotFound
+
+if TYPE_CHECKING:
+    from myosin.state.ssm import SSM
+
+
+_S = TypeVar('_S', bound=StateModel)
+#: commit clock tick, model sequence number and committed reference
+Version = Tuple[int, int, StateModel]
+
+
+class Clock:
+    """
+    Global commit clock. Writers publish versions under a short lock which only orders the clock
+    tick with the version chain update; readers never acquire it.
+    """
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        #: tick of the latest published commit
+        self.now = 0
+        #: ticks of snapshots which are being built
+        self.readers: List[int] = []
+
+    def publish(self, ssm: "SSM", version: int, ref: StateModel) -> None:
+        """
+        Stamp a committed reference with the next tick and append it to the version chain of its
+        model. Versions which no snapshot in progress can select are dropped.
+
+        :param ssm: registered model wrapper
+        :type ssm: SSM
+        :param version: model sequence number
+        :type version: int
+        :param ref: committed reference
+        :type ref: StateModel
+        """
+        with self.lock:
+            tick = self.now + 1
+            chain = ssm.versions
+            # a concurrently changing reader list may be misread, readers then retry
+            floor = min(self.readers, default=tick)
+            keep = 0
+            while keep < len(chain) - 1 and chain[keep + 1][0] <= floor:
+                keep += 1
+            # replaced, not mutated, so readers iterate a stable chain
+            ssm.versions = (*chain[keep:], (tick, version, ref)) if floor < tick else ((tick, version, ref),)
+            self.now = tick
+
+    def snapshot(self, ssms: Iterable["SSM"]) -> "Snapshot":
+        """
+        Build a consistent snapshot of the latest published versions of several models
+
+        :param ssms: registered model wrappers
+        :type ssms: Iterable[SSM]
+        :return: point-in-time snapshot
+        :rtype: Snapshot
+        """
+        ssms = list(ssms)
+        while True:
+            tick = self.now
+            self.readers.append(tick)
+            try:
+                versions = {}
+                for ssm in ssms:
+                    # reloads evicted models
+                    typehash = ssm.ref.__typehash__()
+                    version = _select(ssm.versions, tick)
+                    if version is None or ssm.evicted:
+                        # the version was reclaimed or evicted before this reader registered
+                        break
+                    versions[typehash] = version
+                else:
+                    return Snapshot(tick, versions)
+            finally:
+                self.readers.remove(tick)
+
+
+def _select(chain: Tuple[Version, ...], tick: int) -> Optional[Version]:
+    for version in reversed(chain):
+        if version[0] <= tick:
+            return version
+    return None
+
+
+#: global commit clock
+clock = Clock()
+
+
+class Snapshot:
+    """
+    Point-in-time view of registered models created by :func:`myosin.state.state.State.snapshot`.
+    Models are shared with the state registry and must not be modified; use :func:`Snapshot.checkout`
+    for a modifiable copy.
+
+    :param tick: commit clock tick of the snapshot
+    :type tick: int
+    :param versions: selected versions keyed by model type hash
+    :type versions: Dict[int, Version]
+    """
+
+    __slots__ = ('tick', '_versions')
+
+    def __init__(self, tick: int, versions: Dict[int, Version]) -> None:
+        self.tick = tick
+        self._versions = versions
+
+    def __repr__(self) -> str:
+        models = {type(ref).__qualname__: version for _, version, ref in self._versions.values()}
+        return f"Snapshot({self.tick}, {models})"
+
+    def __contains__(self, state_type: Type[StateModel]) -> bool:
+        return hash(state_type) in self._versions
+
+    def __getitem__(self, state_type: Type[_S]) -> _S:
+        return self._get(state_type)[2]  # type: ignore
+
+    def _get(self, state_type: Type[StateModel]) -> Version:
+        try:
+            return self._versions[hash(state_type)]
+        except KeyError:
+            raise ModelNotFound(f"Model of type {state_type} is not part of the snapshot") from None
+
+    def version(self, state_type: Type[StateModel]) -> int:
+        """
+        Get the commit sequence number of a model in the snapshot
+
+        :param state_type: user-defined state model type
+        :type state_type: Type[StateModel]
+        :raises ModelNotFound: if the model is not part of the snapshot
+        :return: commit sequence number
+        :rtype: int
+        """
+        return self._get(state_type)[1]
+
+    def checkout(self, state_type: Type[_S]) -> _S:
+        """
+        Return a deepcopy of a model in the snapshot
+
+        :param state_type: user-defined state model type
+        :type state_type: Type[_S]
+        :raises ModelNotFound: if the model is not part of the snapshot
+        :return: deep copy of the model
+        :rtype: _S
+        """
+        return copy.deepcopy(self[state_type])
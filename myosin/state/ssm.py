@@ -9,16 +9,28 @@ Registered system state model wrapper.
 
 """
 
+import time
 import logging
 import asyncio
-import traceback
-from threading import Lock
-from typing import Generic, List, Tuple, TypeVar, Callable
+from queue import SimpleQueue
+from threading import Lock, Thread, get_ident
+from concurrent.futures import Future, wait
+from weakref import WeakSet
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generic, List, Optional, Tuple, Type, TypeVar
 from asyncio.events import AbstractEventLoop
 
-from myosin.utils.metrics import Metrics as metrics
 from myosin.models.state import StateModel
-from myosin.typing import AsyncCallback
+from myosin.state.waiter import Waiter
+from myosin.state.footprint import SAMPLE_INTERVAL, sizeof
+from myosin.state.snapshot import Version, clock
+from myosin.state.tier import ticks, tier
+from myosin.state.subscriber import Completion, Delivery, Subscriber
+from myosin.utils import codecs
+from myosin.utils.metrics import metrics
+
+if TYPE_CHECKING:
+    from myosin.state.stream import Stream
+    from myosin.state.loader import Loader
 
 
 _S = TypeVar('_S', bound=StateModel)
@@ -28,12 +40,45 @@ class SSM(Generic[_S]):
 
     def __init__(self, reference: _S) -> None:
         self._logger = logging.getLogger(__name__)
+        #: the reference is cached to disk and replaced by an unloaded shell
+        self.evicted = False
+        #: access clock tick of the latest use
+        self.accessed = next(ticks)
         self.ref = reference
+        # encoded forms of the committed reference, replaced on every commit
+        self._encoded: Tuple[_S, Dict[str, Any]] = (reference, {})
         self.lock = Lock()
         self.queue = []
+        # serializes subscriber queue replacements
+        self._queue_lock = Lock()
+        #: open snapshot streams, dropped once unreferenced
+        self.streams: "WeakSet[Stream[_S]]" = WeakSet()
+        #: sequence number of the committed reference
+        self.version = 0
+        #: synchronous commit observers called with the sequence number and reference of each commit
+        self.observers: List[Callable[[int, _S], None]] = []
+        #: pending commit waiters
+        self.waiters: List[Waiter[_S]] = []
+        self._waiters_lock = Lock()
+        #: thread ident and acquisition time of the current lock holder
+        self.holder: Optional[Tuple[int, float]] = None
+        #: estimated deep size of the committed reference in bytes, refreshed every ``footprint_interval`` commits
+        self.footprint = 0
+        self.footprint_interval = SAMPLE_INTERVAL
+        self.measure()
+        # delivery queue and thread of non-blocking commits outside of an event loop, created on first use
+        self._deliveries: Optional["SimpleQueue[Optional[Tuple[Future, AbstractEventLoop, float, int, _S]]]"] = None
+        self._delivery_thread: Optional[Thread] = None
+        # latest non-blocking delivery, awaited by blocking commits to preserve commit order
+        self._last_delivery: Optional[Future] = None
+        #: source of a read-through model
+        self.loader: Optional["Loader"] = None
+        #: recent versions stamped with the commit clock, oldest first
+        self.versions: Tuple[Version, ...] = ()
+        clock.publish(self, self.version, reference)
 
     def __str__(self) -> str:
-        return f"{self.ref.__class__.__qualname__}"
+        return f"{self.__ref.__class__.__qualname__}"
 
     @property
     def lock(self) -> Lock:
@@ -47,63 +92,323 @@ class SSM(Generic[_S]):
     def refhash(self) -> int:
         return hash(self.__ref)
 
+    @property
+    def model_type(self) -> Type[_S]:
+        return type(self.__ref)
+
     @property
     def typehash(self) -> int:
-        return self.ref.__typehash__()
+        return self.__ref.__typehash__()
 
     @property
     def ref(self) -> _S:
-        return self.__ref
+        # read the reference before the flag, evict() flags the model before swapping in the shell
+        ref = self.__ref
+        if self.evicted:
+            tier.restore(self)
+            return self.__ref
+        return ref
 
     @ref.setter
     def ref(self, model: _S) -> None:
         self.__ref = model
+        self.evicted = False
+
+    def touch(self) -> None:
+        """
+        Mark the model as recently used and count registry hits and misses if a memory budget is set
+        """
+        self.accessed = next(ticks)
+        if tier.enabled:
+            metrics.inc("tier_miss" if self.evicted else "tier_hit", str(self))
+
+    def evict(self) -> None:
+        """
+        Cache the committed reference to disk and replace it with an unloaded shell of the same type.
+        The caller must hold the model lock so no commit lands while the reference is cached.
+        """
+        ref = self.__ref
+        ref.cache()
+        shell = type(ref).__new__(type(ref))
+        StateModel.__init__(shell, ref.id)
+        # flagged first so a reader never sees the shell without restoring it
+        self.evicted = True
+        self.__ref = shell
+        self._encoded = (shell, {})
+        with clock.lock:
+            tick, version, _ = self.versions[-1]
+            self.versions = ((tick, version, shell),)
+
+    def restore(self) -> None:
+        """
+        Reload an evicted reference into its shell
+        """
+        self.__ref.load()
+        self.evicted = False
+        self.accessed = next(ticks)
+        self.measure()
 
     @property
-    def queue(self) -> List[Callable[[_S], AsyncCallback]]:
+    def queue(self) -> List[Subscriber[_S]]:
         return self.__queue
 
     @queue.setter
-    def queue(self, queue: List[Callable[[_S], AsyncCallback]]) -> None:
+    def queue(self, queue: List[Subscriber[_S]]) -> None:
         self.__queue = queue
 
-    def execute(self) -> None:
+    def add_subscriber(self, subscriber: Subscriber[_S]) -> None:
+        """
+        Add a subscriber to the delivery queue. The queue is replaced, not mutated, so deliveries in
+        progress iterate a stable queue.
+
+        :param subscriber: state change subscriber
+        :type subscriber: Subscriber[_S]
         """
-        Schedule callbacks for either synchronous and asynchrounous runtimes.
+        with self._queue_lock:
+            self.queue = [*self.queue, subscriber]
+
+    def remove_subscriber(self, subscriber: Subscriber[_S]) -> None:
+        """
+        Remove a subscriber from the delivery queue, see :func:`add_subscriber`
+
+        :param subscriber: state change subscriber
+        :type subscriber: Subscriber[_S]
+        """
+        with self._queue_lock:
+            self.queue = [existing for existing in self.queue if existing is not subscriber]
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of commits queued for delivery to subscribers and buffered by streams
         """
+        return sum(subscriber.pending for subscriber in self.queue) + sum(len(stream) for stream in list(self.streams))
+
+    def measure(self) -> int:
+        """
+        Estimate the size of the committed reference and export it with the number of pending
+        deliveries. Evicted references keep their last estimate. Models are evicted if the estimate
+        exceeds the registry memory budget.
+
+        :return: estimated size of the committed reference in bytes
+        :rtype: int
+        """
+        if not self.evicted:
+            self.footprint = sizeof(self.__ref)
+        model = str(self)
+        metrics.set("model_bytes", self.footprint, model)
+        metrics.set("pending_deliveries", self.pending, model)
+        if tier.enabled:
+            tier.enforce(keep=self)
+        return self.footprint
+
+    def encode(self, ref: _S, codec: str) -> Any:
+        """
+        Encode a model. Encodings of the committed reference are memoized until the next commit and
+        derived from a single serialization. Other references are encoded without memoization.
+
+        :param ref: model to encode
+        :type ref: _S
+        :param codec: codec name, see :mod:`myosin.utils.codecs`
+        :type codec: str
+        :return: encoded model
+        :rtype: Any
+        """
+        committed, memo = self._encoded
+        if committed is not ref:
+            return codecs.encode(ref.serialize(), codec)
+        try:
+            return memo[codec]
+        except KeyError:
+            pass
+        if codec == codecs.DICT:
+            encoded = ref.serialize()
+        else:
+            encoded = codecs.encode(self.encode(ref, codecs.DICT), codec)
+        # concurrent encoders keep the first result so every consumer shares one object
+        return memo.setdefault(codec, encoded)
+
+    def install(self, model: _S) -> int:
+        """
+        Replace the committed reference and advance its sequence number.
+
+        :param model: new committed reference
+        :type model: _S
+        :return: sequence number of the new reference
+        :rtype: int
+        """
+        with self._waiters_lock:
+            # advanced in the same critical section as the waiters are matched so watch() cannot miss it
+            self.ref = model
+            self._encoded = (model, {})
+            self.version += 1
+            version = self.version
+            self.waiters = [waiter for waiter in self.waiters if not waiter.match(version, model)]
+        self.accessed = next(ticks)
+        clock.publish(self, version, model)
+        if version % self.footprint_interval == 0:
+            self.measure()
+        for observer in self.observers:
+            try:
+                observer(version, model)
+            except Exception as exc:
+                self._logger.error("%s commit observer %s failed: %s", self, observer, exc)
+        return version
+
+    def watch(self, waiter: Waiter[_S]) -> bool:
+        """
+        Register a commit waiter unless the current reference already matches it.
+
+        :param waiter: commit waiter
+        :type waiter: Waiter[_S]
+        :return: True if the current reference matched and the waiter was not registered
+        :rtype: bool
+        """
+        with self._waiters_lock:
+            if waiter.match(self.version, self.ref):
+                return True
+            self.waiters.append(waiter)
+            return False
+
+    def unwatch(self, waiter: Waiter[_S]) -> None:
+        """
+        Remove a pending commit waiter.
+
+        :param waiter: commit waiter
+        :type waiter: Waiter[_S]
+        """
+        with self._waiters_lock:
+            if waiter in self.waiters:
+                self.waiters.remove(waiter)
+
+    def execute(self, future: bool = False) -> Optional[Delivery]:
+        """
+        Schedule callbacks for either synchronous and asynchrounous runtimes. In a running event loop
+        each subscriber is fed through its own long-lived worker so deliveries to a subscriber are
+        made one at a time in commit order.
+
+        With ``future`` delivery does not block: in a running event loop an :class:`asyncio.Future` is
+        returned, otherwise the commit is handed to a delivery thread of the model and a
+        :class:`concurrent.futures.Future` is returned. Either resolves with the callback results
+        keyed by subscriber once every subscriber processed the commit. Blocking deliveries wait for
+        pending non-blocking deliveries to preserve commit order and then run in the committing thread.
+
+        :param future: return a future instead of blocking until delivery, defaults to False
+        :type future: bool, optional
+        :return: delivery future if requested
+        :rtype: Optional[Delivery]
+        """
+        committed = time.perf_counter()
+        version, ref = self.version, self.ref
+        for stream in self.streams:
+            stream.push(version, ref)
+        if not self.queue and not future:
+            return None
         loop = self._get_asyncio_ctx()
         if loop.is_running():
-            self._logger.debug("Loop is running schedule callbacks")
-            loop.create_task(self.cb_runner(), name=f"cb_runner_{self}")
-            return
+            self._logger.debug("Loop is running, enqueue subscriber deliveries")
+            model = str(self)
+            subscribers = [subscriber for subscriber in self.queue if not subscriber.suspended]
+            completion = Completion(loop.create_future(), len(subscribers)) if future else None
+            for subscriber in subscribers:
+                subscriber.enqueue(loop, model, version, ref, committed, completion)
+            return completion.future if completion is not None else None
+        if not self.queue:
+            loop.close()
+            done: Future = Future()
+            done.set_result({})
+            return done
+        if future:
+            self._logger.debug("Loop is not running, hand callbacks to the delivery thread")
+            return self._deliver(loop, committed, version, ref)
+        pending = self._last_delivery
+        if pending is not None and self._delivery_thread is not None and \
+                self._delivery_thread.ident != get_ident():
+            # a subscriber committing from the delivery thread must not wait for its own delivery
+            wait((pending,))
         self._logger.debug("Loop is not running, start event loop and schedule callbacks")
+        self._run(loop, committed, version, ref)
+        return None
+
+    def _deliver(self, loop: AbstractEventLoop, committed: float, version: int, ref: _S) -> Future:
+        if self._deliveries is None:
+            self._deliveries = SimpleQueue()
+            self._delivery_thread = Thread(target=self._drain, args=(self._deliveries,),
+                                           name=f"myosin_delivery_{self}", daemon=True)
+            self._delivery_thread.start()
+        delivery: Future = Future()
+        self._last_delivery = delivery
+        self._deliveries.put((delivery, loop, committed, version, ref))
+        return delivery
+
+    def _drain(self, deliveries: "SimpleQueue[Optional[Tuple[Future, AbstractEventLoop, float, int, _S]]]") -> None:
+        while True:
+            item = deliveries.get()
+            if item is None:
+                return
+            delivery, loop, committed, version, ref = item
+            if not delivery.set_running_or_notify_cancel():
+                loop.close()
+                continue
+            try:
+                delivery.set_result(self._run(loop, committed, version, ref))
+            except BaseException as exc:
+                delivery.set_exception(exc)
+
+    def close(self) -> None:
+        """
+        Stop the delivery thread once the pending non-blocking deliveries are made
+        """
+        if self._deliveries is not None:
+            self._deliveries.put(None)
+            self._deliveries = None
+            self._delivery_thread = None
+
+    def _run(self, loop: AbstractEventLoop, committed: float, version: int, ref: _S) -> Dict[Subscriber[_S], Any]:
         try:
-            loop.run_until_complete(self.cb_runner())
+            return loop.run_until_complete(self.cb_runner(committed, version, ref))
         finally:
+            # detached subscribers cannot outlive the delivery loop
+            pending = asyncio.all_tasks(loop)
+            if pending:
+                for task in pending:
+                    task.cancel()
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
             loop.run_until_complete(loop.shutdown_asyncgens())
             loop.close()
 
-    async def cb_runner(self) -> None:
+    async def cb_runner(self, committed: Optional[float] = None, version: Optional[int] = None,
+                        ref: Optional[_S] = None) -> Dict[Subscriber[_S], Any]:
         """
         Executes all subscriber coroutines with new model reference.
+
+        :param committed: :func:`time.perf_counter` timestamp of the commit, defaults to now
+        :type committed: Optional[float], optional
+        :param version: sequence number of the delivered commit, defaults to the latest commit
+        :type version: Optional[int], optional
+        :param ref: delivered model reference, defaults to the latest commit
+        :type ref: Optional[_S], optional
+        :return: callback results or exceptions keyed by subscriber
+        :rtype: Dict[Subscriber[_S], Any]
         """
+        if committed is None:
+            committed = time.perf_counter()
+        if version is None or ref is None:
+            version, ref = self.version, self.ref
+        model = str(self)
+        subscribers = [subscriber for subscriber in self.queue if not subscriber.suspended]
+        for subscriber in subscribers:
+            subscriber.delivered = version
         # construct coroutine lists
-        tasks = [callback(self.ref) for callback in self.queue]
+        tasks = [subscriber.deliver(model, ref, committed) for subscriber in subscribers]
         # return results from coroutines with exceptions if any
         results = await asyncio.gather(*tasks, return_exceptions=True)
-        # reformat tasks to display only the name
-        operations = tuple(zip(map(lambda x: x.__qualname__, tasks), results))
-        self._logger.debug("%s Subscriber operations: %s", type(self.ref).__name__, operations)
+        self._logger.debug("%s Subscriber operations: %s", model, tuple(zip(map(str, subscribers), results)))
         # filter by operations which yielded an exception
-        exceptions: List[Tuple[str, Exception]] = list(
-            filter(lambda x: type(x[1]) is BaseException, operations))
-        for func, exc in exceptions:
-            # track aggregate exceptions
-            metrics.exc_count.labels(str(self)).inc()
-            self._logger.exception("Subscriber function: %s encountered an exception: %s", func,
-                                   "".join(traceback.format_exception(
-                                       etype=type(exc), value=exc, tb=exc.__traceback__
-                                   )))
+        for subscriber, result in zip(subscribers, results):
+            if isinstance(result, BaseException):
+                subscriber.report(model, result)
+        return dict(zip(subscribers, results))
 
     def _get_asyncio_ctx(self) -> AbstractEventLoop:
         """
@@ -6,17 +6,40 @@ State Context Manager
 Copyright © 2022 Christian Sargusingh. All rights reserved.
 """
 
+import os
 import copy
+import contextlib
+import time
+import asyncio
 import logging
-from typing import Dict, Set, Type, Callable, TypeVar
+from threading import Lock, get_ident
+from typing import (TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Type, Callable, TypeVar,
+                    Union, overload)
+from concurrent.futures import Executor, ThreadPoolExecutor
 
 from myosin.state.ssm import SSM
+from myosin.state.waiter import Waiter
+from myosin.state.projection import Projection
+from myosin.state.snapshot import Snapshot, clock
+from myosin.state.tier import tier
+from myosin.state.subscriber import CANCEL, Delivery, Subscriber, SubscriberGroup
 from myosin.typing import AsyncCallback
 from myosin.utils.funcs import pformat
-from myosin.utils.metrics import Metrics as metrics
-from myosin.models.state import StateModel
+from myosin.utils.metrics import metrics
+from myosin.models.state import BP_ENV_VAR, StateModel, read_cache
+from myosin.exceptions.cache import NullCachePathError
 from myosin.exceptions.state import ModelNotFound, UninitializedStateError
 
+if TYPE_CHECKING:
+    # feature modules are imported on first use to keep the import time of the engine low
+    from myosin.state.stream import Stream
+    from myosin.state.window import Window
+    from myosin.state.history import History
+    from myosin.state.columns import Columns
+    from myosin.state.replay import Recorder
+    from myosin.state.ingest import Ingest
+    from myosin.state.loader import LoaderFunction
+
 #: generic :class:`myosin.models.state.StateModel` type
 GenericModel = TypeVar('GenericModel', bound=StateModel)
 
@@ -39,6 +62,12 @@ class State:
 
     # shared state memory
     _ssm: Dict[int, SSM] = {}
+    # serializes registry insertions
+    _registry_lock = Lock()
+    # subscriptions to model type hierarchies
+    _groups: List[SubscriberGroup] = []
+    # columnar views of model type hierarchies
+    _views: List["Columns"] = []
 
     def __init__(self, *args: Type[StateModel]) -> None:
         """
@@ -58,75 +87,434 @@ class State:
             self.accessors.add(accessor)
 
     def __enter__(self):
-        metrics.active_contexts.inc()
+        metrics.inc("active_contexts")
         for accessor in self.accessors:
-            accessor.lock.acquire()
+            model = str(accessor)
+            requested = time.perf_counter()
+            if not accessor.lock.acquire(blocking=False):
+                metrics.inc("lock_contention", model)
+                accessor.lock.acquire()
+            acquired = time.perf_counter()
+            accessor.holder = (get_ident(), acquired)
+            metrics.observe("lock_wait", acquired - requested, model)
             self._logger.info("Acquired %s state lock", accessor)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         for accessor in self.accessors:
+            _, acquired = accessor.holder
+            accessor.holder = None
             accessor.lock.release()
+            metrics.observe("lock_hold", time.perf_counter() - acquired, str(accessor))
             self._logger.info("Released %s state lock", accessor)
-        metrics.active_contexts.dec()
+        metrics.dec("active_contexts")
 
-    def load(self, model: GenericModel) -> GenericModel:
+    def load(self, model: GenericModel, loader: Optional["LoaderFunction"] = None, ttl: Optional[float] = None,
+             stale: bool = False) -> GenericModel:
         """
         Register :class:`myosin.models.state.StateModel` into global system state registry. 
         If a model of the same type is found in the system cache, overwrite default properties with
         that of the cached state.
 
+        Models which mirror a slow external source can be registered with a ``loader`` which returns
+        a model or a dictionary of changed fields. :func:`State.checkout` and :func:`State.read` call
+        it on first access and once the loaded model is older than ``ttl``. See
+        :mod:`myosin.state.loader`.
+
+        .. code-block:: python
+
+            with State() as state:
+                state.load(Config(), loader=read_config, ttl=30.0, stale=True)
+
         :param model: user-defined state model. Must implement :class:`myosin.models.state.StateModel`.
         :type model: GenericModel
+        :param loader: read-through loader function, defaults to None
+        :type loader: Optional[LoaderFunction], optional
+        :param ttl: seconds a loaded model is served before it is reloaded, defaults to never reloading
+        :type ttl: Optional[float], optional
+        :param stale: serve expired models while they are reloaded in the background, defaults to False
+        :type stale: bool, optional
         :raises UninitializedStateError: if user-defined state model cannot be serialized
+        :raises ValueError: if the time to live is negative
         :return: model loaded into state registry
         :rtype: GenericModel 
         """
         # attempt to load a previously cached model into the system state.
         model.load()
-        # validate the object is json serializable
+        serialized_model = self._validate(model)
+        ssm = SSM[GenericModel](model)
+        if loader is not None:
+            from myosin.state.loader import Loader
+            ssm.loader = Loader(ssm, loader, ttl=ttl, stale=stale)
+        with self._registry_lock:
+            self._register(model, ssm)
+        # defer pretty printing, it dominates registration time on large models
+        if self._logger.isEnabledFor(logging.INFO):
+            self._logger.info("Loaded state model: %s", pformat(serialized_model))
+        return model
+
+    def load_all(self, models: Iterable[StateModel], processes: bool = False,
+                 max_workers: Optional[int] = None) -> List[StateModel]:
+        """
+        Register a batch of :class:`myosin.models.state.StateModel` objects. Cached documents are read
+        and decoded concurrently in a worker pool while deserialization and registration happen in the
+        calling thread in the order the models were given. Registration is all or nothing: if any
+        model fails validation none of the batch is registered.
+
+        .. code-block:: python
+
+            with State() as state:
+                state.load_all([Telemetry(), System()])
+
+        :param models: user-defined state models. Must implement :class:`myosin.models.state.StateModel`.
+        :type models: Iterable[StateModel]
+        :param processes: decode documents in a process pool instead of a thread pool. Only worthwhile
+            for very large documents where json decoding dominates, defaults to False
+        :type processes: bool, optional
+        :param max_workers: maximum number of pool workers, defaults to the executor default
+        :type max_workers: Optional[int], optional
+        :raises UninitializedStateError: if any user-defined state model cannot be serialized
+        :return: models loaded into state registry
+        :rtype: List[StateModel]
+        """
+        models = list(models)
+        pool: Executor
+        if processes:
+            # deferred, the process pool machinery adds noticeably to import time
+            from concurrent.futures import ProcessPoolExecutor
+            pool = ProcessPoolExecutor(max_workers)
+        else:
+            pool = ThreadPoolExecutor(max_workers)
+        with pool:
+            documents = [pool.submit(read_cache, model._cpath) for model in models]
+            for model, document in zip(models, documents):
+                model.load(document)
+        serialized_models = [self._validate(model) for model in models]
+        with self._registry_lock:
+            for model in models:
+                self._register(model, SSM[StateModel](model))
+        if self._logger.isEnabledFor(logging.INFO):
+            for serialized_model in serialized_models:
+                self._logger.info("Loaded state model: %s", pformat(serialized_model))
+        return models
+
+    def _register(self, model: StateModel, ssm: SSM) -> None:
+        # callers hold the registry lock so no group subscription can miss the new model
+        for group in self._groups:
+            if not group.closed and group.matches(type(model)):
+                group.attach(ssm)
+        for view in self._views:
+            if not view.closed and view.matches(type(model)):
+                view.attach(ssm)
+        self._ssm[model.__typehash__()] = ssm
+
+    @staticmethod
+    def _validate(model: StateModel) -> Dict:
+        """
+        Validate the model is json serializable before it is registered.
+
+        :param model: user-defined state model
+        :type model: StateModel
+        :raises UninitializedStateError: if user-defined state model cannot be serialized
+        :return: serialized model
+        :rtype: Dict
+        """
         try:
-            serialized_model = model.serialize()
+            return model.serialize()
         except AttributeError as exc:
             raise UninitializedStateError(
                 f"Failed to register model of type {type(model)}. Cannot be serialized.") from exc
-        self._ssm[model.__typehash__()] = SSM[GenericModel](model)
-        self._logger.info("Loaded state model: %s", pformat(serialized_model))
-        return model
 
-    def checkout(self, state_type: Type[GenericModel]) -> GenericModel:
+    @overload
+    def checkout(self, state_type: Type[GenericModel]) -> GenericModel: ...
+
+    @overload
+    def checkout(self, state_type: Type[GenericModel], fields: Sequence[str]) -> Projection[GenericModel]: ...
+
+    def checkout(self, state_type, fields=None):
         """
-        Return a deepcopy of a registered user-defined state model.
+        Return a deepcopy of a registered user-defined state model. If ``fields`` is set only those
+        fields are copied into a read-only :class:`myosin.state.projection.Projection`, which is much
+        cheaper than copying a wide model when a few fields are needed.
+
+        .. code-block:: python
+
+            with State(System) as state:
+                online = state.checkout(System, fields=["online"]).online
 
         :param state_type: user-defined registered state model type
         :type state_type: Type[GenericModel]
+        :param fields: model attributes to project, defaults to a copy of the entire model
+        :type fields: Optional[Sequence[str]], optional
         :raises ModelNotFound: if the requested state type does not exist
-        :return: deep copy of requested state model
-        :rtype: GenericModel
+        :raises AttributeError: if the model has no attribute of a requested field
+        :return: deep copy of requested state model or a projection of its fields
+        :rtype: Union[GenericModel, Projection[GenericModel]]
         """
-        with metrics.checkout_latency.labels(f"{state_type.__qualname__}").time():
+        with metrics.time("checkout_latency", state_type.__qualname__):
             self._logger.info("Checking out state model of type %s", state_type)
             _type_hash = hash(state_type)
             self._logger.debug("Computed type hash: %s", _type_hash)
             ssm = self._ssm.get(_type_hash)
             if not ssm:
                 raise ModelNotFound
+            ssm.touch()
+            if ssm.loader is not None:
+                ssm.loader.access()
+            if fields is not None:
+                return Projection.of(ssm.ref, fields)
             _copy = copy.deepcopy(ssm.ref)
         return _copy
 
-    def commit(self, state: StateModel, cache: bool = False) -> None:
+    def read(self, state_type: Type[GenericModel], fields: Sequence[str]) -> Projection[GenericModel]:
+        """
+        Read fields of a registered model without copying them. Committed models are never modified
+        in place, so the projection is a consistent snapshot of one commit and does not require the
+        model lock. The field values are shared with the committed model and must not be modified.
+
+        .. code-block:: python
+
+            if State().read(System, ["online"]).online:
+                ...
+
+        :param state_type: user-defined registered state model type
+        :type state_type: Type[GenericModel]
+        :param fields: model attributes to read
+        :type fields: Sequence[str]
+        :raises ModelNotFound: if the requested state type does not exist
+        :raises AttributeError: if the model has no attribute of a requested field
+        :return: projection of the committed model
+        :rtype: Projection[GenericModel]
+        """
+        ssm = self._ssm.get(hash(state_type))
+        if not ssm:
+            raise ModelNotFound
+        ssm.touch()
+        if ssm.loader is not None:
+            ssm.loader.access()
+        return Projection.of(ssm.ref, fields, deep=False)
+
+    def snapshot(self, *state_types: Type[StateModel]) -> Snapshot:
+        """
+        Take a consistent point-in-time snapshot of several registered models without acquiring their
+        locks. The snapshot reflects every commit up to a single instant and none after it, readers
+        never block writers and writers never block readers.
+
+        .. code-block:: python
+
+            snapshot = State().snapshot(System, Telemetry)
+            if snapshot[System].online:
+                publish(snapshot[Telemetry])
+
+        :param state_types: user-defined registered state model types, defaults to all registered models
+        :type state_types: Type[StateModel]
+        :raises ModelNotFound: if a requested state type does not exist
+        :return: snapshot of the committed models. The models must not be modified
+        :rtype: Snapshot
+        """
+        if not state_types:
+            ssms = list(self._ssm.values())
+        else:
+            ssms = []
+            for state_type in state_types:
+                ssm = self._ssm.get(hash(state_type))
+                if not ssm:
+                    raise ModelNotFound(f"Could not snapshot model of type {state_type}. Model is not registered.")
+                ssms.append(ssm)
+        for ssm in ssms:
+            ssm.touch()
+        return clock.snapshot(ssms)
+
+    def version(self, state_type: Type[StateModel]) -> int:
+        """
+        Get the sequence number of the latest commit to a registered model. The sequence number starts
+        at zero on registration and increases by one on every commit.
+
+        :param state_type: user-defined registered state model type
+        :type state_type: Type[StateModel]
+        :raises ModelNotFound: if the requested state type does not exist
+        :return: commit sequence number
+        :rtype: int
+        """
+        ssm = self._ssm.get(hash(state_type))
+        if not ssm:
+            raise ModelNotFound
+        return ssm.version
+
+    def wait_for(self, state_type: Type[GenericModel], predicate: Optional[Callable[[GenericModel], bool]] = None,
+                 timeout: Optional[float] = None, after_version: Optional[int] = None) -> Optional[GenericModel]:
+        """
+        Block until a registered model matches a predicate and return a deepcopy of it. The predicate is
+        evaluated by committing threads, so the waiting thread is only woken once a matching commit
+        lands. Do not wait while holding the lock of the awaited model. Use :func:`State.wait_for_version`
+        to wait for consecutive commits.
+
+        :param state_type: user-defined registered state model type
+        :type state_type: Type[GenericModel]
+        :param predicate: match condition evaluated against the committed model. Keep it cheap, it runs
+            on the committing thread, defaults to any model
+        :type predicate: Optional[Callable[[GenericModel], bool]], optional
+        :param timeout: maximum time to wait in seconds, defaults to no timeout
+        :type timeout: Optional[float], optional
+        :param after_version: only match commits with a greater sequence number. If unset the current
+            model is matched without waiting, defaults to None
+        :type after_version: Optional[int], optional
+        :raises ModelNotFound: if the requested state type does not exist
+        :return: deep copy of the matching model or None on timeout
+        :rtype: Optional[GenericModel]
+        """
+        match = self.wait_for_version(state_type, predicate, timeout, after_version)
+        return match[1] if match is not None else None
+
+    def wait_for_version(self, state_type: Type[GenericModel],
+                         predicate: Optional[Callable[[GenericModel], bool]] = None, timeout: Optional[float] = None,
+                         after_version: Optional[int] = None) -> Optional[Tuple[int, GenericModel]]:
         """
-        Commit new state to system state and update state subscriber callbacks
+        Counterpart of :func:`State.wait_for` which also returns the sequence number of the matching
+        commit. Pass it as ``after_version`` of the next wait so no commit is skipped between waits.
+
+        .. code-block:: python
+
+            version = 0
+            while True:
+                version, telemetry = state.wait_for_version(Telemetry, after_version=version)
+
+        :param state_type: user-defined registered state model type
+        :type state_type: Type[GenericModel]
+        :param predicate: match condition evaluated against the committed model. Keep it cheap, it runs
+            on the committing thread, defaults to any model
+        :type predicate: Optional[Callable[[GenericModel], bool]], optional
+        :param timeout: maximum time to wait in seconds, defaults to no timeout
+        :type timeout: Optional[float], optional
+        :param after_version: only match commits with a greater sequence number. If unset the current
+            model is matched without waiting, defaults to None
+        :type after_version: Optional[int], optional
+        :raises ModelNotFound: if the requested state type does not exist
+        :return: sequence number and deep copy of the matching model or None on timeout
+        :rtype: Optional[Tuple[int, GenericModel]]
+        """
+        ssm = self._ssm.get(hash(state_type))
+        if not ssm:
+            raise ModelNotFound
+        waiter = Waiter[GenericModel](predicate, after_version)
+        if not ssm.watch(waiter) and not waiter.wait(timeout):
+            ssm.unwatch(waiter)
+        return self._collect(waiter)
+
+    async def async_wait_for(self, state_type: Type[GenericModel],
+                             predicate: Optional[Callable[[GenericModel], bool]] = None,
+                             timeout: Optional[float] = None,
+                             after_version: Optional[int] = None) -> Optional[GenericModel]:
+        """
+        Asynchronous counterpart of :func:`State.wait_for`. Suspends the calling coroutine without
+        blocking its event loop.
+
+        :param state_type: user-defined registered state model type
+        :type state_type: Type[GenericModel]
+        :param predicate: match condition evaluated against the committed model, defaults to any model
+        :type predicate: Optional[Callable[[GenericModel], bool]], optional
+        :param timeout: maximum time to wait in seconds, defaults to no timeout
+        :type timeout: Optional[float], optional
+        :param after_version: only match commits with a greater sequence number, defaults to None
+        :type after_version: Optional[int], optional
+        :raises ModelNotFound: if the requested state type does not exist
+        :return: deep copy of the matching model or None on timeout
+        :rtype: Optional[GenericModel]
+        """
+        match = await self.async_wait_for_version(state_type, predicate, timeout, after_version)
+        return match[1] if match is not None else None
+
+    async def async_wait_for_version(self, state_type: Type[GenericModel],
+                                     predicate: Optional[Callable[[GenericModel], bool]] = None,
+                                     timeout: Optional[float] = None,
+                                     after_version: Optional[int] = None) -> Optional[Tuple[int, GenericModel]]:
+        """
+        Asynchronous counterpart of :func:`State.wait_for_version`. Suspends the calling coroutine
+        without blocking its event loop.
+
+        :param state_type: user-defined registered state model type
+        :type state_type: Type[GenericModel]
+        :param predicate: match condition evaluated against the committed model, defaults to any model
+        :type predicate: Optional[Callable[[GenericModel], bool]], optional
+        :param timeout: maximum time to wait in seconds, defaults to no timeout
+        :type timeout: Optional[float], optional
+        :param after_version: only match commits with a greater sequence number, defaults to None
+        :type after_version: Optional[int], optional
+        :raises ModelNotFound: if the requested state type does not exist
+        :return: sequence number and deep copy of the matching model or None on timeout
+        :rtype: Optional[Tuple[int, GenericModel]]
+        """
+        ssm = self._ssm.get(hash(state_type))
+        if not ssm:
+            raise ModelNotFound
+        waiter = Waiter[GenericModel](predicate, after_version, loop=asyncio.get_running_loop())
+        try:
+            if not ssm.watch(waiter):
+                await waiter.wait_async(timeout)
+        finally:
+            ssm.unwatch(waiter)
+        return self._collect(waiter)
+
+    @staticmethod
+    def _collect(waiter: Waiter[GenericModel]) -> Optional[Tuple[int, GenericModel]]:
+        if waiter.error is not None:
+            raise waiter.error
+        if waiter.result is None:
+            return None
+        version, ref = waiter.result
+        return version, copy.deepcopy(ref)
+
+    def commit(self, state: StateModel, cache: bool = False, transfer: bool = False,
+               future: bool = False) -> Optional[Delivery]:
+        """
+        Commit new state to system state and update state subscriber callbacks. The committed model
+        is copied so the caller may keep modifying it. With ``transfer`` the caller hands ownership
+        of the model to the state registry instead: the model is frozen and installed without a
+        copy, and any later assignment to it raises :class:`myosin.exceptions.state.FrozenModelError`.
+
+        .. code-block:: python
+
+            with State(Telemetry) as state:
+                telemetry = state.checkout(Telemetry)
+                telemetry.tp = sample()
+                state.commit(telemetry, transfer=True)
+
+        By default a commit outside of an event loop blocks until every subscriber processed it and a
+        commit inside a running loop returns without any notification of delivery. With ``future`` the
+        commit returns a future which resolves with the callback results keyed by subscriber, so
+        producers can pipeline commits and await their delivery in batches:
+
+        .. code-block:: python
+
+            deliveries = []
+            for sample in samples:
+                with State(Telemetry) as state:
+                    telemetry = state.checkout(Telemetry)
+                    telemetry.tp = sample
+                    deliveries.append(state.commit(telemetry, future=True))
+            await asyncio.gather(*deliveries)
+
+        Inside a running event loop the future is an :class:`asyncio.Future`. Outside of one, delivery
+        is handed to a delivery thread of the model and the future is a
+        :class:`concurrent.futures.Future`. Suspended subscribers are left out of the results and
+        exceptions raised by a callback are returned as its result.
 
         :param state: modified copy of state
         :type state: StateModel
         :param cache: cache the state to disk once updated, defaults to False
         :type cache: bool, optional
+        :param transfer: transfer ownership of the model instead of committing a copy, defaults to False
+        :type transfer: bool, optional
+        :param future: return a delivery future instead of blocking until delivery, defaults to False
+        :type future: bool, optional
         :raises ModelNotFound: if system state has no state registered of the requested type
+        :return: delivery future if requested
+        :rtype: Optional[Delivery]
         """
-        with metrics.commit_latency.labels(f"{state.__class__.__qualname__}").time():
-            # do not trust any external pass-by-reference objects!
-            state = copy.deepcopy(state)
+        with metrics.time("commit_latency", state.__class__.__qualname__):
+            if not transfer:
+                # do not trust any external pass-by-reference objects!
+                state = copy.deepcopy(state)
             self._logger.info("Committing state model of type %s with cache mode: %s",
                               type(state), "enabled" if cache else "disabled")
             # automatic type inference by typehash
@@ -138,29 +526,393 @@ class State:
                     "Committed typehash: %s did not match any state model", _type_hash)
                 raise ModelNotFound
             ssm = self._ssm[_type_hash]
-            ssm.ref = state
-            if len(ssm.queue) > 0:
+            if transfer:
+                state.freeze()
+            ssm.install(state)
+            delivery = None
+            if ssm.queue or ssm.streams or future:
                 self._logger.debug("Executing asynchronous callback queue")
-                ssm.execute()
+                delivery = ssm.execute(future=future)
             if cache:
                 state.cache()
                 self._logger.debug("Cached commited state model %s", state)
+        return delivery
 
-    def subscribe(self, state_type: Type[GenericModel], callback: Callable[[GenericModel], AsyncCallback]) -> None:
+    def update(self, state_type: Type[GenericModel],
+               fn: Optional[Callable[[GenericModel], Union[GenericModel, Dict[str, Any], None]]] = None, /,
+               cache: bool = False, **fields: Any) -> GenericModel:
         """
-        Subscribe an asynchronous state change listener to a designated runtime model
+        Atomically modify a registered model. ``fn`` receives a copy of the current model and either
+        modifies it in place, returns a dictionary of changed fields or returns a new model. Keyword
+        ``fields`` are assigned after ``fn``. The model lock is only held while the update is applied
+        and the result is committed with a single copy and a single dispatch to subscribers.
+
+        .. code-block:: python
+
+            State().update(Counter, lambda counter: {'count': counter.count + 1})
+            # field assignment fast path
+            State().update(System, online=True)
+
+        Without ``fn`` the fields are assigned to a shallow copy of the committed model, which is much
+        cheaper than a deep copy of a wide model. Committed models are never modified in place, so the
+        unchanged fields can be shared between versions.
+
+        The lock is reentrant with respect to a :class:`State` context of the calling thread, so the
+        update may also be applied inside ``with State(Model)``.
+
+        :param state_type: user-defined registered state model type
+        :type state_type: Type[GenericModel]
+        :param fn: update function, defaults to None
+        :type fn: Optional[Callable[[GenericModel], Union[GenericModel, Dict[str, Any], None]]], optional
+        :param cache: cache the state to disk once updated, defaults to False
+        :type cache: bool, optional
+        :raises ModelNotFound: if the requested state type does not exist
+        :raises TypeError: if ``fn`` returns a model of another type
+        :return: committed model. The model is owned by the state registry and frozen
+        :rtype: GenericModel
+        """
+        ssm = self._ssm.get(hash(state_type))
+        if not ssm:
+            raise ModelNotFound
+        ssm.touch()
+        held = ssm.holder is not None and ssm.holder[0] == get_ident()
+        with contextlib.nullcontext() if held else State(state_type):
+            model = copy.copy(ssm.ref) if fn is None else copy.deepcopy(ssm.ref)
+            if fn is not None:
+                result = fn(model)
+                if isinstance(result, StateModel):
+                    if result.__typehash__() != ssm.typehash:
+                        raise TypeError(f"Update of {ssm} returned a model of type {type(result)}")
+                    model = result
+                elif result is not None:
+                    fields = {**result, **fields}
+            for field, value in fields.items():
+                setattr(model, field, value)
+            self.commit(model, cache=cache, transfer=True)
+        return model
+
+    def subscribe(self, state_type: Type[GenericModel], callback: Callable[[GenericModel], AsyncCallback],
+                  timeout: Optional[float] = None, policy: str = CANCEL,
+                  max_failures: Optional[int] = None, subclasses: bool = False,
+                  weak: bool = False) -> Union[Subscriber[GenericModel], SubscriberGroup[GenericModel]]:
+        """
+        Subscribe an asynchronous state change listener to a designated runtime model. Subscribers are
+        delivered concurrently so a slow subscriber does not delay delivery to the others. Set a
+        ``timeout`` to bound how long a delivery round waits on this subscriber; in the synchronous
+        runtime this also bounds how long :func:`State.commit` blocks.
+
+        Subscribing to a base class which is not registered itself, or with ``subclasses``, subscribes
+        the listener to every registered model of that type or its subclasses, including models
+        registered later. Subscribe to :class:`myosin.models.state.StateModel` to listen to all models.
+        Each matching model delivers to its own subscriber, so a commit only visits the listeners of the
+        committed model.
+
+        Call ``unsubscribe`` on the returned handle to stop delivery. With ``weak`` a bound method
+        callback does not keep its instance alive and is unsubscribed once the instance is collected.
+
+        .. code-block:: python
+
+            with State() as state:
+                state.subscribe(Telemetry, uplink.report, timeout=0.5, max_failures=3)
+                audit = state.subscribe(StateModel, journal.append, weak=True)
+            ...
+            audit.unsubscribe()
 
         :param state_type: model type to subscribe to
         :type state_type: Type[GenericModel]
         :param callback: state change listener callback
         :type callback: Callable[[GenericModel], AsyncCallback]
+        :param timeout: maximum time in seconds to wait for each delivery, defaults to no timeout
+        :type timeout: Optional[float], optional
+        :param policy: ``"cancel"`` to cancel a timed out callback or ``"detach"`` to let it finish in
+            the background, defaults to ``"cancel"``
+        :type policy: str, optional
+        :param max_failures: suspend the subscriber after this many consecutive timeouts or
+            exceptions, defaults to never suspending
+        :type max_failures: Optional[int], optional
+        :param subclasses: also subscribe to registered subclasses of a registered model type, defaults
+            to False
+        :type subclasses: bool, optional
+        :param weak: hold a bound method callback by a weak reference, defaults to False
+        :type weak: bool, optional
+        :raises ModelNotFound: if the requested state type does not exist and is not a model base class
+        :raises ValueError: if the timeout policy is unknown
+        :return: registered subscriber, or a subscriber group for model type hierarchies
+        :rtype: Union[Subscriber[GenericModel], SubscriberGroup[GenericModel]]
         """
         _type_hash = hash(state_type)
         ssm = self._ssm.get(_type_hash)
-        if not ssm:
+        if ssm and not subclasses:
+            subscriber = Subscriber[GenericModel](callback, timeout=timeout, policy=policy,
+                                                  max_failures=max_failures, weak=weak)
+            subscriber.attach(ssm)
+            return subscriber
+        if not (isinstance(state_type, type) and issubclass(state_type, StateModel)):
             self._logger.error("Subscribed typehash: %s did not match any state model", _type_hash)
             raise ModelNotFound
-        ssm.queue.append(callback)
+        group = SubscriberGroup[GenericModel](state_type, callback, timeout=timeout, policy=policy,
+                                              max_failures=max_failures, weak=weak)
+        with self._registry_lock:
+            for ssm in list(self._ssm.values()):
+                if group.matches(ssm.model_type):
+                    group.attach(ssm)
+            # drop unsubscribed groups
+            self._groups[:] = [existing for existing in self._groups if not existing.closed] + [group]
+        self._logger.info("Subscribed %s to %s registered models", group, len(group.subscribers))
+        return group
+
+    def stream(self, state_type: Type[GenericModel], buffer: int = 64,
+               conflate: bool = False) -> "Stream[GenericModel]":
+        """
+        Open an asynchronous iterator over snapshots of a registered model committed after the stream
+        is opened. Snapshots are buffered by the stream until they are consumed, if the consumer falls
+        more than ``buffer`` commits behind the oldest snapshots are dropped. With ``conflate`` only the
+        latest snapshot is kept. Close the stream when done, preferably by using it as an async
+        context manager.
+
+        .. code-block:: python
+
+            async with State().stream(Telemetry, conflate=True) as stream:
+                async for telemetry in stream:
+                    await uplink.publish(telemetry)
+
+        :param state_type: model type to stream
+        :type state_type: Type[GenericModel]
+        :param buffer: maximum number of buffered snapshots, defaults to 64
+        :type buffer: int, optional
+        :param conflate: only keep the latest snapshot, defaults to False
+        :type conflate: bool, optional
+        :raises ModelNotFound: if the requested state type does not exist
+        :return: snapshot stream
+        :rtype: Stream[GenericModel]
+        """
+        ssm = self._ssm.get(hash(state_type))
+        if not ssm:
+            raise ModelNotFound(f"Could not stream model of type {state_type}. Model is not registered.")
+        from myosin.state.stream import Stream
+        return Stream[GenericModel](ssm, buffer=buffer, conflate=conflate)
+
+    def window(self, state_type: Type[StateModel], field: str, size: Optional[int] = None,
+               period: Optional[float] = None, capacity: int = 4096) -> "Window":
+        """
+        Attach an incrementally updated aggregation window to a numeric field of a registered model.
+        Use ``size`` for a window over the most recent commits or ``period`` for a window over the
+        commits in the last ``period`` seconds.
+
+        .. code-block:: python
+
+            with State() as state:
+                window = state.window(Telemetry, "tp", size=100)
+            logging.info("tp mean=%s min=%s max=%s", window.mean, window.min, window.max)
+
+        :param state_type: user-defined registered state model type
+        :type state_type: Type[StateModel]
+        :param field: numeric model attribute to aggregate
+        :type field: str
+        :param size: number of most recent commits in the window
+        :type size: Optional[int], optional
+        :param period: time span of the window in seconds
+        :type period: Optional[float], optional
+        :param capacity: maximum number of samples held by a time based window, defaults to 4096
+        :type capacity: int, optional
+        :raises ModelNotFound: if the requested state type does not exist
+        :raises ValueError: if not exactly one of ``size`` or ``period`` is set
+        :return: aggregation window
+        :rtype: Window
+        """
+        ssm = self._ssm.get(hash(state_type))
+        if not ssm:
+            raise ModelNotFound
+        from myosin.state.window import Window
+        return Window(ssm, field, size=size, period=period, capacity=capacity)
+
+    def columns(self, state_type: Type[StateModel], fields: Sequence[str]) -> "Columns":
+        """
+        Mirror numeric and boolean fields of every registered model of a type or its subclasses into
+        columns updated on commit. Each column holds one row per model, so fleet wide aggregates are
+        single vectorized operations. Models of the type registered later are added to the view.
+
+        .. code-block:: python
+
+            with State() as state:
+                fleet = state.columns(Sensor, ["tp", "online"])
+            logging.info("Mean temperature: %s", fleet["tp"].mean())
+
+        :param state_type: user-defined state model base type
+        :type state_type: Type[StateModel]
+        :param fields: numeric or boolean model attributes to mirror
+        :type fields: Sequence[str]
+        :raises ModelNotFound: if no registered model is of the requested type
+        :return: columnar view
+        :rtype: Columns
+        """
+        from myosin.state.columns import Columns
+        with self._registry_lock:
+            ssms = [ssm for ssm in list(self._ssm.values()) if issubclass(ssm.model_type, state_type)]
+            if not ssms:
+                raise ModelNotFound(f"No registered model is of type {state_type}")
+            view = Columns(state_type, ssms, fields)
+            # drop closed views
+            self._views[:] = [existing for existing in self._views if not existing.closed] + [view]
+        return view
+
+    def history(self, state_type: Type[StateModel], fields: Sequence[str], path: Optional[str] = None,
+                capacity: int = 65536) -> "History":
+        """
+        Record the values of numeric fields of a registered model on every commit to a columnar history
+        store of memory-mapped files. Query recorded rows by time range with :func:`History.range`.
+
+        .. code-block:: python
+
+            with State() as state:
+                history = state.history(Telemetry, ["tp"])
+            ...
+            rows = history.range(start=time.time() - 3600)
+
+        :param state_type: user-defined registered state model type
+        :type state_type: Type[StateModel]
+        :param fields: numeric model attributes to record
+        :type fields: Sequence[str]
+        :param path: directory of the history column files, defaults to ``history/<Model>`` under the
+            ``MYOSIN_CACHE_BASE_PATH`` caching directory
+        :type path: Optional[str], optional
+        :param capacity: number of preallocated rows, doubled whenever full, defaults to 65536
+        :type capacity: int, optional
+        :raises ModelNotFound: if the requested state type does not exist
+        :raises NullCachePathError: if no path is given and the caching base path is unset
+        :return: history store
+        :rtype: History
+        """
+        ssm = self._ssm.get(hash(state_type))
+        if not ssm:
+            raise ModelNotFound
+        if path is None:
+            base_path = os.environ.get(BP_ENV_VAR)
+            if not base_path:
+                raise NullCachePathError(
+                    f"History path is unset. Pass a path or set the {BP_ENV_VAR} environment variable")
+            path = os.path.join(base_path, "history", state_type.__qualname__)
+        from myosin.state.history import History
+        return History(ssm, fields, path, capacity=capacity)
+
+    def record(self, path: str, *state_types: Type[StateModel]) -> "Recorder":
+        """
+        Record the commits of registered models to a JSON lines file for replay with
+        :class:`myosin.state.replay.Replayer`.
+
+        .. code-block:: python
+
+            with State() as state:
+                with state.record("commits.jsonl", Telemetry, Config):
+                    ...
+
+        :param path: recording file path
+        :type path: str
+        :param state_types: user-defined registered state model types, defaults to all registered models
+        :type state_types: Type[StateModel]
+        :raises ModelNotFound: if a requested state type does not exist
+        :return: commit recorder
+        :rtype: Recorder
+        """
+        from myosin.state.replay import Recorder
+        if not state_types:
+            return Recorder(list(self._ssm.values()), path)
+        ssms = []
+        for state_type in state_types:
+            ssm = self._ssm.get(hash(state_type))
+            if not ssm:
+                raise ModelNotFound(f"Could not record model of type {state_type}. Model is not registered.")
+            ssms.append(ssm)
+        return Recorder(ssms, path)
+
+    def ingest(self, state_type: Type[StateModel], capacity: int = 4096, batch: int = 256,
+               interval: float = 0.001) -> "Ingest":
+        """
+        Open a lock-free ingestion channel for high frequency field updates of a registered model.
+        Producers push updates into a preallocated ring without acquiring the model lock and a single
+        applier thread commits them in batches with :func:`State.update`. See :mod:`myosin.state.ingest`.
+
+        .. code-block:: python
+
+            with State() as state:
+                ingest = state.ingest(Telemetry)
+            ingest.push(tp=uart.read_temperature())
+            ...
+            ingest.stop()
+
+        :param state_type: user-defined registered state model type
+        :type state_type: Type[StateModel]
+        :param capacity: number of ring slots, rounded up to a power of two, defaults to 4096
+        :type capacity: int, optional
+        :param batch: maximum number of updates folded into one commit, defaults to 256
+        :type batch: int, optional
+        :param interval: applier poll interval in seconds while the ring is empty, defaults to 0.001
+        :type interval: float, optional
+        :raises ModelNotFound: if the requested state type does not exist
+        :return: started ingestion channel
+        :rtype: Ingest
+        """
+        if hash(state_type) not in self._ssm:
+            raise ModelNotFound(f"Could not ingest model of type {state_type}. Model is not registered.")
+        from myosin.state.ingest import Ingest
+        ingest = Ingest(state_type, capacity=capacity, batch=batch, interval=interval)
+        ingest.start()
+        return ingest
+
+    def budget(self, max_bytes: Optional[int]) -> None:
+        """
+        Set a memory budget for the registry. Whenever the estimated size of the resident models
+        exceeds the budget, the least recently used models which are unlocked and have no
+        subscribers, streams, observers or waiters are cached to disk and evicted. Evicted models are
+        reloaded transparently on their next access. See :mod:`myosin.state.tier`.
+
+        .. code-block:: python
+
+            with State() as state:
+                state.budget(64 * 1024 * 1024)
+
+        :param max_bytes: maximum estimated size of the resident models in bytes, None disables eviction
+        :type max_bytes: Optional[int]
+        """
+        self._logger.info("Setting registry memory budget to %s bytes", max_bytes)
+        tier.configure(max_bytes, self._ssm)
+
+    def slow_subscribers(self, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Report subscriber delivery statistics across all registered models ordered by the total time
+        spent in each callback. The subscriber at the top of the report is the consumer most likely
+        limiting the commit pipeline.
+
+        :param limit: maximum number of subscribers to report, defaults to all subscribers
+        :type limit: Optional[int], optional
+        :return: subscriber statistics with latencies in seconds
+        :rtype: List[Dict]
+        """
+        report = [{'model': str(ssm), **subscriber.serialize()}
+                  for ssm in list(self._ssm.values()) for subscriber in list(ssm.queue)]
+        report.sort(key=lambda x: x['total'], reverse=True)
+        return report[:limit]
+
+    def footprint(self) -> List[Dict]:
+        """
+        Report the estimated memory footprint of all registered models ordered by size. Sizes are
+        measured at the time of the call and the exported gauges are refreshed. Between reports the
+        gauges are refreshed every ``SAMPLE_INTERVAL`` commits, see :mod:`myosin.state.footprint`.
+
+        :return: model sizes in bytes with their pending subscriber deliveries and buffered stream
+            snapshots
+        :rtype: List[Dict]
+        """
+        report = [{
+            'model': str(ssm),
+            'version': ssm.version,
+            'bytes': ssm.measure(),
+            'pending': ssm.pending,
+            'subscribers': len(ssm.queue),
+            'streams': len(ssm.streams)
+        } for ssm in list(self._ssm.values())]
+        report.sort(key=lambda x: x['bytes'], reverse=True)
+        return report
 
     def reset(self) -> None:
         """
@@ -169,4 +921,7 @@ class State:
         self._logger.info("Resetting global system state")
         for _, ssm in self._ssm.items():
             ssm.ref.clear()
+            ssm.close()
         self._ssm.clear()
+        self._groups.clear()
+        self._views.clear()
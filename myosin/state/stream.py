@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+State Stream
+============
+
+Asynchronous iterator over committed snapshots of a registered model. Commits are buffered by the
+stream and handed to the consumer without creating a task per item.
+
+.. code-block:: python
+
+    async with State().stream(Telemetry, buffer=16) as stream:
+        async for telemetry in stream:
+            ...
+
+Copyright © 2022 Christian Sargusingh. All rights reserved.
+"""
+
+import asyncio
+import logging
+from threading import Lock
+from collections import deque
+from asyncio.events import AbstractEventLoop
+from typing import TYPE_CHECKING, Deque, Generic, Optional, Tuple, TypeVar
+
+from myosin.utils.metrics import metrics
+from myosin.models.state import StateModel
+
+if TYPE_CHECKING:
+    from myosin.state.ssm import SSM
+
+
+_S = TypeVar('_S', bound=StateModel)
+
+
+class Stream(Generic[_S]):
+    """
+    Committed snapshot stream created by :func:`myosin.state.state.State.stream`. Yielded snapshots
+    are shared with other consumers and must not be mutated.
+
+    :param ssm: registered model wrapper to stream from
+    :type ssm: SSM
+    :param buffer: maximum number of buffered snapshots. When the buffer is full the oldest snapshot is
+        dropped, defaults to 64
+    :type buffer: int, optional
+    :param conflate: only buffer the latest snapshot, defaults to False
+    :type conflate: bool, optional
+    :raises ValueError: if the buffer size is not positive
+    """
+
+    def __init__(self, ssm: "SSM[_S]", buffer: int = 64, conflate: bool = False) -> None:
+        if buffer < 1:
+            raise ValueError("Stream buffer size must be positive")
+        self._logger = logging.getLogger(__name__)
+        self._ssm = ssm
+        self.buffer = 1 if conflate else buffer
+        self.conflate = conflate
+        #: snapshots dropped on buffer overflow
+        self.dropped = 0
+        #: sequence number of the last yielded snapshot
+        self.version = 0
+        self.closed = False
+        self._lock = Lock()
+        self._items: Deque[Tuple[int, _S]] = deque()
+        self._loop: Optional[AbstractEventLoop] = None
+        self._waiter: Optional[asyncio.Future] = None
+        ssm.streams.add(self)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __aiter__(self) -> "Stream[_S]":
+        return self
+
+    async def __anext__(self) -> _S:
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self._items:
+                    self.version, ref = self._items.popleft()
+                    return ref
+                if self.closed:
+                    raise StopAsyncIteration
+                waiter = self._waiter = self._loop.create_future()
+            await waiter
+
+    async def __aenter__(self) -> "Stream[_S]":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def push(self, version: int, ref: _S) -> None:
+        """
+        Buffer a committed snapshot and wake the consumer. Safe to call from any thread.
+
+        :param version: commit sequence number
+        :type version: int
+        :param ref: committed model reference
+        :type ref: _S
+        """
+        with self._lock:
+            if self.closed:
+                return
+            if len(self._items) >= self.buffer:
+                self._items.popleft()
+                if not self.conflate:
+                    self.dropped += 1
+                    metrics.inc("stream_dropped", str(self._ssm))
+            self._items.append((version, ref))
+            waiter = self._waiter
+            self._waiter = None
+        if waiter is not None:
+            self._wake(waiter)
+
+    def close(self) -> None:
+        """
+        Stop streaming. Buffered snapshots are still yielded before iteration ends.
+        """
+        with self._lock:
+            self.closed = True
+            waiter = self._waiter
+            self._waiter = None
+        self._ssm.streams.discard(self)
+        if waiter is not None:
+            self._wake(waiter)
+
+    def _wake(self, waiter: asyncio.Future) -> None:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._resolve(waiter)
+        elif self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._resolve, waiter)
+
+    @staticmethod
+    def _resolve(waiter: asyncio.Future) -> None:
+        if not waiter.done():
+            waiter.set_result(None)
@@ -0,0 +1,454 @@
+# -*- coding: utf-8 -*-
+"""
+State Subscriber
+================
+
+Registered state change listener wrapper. Tracks per-subscriber callback latency and the lag
+between a commit and the start of its delivery, and isolates slow or failing subscribers with
+delivery timeouts and automatic suspension.
+
+Copyright © 2022 Christian Sargusingh. All rights reserved.
+"""
+
+import time
+import asyncio
+import logging
+import inspect
+import traceback
+import concurrent.futures
+from weakref import ReferenceType, WeakMethod
+from asyncio.events import AbstractEventLoop
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generic, List, Optional, Set, Tuple, Type, TypeVar, Union
+
+from myosin.typing import AsyncCallback
+from myosin.utils.metrics import Histogram, metrics
+from myosin.models.state import StateModel
+
+if TYPE_CHECKING:
+    from myosin.state.ssm import SSM
+
+
+_S = TypeVar('_S', bound=StateModel)
+
+#: cancel the callback when it exceeds its timeout
+CANCEL = "cancel"
+#: stop waiting for the callback when it exceeds its timeout and let it finish in the background
+DETACH = "detach"
+#: future of a non-blocking commit resolving with the delivery results keyed by subscriber
+Delivery = Union[asyncio.Future, concurrent.futures.Future]
+
+
+class Subscriber(Generic[_S]):
+    """
+    State change listener registered with :func:`myosin.state.state.State.subscribe`.
+
+    :param callback: state change listener callback
+    :type callback: Callable[[_S], AsyncCallback]
+    :param timeout: maximum time in seconds to wait for a delivery, defaults to no timeout
+    :type timeout: Optional[float], optional
+    :param policy: action on timeout, either :data:`CANCEL` or :data:`DETACH`, defaults to :data:`CANCEL`
+    :type policy: str, optional
+    :param max_failures: suspend the subscriber after this many consecutive timeouts or exceptions,
+        defaults to never suspending
+    :type max_failures: Optional[int], optional
+    :param weak: hold a bound method callback by a weak reference and unsubscribe once its instance is
+        collected, other callbacks are always held strongly, defaults to False
+    :type weak: bool, optional
+    :raises ValueError: if the timeout policy is unknown
+    """
+
+    def __init__(self, callback: Callable[[_S], AsyncCallback], timeout: Optional[float] = None,
+                 policy: str = CANCEL, max_failures: Optional[int] = None, weak: bool = False) -> None:
+        if policy not in (CANCEL, DETACH):
+            raise ValueError(f"Unknown subscriber timeout policy: {policy}")
+        self._logger = logging.getLogger(__name__)
+        self._callback: Optional[Callable[[_S], AsyncCallback]] = callback
+        self._weak: Optional[WeakMethod] = None
+        if weak and inspect.ismethod(callback):
+            self._callback = None
+            self._weak = WeakMethod(callback, self._collected)
+        self.name: str = getattr(callback, '__qualname__', repr(callback))
+        self.timeout = timeout
+        self.policy = policy
+        self.max_failures = max_failures
+        #: consecutive failed deliveries
+        self.failures = 0
+        #: total timed out deliveries
+        self.timeouts = 0
+        #: suspended subscribers are skipped on delivery until resumed
+        self.suspended = False
+        #: callback execution time in seconds
+        self.latency = Histogram()
+        #: time in seconds from commit to the start of delivery
+        self.lag = Histogram()
+        #: sequence number of the last delivered commit
+        self.delivered = 0
+        #: unsubscribed subscribers receive no further commits
+        self.closed = False
+        # registered model wrapper whose queue holds the subscriber
+        self._ssm: Optional["ReferenceType[SSM[_S]]"] = None
+        # strong references to detached callbacks still running in the background
+        self._detached: Set[asyncio.Future] = set()
+        # event loop, delivery queue and worker task keyed by event loop id, removed once the worker exits
+        self._workers: Dict[int, Tuple[AbstractEventLoop, asyncio.Queue, asyncio.Task]] = {}
+
+    def __str__(self) -> str:
+        return self.name
+
+    @property
+    def callback(self) -> Optional[Callable[[_S], AsyncCallback]]:
+        """
+        State change listener callback, None once unsubscribed or once the instance of a weakly held
+        bound method was collected
+        """
+        if self._weak is not None:
+            return self._weak()
+        return self._callback
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of commits queued for delivery by this subscriber's workers
+        """
+        return sum(queue.qsize() for _, queue, _ in list(self._workers.values()))
+
+    def enqueue(self, loop: AbstractEventLoop, model: str, version: int, ref: _S, committed: float,
+                completion: Optional["Completion"] = None) -> None:
+        """
+        Queue a commit for delivery by this subscriber's worker on a running event loop. The worker is
+        started on the first delivery and delivers queued commits one at a time in sequence order.
+        Must be called from the thread running ``loop``.
+
+        :param loop: running event loop
+        :type loop: AbstractEventLoop
+        :param model: model label
+        :type model: str
+        :param version: commit sequence number
+        :type version: int
+        :param ref: committed model reference
+        :type ref: _S
+        :param committed: :func:`time.perf_counter` timestamp of the commit
+        :type committed: float
+        :param completion: completion notified once the commit is delivered, defaults to None
+        :type completion: Optional[Completion], optional
+        """
+        worker = self._workers.get(id(loop))
+        if worker is None or worker[0] is not loop or worker[2].done():
+            queue: asyncio.Queue = asyncio.Queue()
+            task = loop.create_task(self._work(model, queue), name=f"subscriber_{model}_{self}")
+            worker = self._workers[id(loop)] = (loop, queue, task)
+        worker[1].put_nowait((version, ref, committed, completion))
+
+    async def _work(self, model: str, queue: asyncio.Queue) -> None:
+        key = id(asyncio.get_running_loop())
+        try:
+            await self._drain(model, queue)
+        finally:
+            worker = self._workers.get(key)
+            if worker is not None and worker[1] is queue:
+                del self._workers[key]
+
+    async def _drain(self, model: str, queue: asyncio.Queue) -> None:
+        while True:
+            item = await queue.get()
+            if item is None:
+                # unsubscribed, commits queued before were skipped
+                queue.task_done()
+                return
+            version, ref, committed, completion = item
+            delivered = False
+            result: Any = None
+            try:
+                if self.closed:
+                    continue
+                if version <= self.delivered:
+                    self._logger.warning("Subscriber %s dropped out of order commit %s after %s",
+                                         self, version, self.delivered)
+                    continue
+                self.delivered = version
+                if self.suspended:
+                    continue
+                try:
+                    result = await self.deliver(model, ref, committed)
+                except asyncio.CancelledError:
+                    raise
+                except BaseException as exc:
+                    self.report(model, exc)
+                    result = exc
+                delivered = True
+            finally:
+                queue.task_done()
+                if completion is not None:
+                    completion.done(self, result, delivered)
+
+    def report(self, model: str, exc: BaseException) -> None:
+        """
+        Count and log a failed delivery. Timeouts are reported on delivery.
+
+        :param model: model label
+        :type model: str
+        :param exc: exception raised by the delivery
+        :type exc: BaseException
+        """
+        if isinstance(exc, asyncio.TimeoutError):
+            return
+        metrics.inc("exc_count", model)
+        self._logger.error("Subscriber function: %s encountered an exception: %s", self,
+                           "".join(traceback.format_exception(type(exc), exc, exc.__traceback__)))
+
+    def resume(self) -> None:
+        """
+        Resume delivery to a suspended subscriber
+        """
+        self.failures = 0
+        self.suspended = False
+
+    def attach(self, ssm: "SSM[_S]") -> None:
+        """
+        Add the subscriber to the delivery queue of a registered model
+
+        :param ssm: registered model wrapper
+        :type ssm: SSM[_S]
+        """
+        self._ssm = ReferenceType(ssm)
+        ssm.add_subscriber(self)
+
+    def unsubscribe(self) -> None:
+        """
+        Stop delivering commits to the subscriber and release its callback. Commits already queued for
+        delivery in a running event loop are skipped.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        ssm = self._ssm() if self._ssm is not None else None
+        if ssm is not None:
+            ssm.remove_subscriber(self)
+        self._callback = None
+        for loop, queue, task in list(self._workers.values()):
+            if not loop.is_closed() and not task.done():
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+        self._logger.info("Unsubscribed %s", self)
+
+    def _collected(self, _: WeakMethod) -> None:
+        self._logger.info("Pruning subscriber %s, its instance was collected", self)
+        self.unsubscribe()
+
+    async def deliver(self, model: str, ref: _S, committed: float) -> Any:
+        """
+        Run the callback with a committed model reference and record its timing
+
+        :param model: model label
+        :type model: str
+        :param ref: committed model reference
+        :type ref: _S
+        :param committed: :func:`time.perf_counter` timestamp of the commit
+        :type committed: float
+        :raises asyncio.TimeoutError: if the callback exceeds the subscriber timeout
+        :return: callback result
+        :rtype: Any
+        """
+        started = time.perf_counter()
+        lag = started - committed
+        self.lag.observe(lag)
+        metrics.observe("cb_lag", lag, model, self.name)
+        try:
+            result = await self._run(ref)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            metrics.inc("cb_timeout", model, self.name)
+            self._logger.warning("Subscriber %s exceeded its %ss delivery timeout", self, self.timeout)
+            self._failed(model)
+            raise
+        except BaseException:
+            self._failed(model)
+            raise
+        else:
+            self.failures = 0
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            self.latency.observe(elapsed)
+            metrics.observe("cb_latency", elapsed, model, self.name)
+
+    async def _run(self, ref: _S) -> Any:
+        callback = self.callback
+        if callback is None:
+            return None
+        if self.timeout is None:
+            return await callback(ref)
+        if self.policy == CANCEL:
+            return await asyncio.wait_for(callback(ref), self.timeout)
+        task = asyncio.ensure_future(callback(ref))
+        self._detached.add(task)
+        task.add_done_callback(self._detached.discard)
+        return await asyncio.wait_for(asyncio.shield(task), self.timeout)
+
+    def _failed(self, model: str) -> None:
+        self.failures += 1
+        if self.max_failures is not None and self.failures >= self.max_failures and not self.suspended:
+            self.suspended = True
+            metrics.inc("cb_suspended", model, self.name)
+            self._logger.error("Suspended subscriber %s after %s consecutive failures", self, self.failures)
+
+    def serialize(self) -> Dict[str, Any]:
+        """
+        Summarize delivery statistics
+
+        :return: subscriber name with latency and lag percentiles in seconds
+        :rtype: Dict[str, Any]
+        """
+        return {
+            'subscriber': self.name,
+            'count': self.latency.count,
+            'total': self.latency.sum,
+            'mean': self.latency.mean,
+            'p99': self.latency.quantile(0.99),
+            'max': self.latency.max if self.latency.count else 0.0,
+            'lag_mean': self.lag.mean,
+            'lag_p99': self.lag.quantile(0.99),
+            'delivered': self.delivered,
+            'timeouts': self.timeouts,
+            'suspended': self.suspended
+        }
+
+
+class Completion:
+    """
+    Countdown of the subscriber deliveries of one commit. Resolves a future with the result of every
+    delivery once all subscribers processed the commit. Must be used from the thread running the
+    event loop of the future.
+
+    :param future: future resolved with the delivery results keyed by subscriber
+    :type future: asyncio.Future
+    :param subscribers: number of subscribers the commit was queued for
+    :type subscribers: int
+    """
+
+    def __init__(self, future: asyncio.Future, subscribers: int) -> None:
+        self.future = future
+        self._remaining = subscribers
+        #: callback results or exceptions keyed by subscriber
+        self.results: Dict[Subscriber, Any] = {}
+        if not subscribers:
+            self._resolve()
+
+    def done(self, subscriber: Subscriber, result: Any, delivered: bool = True) -> None:
+        """
+        Record a finished delivery
+
+        :param subscriber: subscriber which processed the commit
+        :type subscriber: Subscriber
+        :param result: callback result or the exception it raised
+        :type result: Any
+        :param delivered: False if the subscriber skipped the commit, which is left out of the results,
+            defaults to True
+        :type delivered: bool, optional
+        """
+        if delivered:
+            self.results[subscriber] = result
+        self._remaining -= 1
+        if not self._remaining:
+            self._resolve()
+
+    def _resolve(self) -> None:
+        # the caller may have cancelled the future
+        if not self.future.done():
+            self.future.set_result(self.results)
+
+
+class SubscriberGroup(Generic[_S]):
+    """
+    Subscription of one callback to every registered model of a type and its subclasses, registered
+    with :func:`myosin.state.state.State.subscribe`. Every matching model receives its own
+    :class:`Subscriber`, including models registered after the subscription, so dispatching a commit
+    only visits the subscribers of the committed model.
+
+    :param base: subscribed model type, :class:`myosin.models.state.StateModel` subscribes to all models
+    :type base: Type[_S]
+    :param callback: state change listener callback
+    :type callback: Callable[[_S], AsyncCallback]
+    :param kwargs: :class:`Subscriber` delivery options
+    :raises ValueError: if the timeout policy is unknown
+    """
+
+    def __init__(self, base: Type[_S], callback: Callable[[_S], AsyncCallback], **kwargs: Any) -> None:
+        if kwargs.get('policy', CANCEL) not in (CANCEL, DETACH):
+            raise ValueError(f"Unknown subscriber timeout policy: {kwargs['policy']}")
+        self._logger = logging.getLogger(__name__)
+        self.base = base
+        self.name: str = getattr(callback, '__qualname__', repr(callback))
+        self._callback: Optional[Callable[[_S], AsyncCallback]] = callback
+        self._weak: Optional[WeakMethod] = None
+        if kwargs.get('weak') and inspect.ismethod(callback):
+            self._callback = None
+            self._weak = WeakMethod(callback, self._collected)
+        self._options = kwargs
+        #: subscribers of the matching models
+        self.subscribers: List[Subscriber[_S]] = []
+        #: unsubscribed groups are not attached to models registered later
+        self.closed = False
+
+    def __str__(self) -> str:
+        return f"{self.base.__qualname__}/{self.name}"
+
+    @property
+    def callback(self) -> Optional[Callable[[_S], AsyncCallback]]:
+        if self._weak is not None:
+            return self._weak()
+        return self._callback
+
+    def matches(self, model_type: type) -> bool:
+        """
+        Check if a model type is covered by the subscription
+
+        :param model_type: registered model type
+        :type model_type: type
+        :return: True if the model type is the subscribed type or one of its subclasses
+        :rtype: bool
+        """
+        return issubclass(model_type, self.base)
+
+    def attach(self, ssm: "SSM[_S]") -> Optional[Subscriber[_S]]:
+        """
+        Subscribe the callback to a registered model
+
+        :param ssm: registered model wrapper
+        :type ssm: SSM[_S]
+        :return: subscriber of the model, None if the group was unsubscribed
+        :rtype: Optional[Subscriber[_S]]
+        """
+        callback = self.callback
+        if self.closed or callback is None:
+            return None
+        subscriber = Subscriber[_S](callback, **self._options)
+        subscriber.attach(ssm)
+        self.subscribers.append(subscriber)
+        return subscriber
+
+    @property
+    def suspended(self) -> bool:
+        return any(subscriber.suspended for subscriber in self.subscribers)
+
+    def resume(self) -> None:
+        """
+        Resume the suspended subscribers of the group
+        """
+        for subscriber in self.subscribers:
+            subscriber.resume()
+
+    def unsubscribe(self) -> None:
+        """
+        Unsubscribe the callback from every model of the group
+        """
+        self.closed = True
+        self._callback = None
+        for subscriber in self.subscribers:
+            subscriber.unsubscribe()
+        self.subscribers = []
+
+    def _collected(self, _: WeakMethod) -> None:
+        self._logger.info("Pruning subscriber group %s, its instance was collected", self)
+        self.unsubscribe()
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Tiered Storage
+==============
+
+Memory budget for the state registry. Once the estimated size of the resident models exceeds the
+budget, the least recently used models which are not locked and have no subscribers, streams,
+observers or waiters are cached to disk with :func:`myosin.models.state.StateModel.cache` and
+replaced by an empty shell of the same type. The first access to an evicted model reloads it with
+:func:`myosin.models.state.StateModel.load`.
+
+.. code-block:: python
+
+    with State() as state:
+        state.budget(64 * 1024 * 1024)
+
+Evictable models must round trip through :func:`myosin.models.state.StateModel.serialize` and
+:func:`myosin.models.state.StateModel.deserialize` and the ``MYOSIN_CACHE_BASE_PATH`` caching
+directory must be configured.
+
+Copyright © 2022 Christian Sargusingh. All rights reserved.
+"""
+
+import logging
+import itertools
+from threading import RLock
+from typing import TYPE_CHECKING, Dict, Optional
+
+from myosin.utils.metrics import metrics
+
+if TYPE_CHECKING:
+    from myosin.state.ssm import SSM
+
+#: access clock ordering models by recency of use
+ticks = itertools.count(1)
+
+
+class Tier:
+    """
+    Registry memory budget and LRU eviction policy.
+    """
+
+    def __init__(self) -> None:
+        self._logger = logging.getLogger(__name__)
+        #: maximum estimated size of the resident models in bytes, unlimited if unset
+        self.budget: Optional[int] = None
+        self.lock = RLock()
+        self._registry: Dict[int, "SSM"] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.budget is not None
+
+    def configure(self, budget: Optional[int], registry: Dict[int, "SSM"]) -> None:
+        """
+        Set the memory budget of a registry and evict models until it is met
+
+        :param budget: maximum estimated size of the resident models in bytes, None disables eviction
+        :type budget: Optional[int]
+        :param registry: state registry
+        :type registry: Dict[int, SSM]
+        """
+        self.budget = budget
+        self._registry = registry
+        self.enforce()
+
+    def evictable(self, ssm: "SSM") -> bool:
+        """
+        Check if a model is cold enough to be evicted
+
+        :param ssm: registered model wrapper
+        :type ssm: SSM
+        :return: True if the model is resident and has no consumers
+        :rtype: bool
+        """
+        return not (ssm.evicted or ssm.queue or len(ssm.streams) or ssm.observers or ssm.waiters)
+
+    def enforce(self, keep: Optional["SSM"] = None) -> None:
+        """
+        Evict the least recently used evictable models until the resident models fit the budget
+
+        :param keep: model in use which must stay resident, defaults to None
+        :type keep: Optional[SSM], optional
+        """
+        if self.budget is None:
+            return
+        with self.lock:
+            resident = [ssm for ssm in list(self._registry.values()) if not ssm.evicted]
+            size = sum(ssm.footprint for ssm in resident)
+            for ssm in sorted(resident, key=lambda x: x.accessed):
+                if size <= self.budget:
+                    break
+                if ssm is keep or not self.evictable(ssm):
+                    continue
+                # locked models are in use, holding the lock keeps commits out until the shell is installed
+                if not ssm.lock.acquire(blocking=False):
+                    continue
+                try:
+                    ssm.evict()
+                except Exception as exc:
+                    self._logger.error("Failed to evict %s: %s", ssm, exc)
+                    continue
+                finally:
+                    ssm.lock.release()
+                size -= ssm.footprint
+                metrics.inc("tier_eviction", str(ssm))
+                self._logger.info("Evicted %s to the model cache", ssm)
+            self._report()
+
+    def restore(self, ssm: "SSM") -> None:
+        """
+        Reload an evicted model
+
+        :param ssm: registered model wrapper
+        :type ssm: SSM
+        """
+        with self.lock:
+            if not ssm.evicted:
+                return
+            # restoring measures the model which enforces the budget
+            ssm.restore()
+            self._logger.info("Restored %s from the model cache", ssm)
+
+    def _report(self) -> None:
+        resident = [ssm for ssm in list(self._registry.values()) if not ssm.evicted]
+        metrics.set("resident_bytes", sum(ssm.footprint for ssm in resident))
+        metrics.set("resident_models", len(resident))
+
+
+#: registry memory budget
+tier = Tier()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Commit Waiter
+=============
+
+Pending :func:`myosin.state.state.State.wait_for` request. Waiters are evaluated by the committing
+thread so a waiting thread or coroutine is only woken once a matching commit lands.
+
+Copyright © 2022 Christian Sargusingh. All rights reserved.
+"""
+
+import asyncio
+from threading import Event
+from asyncio.events import AbstractEventLoop
+from typing import Callable, Generic, Optional, Tuple, TypeVar
+
+from myosin.models.state import StateModel
+
+
+_S = TypeVar('_S', bound=StateModel)
+
+
+class Waiter(Generic[_S]):
+    """
+    Wait for a commit newer than ``after_version`` which satisfies ``predicate``. Threads wait on an
+    event, coroutines on a future of their event loop.
+
+    :param predicate: match condition evaluated against committed references, defaults to any commit
+    :type predicate: Optional[Callable[[_S], bool]], optional
+    :param after_version: only match commits with a greater sequence number, defaults to any version
+    :type after_version: Optional[int], optional
+    :param loop: event loop of a waiting coroutine, defaults to a waiting thread
+    :type loop: Optional[AbstractEventLoop], optional
+    """
+
+    __slots__ = ('predicate', 'after_version', 'result', 'error', '_event', '_loop', '_future')
+
+    def __init__(self, predicate: Optional[Callable[[_S], bool]] = None, after_version: Optional[int] = None,
+                 loop: Optional[AbstractEventLoop] = None) -> None:
+        self.predicate = predicate
+        self.after_version = -1 if after_version is None else after_version
+        #: sequence number and reference of the matching commit
+        self.result: Optional[Tuple[int, _S]] = None
+        #: exception raised by the predicate
+        self.error: Optional[BaseException] = None
+        self._loop = loop
+        self._event = Event() if loop is None else None
+        self._future: Optional[asyncio.Future] = loop.create_future() if loop is not None else None
+
+    def match(self, version: int, ref: _S) -> bool:
+        """
+        Evaluate a commit and wake the waiter if it matches. Predicate exceptions wake the waiter and
+        are re-raised in the waiting thread or coroutine.
+
+        :param version: commit sequence number
+        :type version: int
+        :param ref: committed reference
+        :type ref: _S
+        :return: True if the waiter was woken
+        :rtype: bool
+        """
+        if version <= self.after_version:
+            return False
+        try:
+            if self.predicate is not None and not self.predicate(ref):
+                return False
+        except Exception as exc:
+            self.error = exc
+        else:
+            self.result = (version, ref)
+        if self._event is not None:
+            self._event.set()
+        elif self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._resolve)
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block the calling thread until woken
+
+        :param timeout: maximum time to wait in seconds, defaults to no timeout
+        :type timeout: Optional[float], optional
+        :return: True if woken before the timeout
+        :rtype: bool
+        """
+        return self._event.wait(timeout)  # type: ignore
+
+    async def wait_async(self, timeout: Optional[float] = None) -> bool:
+        """
+        Suspend the calling coroutine until woken
+
+        :param timeout: maximum time to wait in seconds, defaults to no timeout
+        :type timeout: Optional[float], optional
+        :return: True if woken before the timeout
+        :rtype: bool
+        """
+        try:
+            await asyncio.wait_for(asyncio.shield(self._future), timeout)  # type: ignore
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def _resolve(self) -> None:
+        if not self._future.done():  # type: ignore
+            self._future.set_result(None)  # type: ignore
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Lock Watchdog
+=============
+
+Background monitor for model locks held past a threshold. When a lock is held for longer than the
+threshold the stack of the holding thread is logged once per acquisition.
+
+.. code-block:: python
+
+    from myosin.state import Watchdog
+
+    watchdog = Watchdog(threshold=0.5)
+    watchdog.start()
+
+Copyright © 2022 Christian Sargusingh. All rights reserved.
+"""
+
+import sys
+import time
+import logging
+import traceback
+from threading import Event, Thread
+from typing import Dict, Optional, Tuple
+
+from myosin.state.state import State
+from myosin.utils.metrics import metrics
+
+
+class Watchdog:
+    """
+    Periodically scan registered models for locks held longer than ``threshold`` seconds.
+
+    :param threshold: lock hold time in seconds before the holder stack is logged
+    :type threshold: float
+    :param interval: scan interval in seconds, defaults to a quarter of the threshold
+    :type interval: Optional[float], optional
+    """
+
+    def __init__(self, threshold: float, interval: Optional[float] = None) -> None:
+        self._logger = logging.getLogger(__name__)
+        self.threshold = threshold
+        self.interval = interval if interval is not None else threshold / 4
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+        # last reported holder per model so each acquisition is only reported once
+        self._reported: Dict[int, Tuple[int, float]] = {}
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self) -> None:
+        """
+        Start the watchdog thread
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name="myosin_watchdog", daemon=True)
+        self._thread.start()
+        self._logger.info("Started lock watchdog with a %ss threshold", self.threshold)
+
+    def stop(self) -> None:
+        """
+        Stop the watchdog thread
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def scan(self) -> int:
+        """
+        Report every model lock currently held past the threshold
+
+        :return: number of newly reported lock holders
+        :rtype: int
+        """
+        now = time.perf_counter()
+        frames = None
+        reported = 0
+        for typehash, ssm in list(State._ssm.items()):
+            holder = ssm.holder
+            if holder is None or now - holder[1] < self.threshold or self._reported.get(typehash) == holder:
+                continue
+            self._reported[typehash] = holder
+            if frames is None:
+                frames = sys._current_frames()
+            tid, acquired = holder
+            frame = frames.get(tid)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "<thread exited>\n"
+            metrics.inc("lock_watchdog", str(ssm))
+            self._logger.warning("%s state lock held for %.3fs by thread %s:\n%s", ssm, now - acquired, tid, stack)
+            reported += 1
+        return reported
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.scan()
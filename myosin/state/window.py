@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+Windowed Aggregation
+====================
+
+Incremental aggregates over the committed values of a numeric model field. Samples are kept in a
+preallocated ring buffer and the running sum, minimum and maximum are maintained in amortized O(1)
+per commit. Aggregates are read under the window's own lock, never the model lock.
+
+.. code-block:: python
+
+    with State() as state:
+        window = state.window(Telemetry, "tp", period=60.0)
+    ...
+    logging.info("1 minute mean temperature: %s", window.mean)
+
+Copyright © 2022 Christian Sargusingh. All rights reserved.
+"""
+
+import math
+import time
+import logging
+from array import array
+from threading import Lock
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, Optional, Tuple
+
+from myosin.models.state import StateModel
+from myosin.utils.funcs import import_numpy
+
+if TYPE_CHECKING:
+    from myosin.state.ssm import SSM
+
+
+class Window:
+    """
+    Count or time based window over a numeric model field. Created by
+    :func:`myosin.state.state.State.window`.
+
+    :param ssm: registered model wrapper to observe
+    :type ssm: SSM
+    :param field: model attribute to aggregate
+    :type field: str
+    :param size: number of most recent commits in the window
+    :type size: Optional[int], optional
+    :param period: time span of the window in seconds
+    :type period: Optional[float], optional
+    :param capacity: ring buffer size of a time based window. Older samples are dropped once full,
+        defaults to 4096
+    :type capacity: int, optional
+    :raises ValueError: if not exactly one of ``size`` or ``period`` is set
+    """
+
+    def __init__(self, ssm: "SSM", field: str, size: Optional[int] = None, period: Optional[float] = None,
+                 capacity: int = 4096) -> None:
+        if (size is None) == (period is None):
+            raise ValueError("Window requires exactly one of size or period")
+        if (size is not None and size < 1) or (period is not None and period <= 0):
+            raise ValueError("Window size and period must be positive")
+        self._logger = logging.getLogger(__name__)
+        self._ssm = ssm
+        self.field = field
+        self.size = size
+        self.period = period
+        self.capacity = size if size is not None else capacity
+        self._lock = Lock()
+        self._values = array('d', bytes(8 * self.capacity))
+        self._stamps = array('d', bytes(8 * self.capacity))
+        # sample indices [head, tail) are in the window
+        self._head = 0
+        self._tail = 0
+        self._sum = 0.0
+        self._evicted = 0
+        # monotonic (index, value) queues for sliding minimum and maximum
+        self._min: Deque[Tuple[int, float]] = deque()
+        self._max: Deque[Tuple[int, float]] = deque()
+        ssm.observers.append(self.update)
+
+    def __repr__(self) -> str:
+        return f"Window({self._ssm}.{self.field}, {self.serialize()})"
+
+    def close(self) -> None:
+        """
+        Stop updating the window
+        """
+        if self.update in self._ssm.observers:
+            self._ssm.observers.remove(self.update)
+
+    def update(self, version: int, model: StateModel) -> None:
+        """
+        Add the field value of a committed model to the window
+
+        :param version: commit sequence number
+        :type version: int
+        :param model: committed model
+        :type model: StateModel
+        """
+        try:
+            value = float(getattr(model, self.field))
+        except (AttributeError, TypeError, ValueError) as exc:
+            self._logger.warning("Skipped non-numeric %s.%s sample: %s", self._ssm, self.field, exc)
+            return
+        now = time.monotonic()
+        with self._lock:
+            if self._tail - self._head == self.capacity:
+                self._evict()
+            idx = self._tail
+            slot = idx % self.capacity
+            self._values[slot] = value
+            self._stamps[slot] = now
+            self._tail += 1
+            self._sum += value
+            while self._min and self._min[-1][1] >= value:
+                self._min.pop()
+            self._min.append((idx, value))
+            while self._max and self._max[-1][1] <= value:
+                self._max.pop()
+            self._max.append((idx, value))
+            self._expire(now)
+
+    def _evict(self) -> None:
+        idx = self._head
+        self._sum -= self._values[idx % self.capacity]
+        self._head += 1
+        if self._min and self._min[0][0] == idx:
+            self._min.popleft()
+        if self._max and self._max[0][0] == idx:
+            self._max.popleft()
+        # recompute the running sum once per buffer turn to bound floating point drift
+        self._evicted += 1
+        if self._evicted >= self.capacity:
+            self._evicted = 0
+            self._sum = math.fsum(self._values[i % self.capacity] for i in range(self._head, self._tail))
+
+    def _expire(self, now: float) -> None:
+        if self.period is None:
+            return
+        cutoff = now - self.period
+        while self._head < self._tail and self._stamps[self._head % self.capacity] < cutoff:
+            self._evict()
+
+    @property
+    def count(self) -> int:
+        return self.serialize()['count']
+
+    @property
+    def sum(self) -> float:
+        return self.serialize()['sum']
+
+    @property
+    def mean(self) -> float:
+        return self.serialize()['mean']
+
+    @property
+    def min(self) -> float:
+        return self.serialize()['min']
+
+    @property
+    def max(self) -> float:
+        return self.serialize()['max']
+
+    @property
+    def rate(self) -> float:
+        return self.serialize()['rate']
+
+    @property
+    def last(self) -> float:
+        return self.serialize()['last']
+
+    def serialize(self) -> Dict[str, Any]:
+        """
+        Read a consistent set of aggregates. ``rate`` is the change in value per second between the
+        oldest and newest sample in the window. Aggregates of an empty window are NaN.
+
+        :return: window aggregates
+        :rtype: Dict[str, Any]
+        """
+        with self._lock:
+            self._expire(time.monotonic())
+            count = self._tail - self._head
+            if not count:
+                nan = math.nan
+                return {'count': 0, 'sum': 0.0, 'mean': nan, 'min': nan, 'max': nan, 'rate': nan, 'last': nan}
+            first, last = self._head % self.capacity, (self._tail - 1) % self.capacity
+            elapsed = self._stamps[last] - self._stamps[first]
+            return {
+                'count': count,
+                'sum': self._sum,
+                'mean': self._sum / count,
+                'min': self._min[0][1],
+                'max': self._max[0][1],
+                'rate': (self._values[last] - self._values[first]) / elapsed if elapsed > 0 else 0.0,
+                'last': self._values[last]
+            }
+
+    def values(self) -> Any:
+        """
+        Copy the samples in the window in commit order
+
+        :return: window samples as a NumPy array if NumPy is installed otherwise an ``array.array``
+        :rtype: Any
+        """
+        with self._lock:
+            self._expire(time.monotonic())
+            samples = array('d', (self._values[i % self.capacity] for i in range(self._head, self._tail)))
+        numpy = import_numpy()
+        return numpy.frombuffer(samples, dtype=numpy.float64) if numpy is not None else samples
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Payload Codecs
+==============
+
+Encoders of serialized model payloads used by :func:`myosin.models.state.StateModel.encode`. The
+encoded forms of a committed model are memoized per commit so every consumer shares a single
+encoding. Register additional encoders with :func:`register`:
+
+.. code-block:: python
+
+    from myosin.utils import codecs
+
+    codecs.register("cbor", cbor2.dumps)
+
+Copyright © 2022 Christian Sargusingh. All rights reserved.
+"""
+
+import json
+from importlib.util import find_spec
+from typing import Any, Callable, Dict
+
+from myosin.utils.funcs import pformat
+
+#: serialized payload as returned by :func:`myosin.models.state.StateModel.serialize`
+DICT = "dict"
+#: compact json document as utf-8 bytes
+JSON = "json"
+#: indented json string for logging
+PRETTY = "pretty"
+#: pickled payload
+PICKLE = "pickle"
+#: msgpack payload, available if ``msgpack`` is installed
+MSGPACK = "msgpack"
+
+
+# pickle and msgpack are imported on first use to keep the import time of the engine low
+def _pickle(payload: Dict[str, Any]) -> bytes:
+    import pickle
+    return pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _msgpack(payload: Dict[str, Any]) -> bytes:  # pragma: no cover
+    import msgpack
+    return msgpack.packb(payload)
+
+
+#: payload encoders keyed by codec name
+CODECS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    DICT: lambda payload: payload,
+    JSON: lambda payload: json.dumps(payload, separators=(",", ":")).encode("utf-8"),
+    PRETTY: pformat,
+    PICKLE: _pickle,
+}
+if find_spec("msgpack") is not None:  # pragma: no cover
+    CODECS[MSGPACK] = _msgpack
+
+
+def register(codec: str, encoder: Callable[[Dict[str, Any]], Any]) -> None:
+    """
+    Register a payload encoder
+
+    :param codec: codec name
+    :type codec: str
+    :param encoder: encoder of serialized model payloads
+    :type encoder: Callable[[Dict[str, Any]], Any]
+    """
+    CODECS[codec] = encoder
+
+
+def encode(payload: Dict[str, Any], codec: str) -> Any:
+    """
+    Encode a serialized model payload
+
+    :param payload: serialized model payload
+    :type payload: Dict[str, Any]
+    :param codec: codec name
+    :type codec: str
+    :raises KeyError: if the codec is not registered
+    :return: encoded payload
+    :rtype: Any
+    """
+    try:
+        encoder = CODECS[codec]
+    except KeyError as exc:
+        raise KeyError(f"Codec {codec} is not registered. Available codecs: {list(CODECS)}") from exc
+    return encoder(payload)
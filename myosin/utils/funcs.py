@@ -1,6 +1,8 @@
 
 import json
-from typing import Any
+from types import ModuleType
+from functools import lru_cache
+from typing import Any, Optional
 
 
 def pformat(payload: Any) -> str:
@@ -13,3 +15,18 @@ def pformat(payload: Any) -> str:
     :rtype: str
     """
     return "\n" + json.dumps(payload, indent=2)
+
+
+@lru_cache(maxsize=None)
+def import_numpy() -> Optional[ModuleType]:
+    """
+    Import NumPy on first use so importing the engine does not pay for it
+
+    :return: NumPy module or None if NumPy is not installed
+    :rtype: Optional[ModuleType]
+    """
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover
+        return None
+    return numpy
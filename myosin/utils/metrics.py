@@ -1,38 +1,465 @@
-from prometheus_client import Summary, Gauge, Info, Counter
+# -*- coding: utf-8 -*-
+"""
+Metrics
+=======
+
+Pluggable metrics backend. Instrumented code records metrics by name through the global
+:data:`metrics` dispatcher which forwards to the active :class:`Sink`. The sink is resolved lazily
+on first use from the ``MYOSIN_METRICS`` environment variable (``prometheus``, ``memory`` or
+``none``) so importing myosin does not import ``prometheus_client`` until a metric is recorded.
+
+.. code-block:: python
+
+    from myosin.utils.metrics import metrics, MemorySink
+
+    sink = MemorySink()
+    metrics.use(sink)
+
+Copyright © 2022 Christian Sargusingh. All rights reserved.
+"""
+
+import os
+import math
+import time
+import logging
+import contextlib
+from threading import Lock
+from abc import ABC, abstractmethod
+from typing import Any, ContextManager, Dict, List, Optional, Tuple
+
+from myosin.__version__ import __version__
+
+METRICS_ENV_VAR = "MYOSIN_METRICS"
+
+#: histogram bucket upper bounds in seconds for latency metrics
+LATENCY_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+#: metric specifications keyed by metric name: (type, exported name, documentation, label names)
+METRICS: Dict[str, Tuple[str, str, str, Tuple[str, ...]]] = {
+    'active_contexts': (
+        'gauge', "myosin_active_contexts", "Number of active threads inside state context manager.", ()
+    ),
+    'cache_latency': (
+        'summary', "myosin_cache_latency", "Model caching write latency.", ("model",)
+    ),
+    'checkout_latency': (
+        'summary', "myosin_checkout_latency", "Model checkout latency.", ("model",)
+    ),
+    'commit_latency': (
+        'summary', "myosin_commit_latency", "Model commit latency.", ("model",)
+    ),
+    'exc_count': (
+        'counter', "myosin_cb_exc_count", "Subscription callback exception counter.", ("model",)
+    ),
+    'lock_wait': (
+        'histogram', "myosin_lock_wait_seconds", "Time spent waiting to acquire a model lock.", ("model",)
+    ),
+    'lock_hold': (
+        'histogram', "myosin_lock_hold_seconds", "Time a model lock is held.", ("model",)
+    ),
+    'lock_contention': (
+        'counter', "myosin_lock_contention", "Model lock acquisitions which had to wait for another holder.",
+        ("model",)
+    ),
+    'lock_watchdog': (
+        'counter', "myosin_lock_watchdog", "Model locks held past the watchdog threshold.", ("model",)
+    ),
+    'cb_latency': (
+        'histogram', "myosin_cb_latency_seconds", "Subscription callback execution time.", ("model", "subscriber")
+    ),
+    'cb_lag': (
+        'histogram', "myosin_cb_lag_seconds", "Time from commit to the start of subscription callback delivery.",
+        ("model", "subscriber")
+    ),
+    'cb_timeout': (
+        'counter', "myosin_cb_timeout", "Subscription callback deliveries which exceeded their timeout.",
+        ("model", "subscriber")
+    ),
+    'cb_suspended': (
+        'counter', "myosin_cb_suspended", "Subscribers suspended after repeated delivery failures.",
+        ("model", "subscriber")
+    ),
+    'stream_dropped': (
+        'counter', "myosin_stream_dropped", "Snapshots dropped from full stream buffers.", ("model",)
+    ),
+    'model_bytes': (
+        'gauge', "myosin_model_bytes", "Estimated size of the committed model in bytes, sampled on commit.", ("model",)
+    ),
+    'pending_deliveries': (
+        'gauge', "myosin_pending_deliveries", "Commits queued for subscriber delivery or buffered by streams.",
+        ("model",)
+    ),
+    'tier_hit': (
+        'counter', "myosin_tier_hit", "Accesses to resident models while a registry memory budget is set.", ("model",)
+    ),
+    'tier_miss': (
+        'counter', "myosin_tier_miss", "Accesses to evicted models which were reloaded from the cache.", ("model",)
+    ),
+    'tier_eviction': (
+        'counter', "myosin_tier_eviction", "Models evicted to the cache to meet the registry memory budget.",
+        ("model",)
+    ),
+    'resident_bytes': (
+        'gauge', "myosin_resident_bytes", "Estimated size of the resident models in bytes.", ()
+    ),
+    'resident_models': (
+        'gauge', "myosin_resident_models", "Number of resident models.", ()
+    ),
+    'ingest_drop': (
+        'counter', "myosin_ingest_drop", "Ingested field updates overwritten before the applier committed them.",
+        ("model",)
+    ),
+    'ingest_lag': (
+        'histogram', "myosin_ingest_lag_seconds", "Time from pushing the oldest update of a batch to its commit.",
+        ("model",)
+    ),
+    'loader_latency': (
+        'histogram', "myosin_loader_latency_seconds", "Time spent in the loader function of read-through models.",
+        ("model",)
+    ),
+    'loader_error': (
+        'counter', "myosin_loader_error", "Exceptions raised by the loader function of read-through models.",
+        ("model",)
+    ),
+    'meta': (
+        'info', "myosin_meta", "Install metadata.", ()
+    ),
+}
+
+
+class Sink(ABC):
+    """
+    Metrics backend interface. Metrics are addressed by their key in :data:`METRICS` followed by
+    their label values in declaration order.
+    """
+
+    @abstractmethod
+    def inc(self, metric: str, *labels: str, amount: float = 1.0) -> None:
+        """
+        Increment a counter or gauge
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def dec(self, metric: str, *labels: str, amount: float = 1.0) -> None:
+        """
+        Decrement a gauge
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, metric: str, value: float, *labels: str) -> None:
+        """
+        Set a gauge
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def observe(self, metric: str, value: float, *labels: str) -> None:
+        """
+        Record an observation in a summary or histogram
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def info(self, metric: str, payload: Dict[str, str]) -> None:
+        """
+        Set key-value metadata
+        """
+        raise NotImplementedError
+
+    def time(self, metric: str, *labels: str) -> ContextManager:
+        """
+        Observe the wall time spent inside the returned context manager in seconds
+        """
+        return _Timer(self, metric, labels)
+
+
+class _Timer:
+
+    __slots__ = ('_sink', '_metric', '_labels', '_start')
+
+    def __init__(self, sink: Sink, metric: str, labels: Tuple[str, ...]) -> None:
+        self._sink = sink
+        self._metric = metric
+        self._labels = labels
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._sink.observe(self._metric, time.perf_counter() - self._start, *self._labels)
+
+
+class NullSink(Sink):
+    """
+    Discards all metrics. Timers share a single reusable null context.
+    """
+
+    _NULL_CONTEXT = contextlib.nullcontext()
+
+    def inc(self, metric: str, *labels: str, amount: float = 1.0) -> None: ...
+
+    def dec(self, metric: str, *labels: str, amount: float = 1.0) -> None: ...
+
+    def set(self, metric: str, value: float, *labels: str) -> None: ...
+
+    def observe(self, metric: str, value: float, *labels: str) -> None: ...
+
+    def info(self, metric: str, payload: Dict[str, str]) -> None: ...
+
+    def time(self, metric: str, *labels: str) -> ContextManager:
+        return self._NULL_CONTEXT
+
+
+class Histogram:
+    """
+    Fixed bucket histogram with logarithmic bucket boundaries. Quantiles are interpolated from the
+    bucket counts and bounded by the observed extremes.
+    """
+
+    #: bucket upper bounds from 1us to ~100s
+    BOUNDS: Tuple[float, ...] = tuple(10 ** (e / 4) for e in range(-24, 9))
+
+    __slots__ = ('count', 'sum', 'min', 'max', 'buckets')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.buckets = [0] * (len(self.BOUNDS) + 1)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        # log4 index into the bucket boundaries
+        idx = 0 if value <= 0 else max(0, min(len(self.BOUNDS), math.ceil(4 * math.log10(value)) + 24))
+        self.buckets[idx] += 1
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Approximate the q-th quantile
+
+        :param q: quantile in the range [0, 1]
+        :type q: float
+        :return: approximate quantile value, 0.0 if nothing has been observed
+        :rtype: float
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for idx, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                upper = self.BOUNDS[idx] if idx < len(self.BOUNDS) else self.max
+                return max(self.min, min(self.max, upper))
+        return self.max
+
+    def serialize(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.mean,
+            'min': self.min if self.count else 0.0,
+            'max': self.max if self.count else 0.0,
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99)
+        }
+
+
+class MemorySink(Sink):
+    """
+    Low overhead in-process sink. Counters and gauges are stored as floats and observations are
+    aggregated into :class:`Histogram` buckets. Read the current values with :func:`snapshot`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.values: Dict[Tuple[str, Tuple[str, ...]], float] = {}
+        self.histograms: Dict[Tuple[str, Tuple[str, ...]], Histogram] = {}
+        self.infos: Dict[str, Dict[str, str]] = {}
+
+    def inc(self, metric: str, *labels: str, amount: float = 1.0) -> None:
+        key = (metric, labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def dec(self, metric: str, *labels: str, amount: float = 1.0) -> None:
+        self.inc(metric, *labels, amount=-amount)
+
+    def set(self, metric: str, value: float, *labels: str) -> None:
+        with self._lock:
+            self.values[(metric, labels)] = value
+
+    def observe(self, metric: str, value: float, *labels: str) -> None:
+        key = (metric, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def info(self, metric: str, payload: Dict[str, str]) -> None:
+        with self._lock:
+            self.infos[metric] = dict(payload)
+
+    def value(self, metric: str, *labels: str) -> float:
+        """
+        Get the current counter or gauge value, 0.0 if unset
+        """
+        return self.values.get((metric, labels), 0.0)
+
+    def histogram(self, metric: str, *labels: str) -> Optional[Histogram]:
+        """
+        Get the histogram of observations, None if nothing has been observed
+        """
+        return self.histograms.get((metric, labels))
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Copy all recorded metrics into a serializable structure keyed by metric name
+        """
+        out: Dict[str, List[Dict[str, Any]]] = {}
+        with self._lock:
+            for (metric, labels), value in self.values.items():
+                out.setdefault(metric, []).append({'labels': labels, 'value': value})
+            for (metric, labels), histogram in self.histograms.items():
+                out.setdefault(metric, []).append({'labels': labels, **histogram.serialize()})
+            for metric, payload in self.infos.items():
+                out[metric] = [{'labels': (), 'value': payload}]
+        return out
+
+
+class PrometheusSink(Sink):
+    """
+    Export metrics with ``prometheus_client``. Collectors are created on first use and shared by
+    every sink using the same collector registry.
+
+    :param registry: prometheus collector registry, defaults to the global registry
+    :type registry: Optional[CollectorRegistry]
+    :raises ImportError: if ``prometheus_client`` is not installed
+    """
+
+    _collectors: Dict[Tuple[int, str], Any] = {}
+    _collector_lock = Lock()
+
+    def __init__(self, registry: Optional[Any] = None) -> None:
+        import prometheus_client
+        self._client = prometheus_client
+        self._registry = registry if registry is not None else prometheus_client.REGISTRY
+        self._types = {
+            'gauge': prometheus_client.Gauge,
+            'counter': prometheus_client.Counter,
+            'summary': prometheus_client.Summary,
+            'histogram': prometheus_client.Histogram,
+            'info': prometheus_client.Info,
+        }
+        self.info('meta', {'version': __version__})
+
+    def _collector(self, metric: str, labels: Tuple[str, ...]) -> Any:
+        key = (id(self._registry), metric)
+        collector = self._collectors.get(key)
+        if collector is None:
+            with self._collector_lock:
+                collector = self._collectors.get(key)
+                if collector is None:
+                    kind, name, documentation, labelnames = METRICS[metric]
+                    kwargs = {'buckets': LATENCY_BUCKETS} if kind == 'histogram' else {}
+                    collector = self._collectors[key] = self._types[kind](
+                        name=name, documentation=documentation, labelnames=labelnames, registry=self._registry,
+                        **kwargs)
+        return collector.labels(*labels) if labels else collector
+
+    def inc(self, metric: str, *labels: str, amount: float = 1.0) -> None:
+        self._collector(metric, labels).inc(amount)
+
+    def dec(self, metric: str, *labels: str, amount: float = 1.0) -> None:
+        self._collector(metric, labels).dec(amount)
+
+    def set(self, metric: str, value: float, *labels: str) -> None:
+        self._collector(metric, labels).set(value)
+
+    def observe(self, metric: str, value: float, *labels: str) -> None:
+        self._collector(metric, labels).observe(value)
+
+    def info(self, metric: str, payload: Dict[str, str]) -> None:
+        self._collector(metric, ()).info(payload)
 
 
 class Metrics:
+    """
+    Metrics dispatcher. The recording methods are rebound directly to the active sink so the hot
+    path pays for a single call into the sink.
+    """
+
+    def __init__(self) -> None:
+        self._logger = logging.getLogger(__name__)
+        self._sink: Optional[Sink] = None
+
+    @property
+    def sink(self) -> Sink:
+        """
+        Get the active sink, resolving the default sink on first access
+        """
+        if self._sink is None:
+            self.use(self._default())
+        return self._sink  # type: ignore
+
+    def use(self, sink: Sink) -> None:
+        """
+        Route all subsequent metrics to a new sink
+
+        :param sink: metrics sink
+        :type sink: Sink
+        """
+        self._sink = sink
+        self.inc = sink.inc  # type: ignore
+        self.dec = sink.dec  # type: ignore
+        self.set = sink.set  # type: ignore
+        self.observe = sink.observe  # type: ignore
+        self.info = sink.info  # type: ignore
+        self.time = sink.time  # type: ignore
+
+    def inc(self, metric: str, *labels: str, amount: float = 1.0) -> None:
+        self.sink.inc(metric, *labels, amount=amount)
+
+    def dec(self, metric: str, *labels: str, amount: float = 1.0) -> None:
+        self.sink.dec(metric, *labels, amount=amount)
+
+    def set(self, metric: str, value: float, *labels: str) -> None:
+        self.sink.set(metric, value, *labels)
+
+    def observe(self, metric: str, value: float, *labels: str) -> None:
+        self.sink.observe(metric, value, *labels)
+
+    def info(self, metric: str, payload: Dict[str, str]) -> None:
+        self.sink.info(metric, payload)
+
+    def time(self, metric: str, *labels: str) -> ContextManager:
+        return self.sink.time(metric, *labels)
+
+    def _default(self) -> Sink:
+        backend = os.environ.get(METRICS_ENV_VAR, "prometheus").lower()
+        if backend == "none":
+            return NullSink()
+        if backend == "memory":
+            return MemorySink()
+        try:
+            return PrometheusSink()
+        except ImportError:
+            self._logger.warning("prometheus_client is not installed, metrics are disabled")
+            return NullSink()
+
 
-    active_contexts = Gauge(
-        name="myosin_active_contexts",
-        documentation="Number of active threads inside state context manager."
-    )
-
-    cache_latency = Summary(
-        name="myosin_cache_latency",
-        documentation="Model caching write latency.",
-        labelnames=["model"]
-    )
-
-    checkout_latency = Summary(
-        name="myosin_checkout_latency",
-        documentation="Model checkout latency.",
-        labelnames=["model"]
-    )
-
-    commit_latency = Summary(
-        name="myosin_commit_latency",
-        documentation="Model commit latency.",
-        labelnames=["model"]
-    )
-
-    exc_count = Counter(
-        name="myosin_cb_exc_count",
-        documentation="Subscription callback exception counter.",
-        labelnames=["model"]
-    )
-
-    meta = Info(
-        name="myosin_meta",
-        documentation="Install metadata."
-    )
+#: global metrics dispatcher
+metrics = Metrics()
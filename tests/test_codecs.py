@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Payload Codec Unittests
+=======================
+Modified: 2026-10
+"""
+
+import json
+import pickle
+import unittest
+import logging
+from unittest.mock import patch
+
+from myosin import State
+from myosin.utils import codecs
+from tests.resources.models import DemoState
+
+
+class TestCodecs(unittest.TestCase):
+
+    def setUp(self) -> None:
+        logging.disable()
+        self.test_state = DemoState(1)
+        self.test_state.name = "test"
+        self.state = State()
+        self.state.load(self.test_state)
+
+    def tearDown(self) -> None:
+        self.state._ssm.clear()
+        logging.disable(logging.NOTSET)
+
+    def commit(self, name: str) -> DemoState:
+        with State(DemoState) as state:
+            model = state.checkout(DemoState)
+            model.name = name
+            state.commit(model)
+        return self.state._ssm[hash(DemoState)].ref
+
+    def test_encode(self):
+        """
+        Test codec outputs
+        """
+        payload = {'id': 1, 'name': "test"}
+        self.assertIs(codecs.encode(payload, codecs.DICT), payload)
+        self.assertEqual(codecs.encode(payload, codecs.JSON), b'{"id":1,"name":"test"}')
+        self.assertEqual(json.loads(codecs.encode(payload, codecs.PRETTY)), payload)
+        self.assertEqual(pickle.loads(codecs.encode(payload, codecs.PICKLE)), payload)
+        with self.assertRaises(KeyError):
+            codecs.encode(payload, "unknown")
+
+    def test_register(self):
+        """
+        Test registered codecs are available to models
+        """
+        with patch.dict(codecs.CODECS):
+            codecs.register("names", lambda payload: payload['name'])
+            self.assertEqual(self.commit("a").encode("names"), "a")
+
+    def test_memoized(self):
+        """
+        Test committed models are serialized once per commit and encodings are shared
+        """
+        ref = self.commit("a")
+        with patch.object(DemoState, "serialize", autospec=True, side_effect=DemoState.serialize) as serialize:
+            encoded = ref.encode()
+            self.assertIs(ref.encode(codecs.JSON), encoded)
+            ref.encode(codecs.PICKLE)
+            repr(ref)
+            self.assertEqual(serialize.call_count, 1)
+            self.assertEqual(json.loads(encoded), {'id': 1, 'name': "a"})
+            # encodings are dropped on the next commit
+            self.assertEqual(json.loads(self.commit("b").encode()), {'id': 1, 'name': "b"})
+            self.assertEqual(serialize.call_count, 2)
+
+    def test_unmemoized(self):
+        """
+        Test uncommitted copies are encoded from their current contents
+        """
+        self.commit("a").encode()
+        model = self.state.checkout(DemoState)
+        model.name = "b"
+        self.assertEqual(json.loads(model.encode()), {'id': 1, 'name': "b"})
+        model.name = "c"
+        self.assertEqual(json.loads(model.encode()), {'id': 1, 'name': "c"})
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Columnar View Unittests
+=======================
+Modified: 2026-10
+"""
+
+import math
+import unittest
+import logging
+
+from myosin import State
+from myosin.utils.funcs import import_numpy
+from myosin.exceptions.state import ModelNotFound
+from tests.resources.models import DemoState
+
+
+class Sensor(DemoState):
+
+    def __init__(self, _id, tp: float, online: bool) -> None:
+        super().__init__(_id)
+        self.name = "sensor"
+        self.tp = tp
+        self.online = online
+
+
+class Indoor(Sensor):
+    pass
+
+
+class Outdoor(Sensor):
+    pass
+
+
+class Basement(Sensor):
+    pass
+
+
+class TestColumns(unittest.TestCase):
+
+    def setUp(self) -> None:
+        logging.disable()
+        self.state = State()
+        self.state.load(Indoor(1, 20.0, True))
+        self.state.load(Outdoor(2, 10.0, False))
+        demo = DemoState(3)
+        demo.name = "demo"
+        self.state.load(demo)
+
+    def tearDown(self) -> None:
+        self.state._ssm.clear()
+        self.state._views.clear()
+        logging.disable(logging.NOTSET)
+
+    def test_columns(self):
+        """
+        Test columns mirror the fields of every model of a type and follow commits
+        """
+        fleet = self.state.columns(Sensor, ["tp", "online"])
+        self.assertEqual(len(fleet), 2)
+        self.assertEqual(fleet.models, ["Indoor", "Outdoor"])
+        self.assertEqual(list(fleet["tp"]), [20.0, 10.0])
+        self.assertEqual(list(fleet["online"]), [True, False])
+        self.state.update(Outdoor, tp=30.0, online=True)
+        self.assertEqual(fleet["tp"][fleet.row(Outdoor)], 30.0)
+        self.assertEqual(sum(fleet["online"]), 2)
+        snapshot = fleet.snapshot()
+        fleet.close()
+        self.state.update(Indoor, tp=0.0)
+        self.assertEqual(list(snapshot["tp"]), [20.0, 30.0])
+        self.assertEqual(fleet["tp"][0], 20.0)
+
+    def test_registration(self):
+        """
+        Test models registered after the view are added and registering a model again rebinds its row
+        """
+        fleet = self.state.columns(Sensor, ["tp", "online"])
+        view = fleet["tp"]
+        self.assertEqual(fleet.generation, 0)
+        self.state.load(Basement(4, 5.0, True))
+        self.assertEqual(fleet.generation, 1)
+        self.assertEqual(fleet.models, ["Indoor", "Outdoor", "Basement"])
+        self.assertEqual(list(fleet["tp"]), [20.0, 10.0, 5.0])
+        # detached views keep their values
+        self.state.update(Outdoor, tp=11.0)
+        self.assertEqual(list(view), [20.0, 10.0])
+        self.state.load(Indoor(1, 21.0, True))
+        self.assertEqual(len(fleet), 3)
+        self.assertEqual(fleet.generation, 1)
+        self.assertEqual(fleet["tp"][fleet.row(Indoor)], 21.0)
+        self.state.update(Indoor, tp=3.0)
+        self.assertEqual(fleet["tp"][fleet.row(Indoor)], 3.0)
+        fleet.close()
+        self.state.load(Indoor(1, 22.0, True))
+        self.assertEqual(fleet["tp"][fleet.row(Indoor)], 3.0)
+        # closed views are dropped once another view is created
+        self.state.columns(Sensor, ["tp"])
+        self.assertEqual(len(self.state._views), 1)
+
+    def test_read_only(self):
+        """
+        Test column views cannot be written
+        """
+        fleet = self.state.columns(Sensor, ["tp"])
+        with self.assertRaises((TypeError, ValueError)):
+            fleet["tp"][0] = 1.0
+
+    def test_non_numeric(self):
+        """
+        Test non-numeric values are mirrored as NaN
+        """
+        fleet = self.state.columns(DemoState, ["name"])
+        self.assertEqual(len(fleet), 3)
+        self.assertTrue(all(math.isnan(value) for value in fleet["name"]))
+
+    @unittest.skipIf(import_numpy() is None, "NumPy is not installed")
+    def test_numpy(self):  # pragma: no cover
+        """
+        Test columns are NumPy arrays
+        """
+        fleet = self.state.columns(Sensor, ["tp", "online"])
+        self.assertEqual(fleet["tp"].mean(), 15.0)
+        self.assertEqual((~fleet["online"]).sum(), 1)
+
+    def test_invalid(self):
+        """
+        Test views of unregistered types and missing rows
+        """
+        with self.assertRaises(ModelNotFound):
+            self.state.columns(State, ["tp"])  # type: ignore
+        with self.assertRaises(ModelNotFound):
+            self.state.columns(Sensor, ["tp"]).row(DemoState)
+        with self.assertRaises(ValueError):
+            self.state.columns(Sensor, [])
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Commit Completion Unittests
+===========================
+Modified: 2026-10
+"""
+
+import asyncio
+import unittest
+import logging
+from threading import Event
+from concurrent.futures import Future
+from unittest.mock import AsyncMock
+
+from myosin import State
+from myosin.state.subscriber import Completion
+from tests.resources.models import DemoState
+
+
+class TestCompletion(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        logging.disable()
+        self.state = State()
+        self.test_state = DemoState(1)
+        self.test_state.name = 0
+        self.state.load(self.test_state)
+
+    def tearDown(self) -> None:
+        self.state._ssm.clear()
+        logging.disable(logging.NOTSET)
+
+    def commit(self, name: int, **kwargs):
+        with State(DemoState) as state:
+            model = state.checkout(DemoState)
+            model.name = name
+            return state.commit(model, **kwargs)
+
+    async def test_running_loop(self):
+        """
+        Test futures resolve with the result of every subscriber once delivered
+        """
+        alpha = self.state.subscribe(DemoState, AsyncMock(side_effect=lambda model: model.name))
+        beta = self.state.subscribe(DemoState, AsyncMock(side_effect=RuntimeError("beta")))
+        self.assertIsNone(self.commit(1))
+        deliveries = [self.commit(name, future=True) for name in range(2, 5)]
+        self.assertTrue(all(isinstance(delivery, asyncio.Future) for delivery in deliveries))
+        results = await asyncio.gather(*deliveries)
+        self.assertEqual([result[alpha] for result in results], [2, 3, 4])
+        self.assertIsInstance(results[0][beta], RuntimeError)
+
+    async def test_suspended(self):
+        """
+        Test suspended subscribers are left out of the results
+        """
+        subscriber = self.state.subscribe(DemoState, AsyncMock())
+        subscriber.suspended = True
+        self.assertEqual(await self.commit(1, future=True), {})
+
+    async def test_no_subscribers(self):
+        """
+        Test commits without subscribers resolve immediately
+        """
+        delivery = self.commit(1, future=True)
+        self.assertTrue(delivery.done())
+        self.assertEqual(delivery.result(), {})
+
+    def test_countdown(self):
+        """
+        Test completions resolve after the last delivery
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            completion = Completion(loop.create_future(), 2)
+            completion.done("alpha", 1)
+            self.assertFalse(completion.future.done())
+            completion.done("beta", None, delivered=False)
+            self.assertEqual(completion.future.result(), {"alpha": 1})
+        finally:
+            loop.close()
+
+
+class TestSyncCompletion(unittest.TestCase):
+
+    def setUp(self) -> None:
+        logging.disable()
+        self.state = State()
+        self.test_state = DemoState(1)
+        self.test_state.name = 0
+        self.state.load(self.test_state)
+
+    def tearDown(self) -> None:
+        self.state._ssm.clear()
+        logging.disable(logging.NOTSET)
+
+    def commit(self, name: int, **kwargs):
+        with State(DemoState) as state:
+            model = state.checkout(DemoState)
+            model.name = name
+            return state.commit(model, **kwargs)
+
+    def test_pipeline(self):
+        """
+        Test commits outside of an event loop return without waiting for delivery
+        """
+        release = Event()
+        received = []
+
+        async def slow(model: DemoState) -> int:
+            await asyncio.get_running_loop().run_in_executor(None, release.wait)
+            received.append(model.name)
+            return model.name
+
+        subscriber = self.state.subscribe(DemoState, slow)
+        deliveries = [self.commit(name, future=True) for name in range(1, 4)]
+        self.assertTrue(all(isinstance(delivery, Future) for delivery in deliveries))
+        self.assertFalse(deliveries[0].done())
+        release.set()
+        self.assertEqual([delivery.result(timeout=5)[subscriber] for delivery in deliveries], [1, 2, 3])
+        # blocking commits are ordered behind pending deliveries
+        self.assertIsNone(self.commit(4))
+        self.assertEqual(received, [1, 2, 3, 4])
+
+    def test_reentrant_subscriber(self):
+        """
+        Test blocking commits deliver in the committing thread after a non-blocking commit
+        """
+        received = []
+
+        async def rename(model: DemoState) -> None:
+            received.append(model.name)
+            if model.name == 2:
+                # the committing thread holds the model lock
+                State().update(DemoState, name=3)
+
+        self.state.subscribe(DemoState, rename)
+        self.commit(1, future=True).result(timeout=5)
+        self.assertIsNone(self.commit(2))
+        self.assertEqual(received, [1, 2, 3])
+        self.assertEqual(self.state.checkout(DemoState).name, 3)
+
+    def test_reset(self):
+        """
+        Test resetting the registry stops delivery threads
+        """
+        self.state.subscribe(DemoState, AsyncMock())
+        self.commit(1, future=True).result(timeout=5)
+        thread = self.state._ssm[hash(DemoState)]._delivery_thread
+        self.state.reset()
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
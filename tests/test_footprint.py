@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Memory Footprint Unittests
+==========================
+Modified: 2026-10
+"""
+
+import sys
+import asyncio
+import logging
+import unittest
+
+from myosin import State
+from myosin.state import footprint
+from myosin.state.footprint import Allocations, sizeof
+from myosin.utils.metrics import MemorySink, NullSink, metrics
+from tests.resources.models import DemoState
+
+
+class TestFootprint(unittest.TestCase):
+
+    def setUp(self) -> None:
+        logging.disable()
+        self.sink = MemorySink()
+        metrics.use(self.sink)
+        self.test_state = DemoState(1)
+        self.test_state.name = "test"
+        self.state = State()
+        self.state.load(self.test_state)
+
+    def tearDown(self) -> None:
+        self.state._ssm.clear()
+        metrics.use(NullSink())
+        logging.disable(logging.NOTSET)
+
+    def commit(self, *names) -> None:
+        with State(DemoState) as state:
+            for name in names:
+                model = state.checkout(DemoState)
+                model.name = name
+                state.commit(model)
+
+    def test_sizeof(self):
+        """
+        Test deep size estimates count each reachable object once and skip shared objects
+        """
+        shared = "x" * 1000
+        self.assertEqual(sizeof([shared, shared]), sys.getsizeof([shared, shared]) + sys.getsizeof(shared))
+        self.assertGreater(sizeof({'a': [1, 2]}), sizeof({'a': []}))
+        self.assertLess(sizeof(self.test_state), 4096)
+
+    def test_sampled(self):
+        """
+        Test model size gauges are refreshed every sample interval
+        """
+        ssm = self.state._ssm[hash(DemoState)]
+        initial = self.sink.value("model_bytes", "DemoState")
+        self.assertEqual(initial, ssm.footprint)
+        ssm.footprint_interval = 2
+        self.commit("x" * 10000)
+        self.assertEqual(self.sink.value("model_bytes", "DemoState"), initial)
+        self.commit("y" * 10000)
+        self.assertEqual(self.sink.value("model_bytes", "DemoState"), sizeof(ssm.ref))
+        self.assertGreater(self.sink.value("model_bytes", "DemoState"), initial + 9000)
+
+    def test_report(self):
+        """
+        Test the footprint report counts pending deliveries
+        """
+        async def pending():
+            self.state.subscribe(DemoState, _noop)
+            self.commit("a", "b")
+            return self.state.footprint()
+
+        report = asyncio.run(pending())
+        self.assertEqual(report[0]['model'], "DemoState")
+        self.assertEqual(report[0]['pending'], 2)
+        self.assertEqual(report[0]['subscribers'], 1)
+        self.assertEqual(self.sink.value("pending_deliveries", "DemoState"), 2)
+
+    def test_allocations(self):
+        """
+        Test allocations retained by checkouts are attributed to the state module
+        """
+        with Allocations() as allocations:
+            retained = [self.state.checkout(DemoState) for _ in range(100)]
+        report = allocations.report(limit=3)
+        self.assertTrue(retained)
+        self.assertTrue(report)
+        self.assertTrue(report[0]['location'].startswith(footprint._STATE_FILE))
+        self.assertGreater(report[0]['size'], 0)
+
+
+async def _noop(model) -> None:
+    pass
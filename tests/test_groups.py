@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Subscriber Group Unittests
+==========================
+Modified: 2026-10
+"""
+
+import unittest
+import logging
+from unittest.mock import AsyncMock, MagicMock
+
+from myosin import State
+from myosin.models.state import StateModel
+from myosin.state.subscriber import Subscriber, SubscriberGroup
+from myosin.exceptions.state import ModelNotFound
+from tests.resources.models import DemoState
+
+
+class Sensor(DemoState):
+
+    def __init__(self, _id) -> None:
+        super().__init__(_id)
+        self.name = "sensor"
+
+
+class Indoor(Sensor):
+    pass
+
+
+class Outdoor(Sensor):
+    pass
+
+
+class TestSubscriberGroup(unittest.TestCase):
+
+    def setUp(self) -> None:
+        logging.disable()
+        self.state = State()
+        demo = DemoState(1)
+        demo.name = "demo"
+        self.state.load(demo)
+        self.state.load(Indoor(2))
+
+    def tearDown(self) -> None:
+        self.state._ssm.clear()
+        self.state._groups.clear()
+        logging.disable(logging.NOTSET)
+
+    def test_base_class(self):
+        """
+        Test subscribing to an unregistered base class subscribes to every registered subclass
+        """
+        callback = AsyncMock()
+        group = self.state.subscribe(Sensor, callback)
+        self.assertIsInstance(group, SubscriberGroup)
+        self.assertEqual(len(group.subscribers), 1)
+        self.assertEqual(len(self.state._ssm[hash(Indoor)].queue), 1)
+        self.assertFalse(self.state._ssm[hash(DemoState)].queue)
+        with State(Indoor) as state:
+            state.commit(state.checkout(Indoor))
+        callback.assert_awaited_once()
+        self.assertIsInstance(callback.await_args.args[0], Indoor)
+
+    def test_late_registration(self):
+        """
+        Test models registered after the subscription join the group
+        """
+        callback = AsyncMock()
+        group = self.state.subscribe(Sensor, callback)
+        self.state.load(Outdoor(3))
+        self.state.load_all([Sensor(4)])
+        self.assertEqual(len(group.subscribers), 3)
+        with State(Outdoor) as state:
+            state.commit(state.checkout(Outdoor))
+        callback.assert_awaited_once()
+
+    def test_wildcard(self):
+        """
+        Test subscribing to the model base class subscribes to all models
+        """
+        group = self.state.subscribe(StateModel, AsyncMock())
+        self.assertEqual(len(group.subscribers), 2)
+
+    def test_subclasses(self):
+        """
+        Test a registered type only includes its subclasses on request
+        """
+        callback = AsyncMock()
+        self.assertIsInstance(self.state.subscribe(DemoState, callback), Subscriber)
+        group = self.state.subscribe(DemoState, callback, subclasses=True)
+        self.assertIsInstance(group, SubscriberGroup)
+        self.assertEqual(len(group.subscribers), 2)
+
+    def test_not_model(self):
+        """
+        Test subscribing to a type which is not a model raises
+        """
+        with self.assertRaises(ModelNotFound):
+            self.state.subscribe(MagicMock, AsyncMock())
+        self.assertFalse(self.state._groups)
+
+    def test_policy(self):
+        """
+        Test unknown timeout policies are rejected before subscribing
+        """
+        with self.assertRaises(ValueError):
+            self.state.subscribe(Sensor, AsyncMock(), policy="retry")
+        self.assertFalse(self.state._groups)
+
+    def test_resume(self):
+        """
+        Test resuming a group resumes its suspended subscribers
+        """
+        group = self.state.subscribe(StateModel, AsyncMock(side_effect=RuntimeError), max_failures=1)
+        with State(DemoState) as state:
+            state.commit(state.checkout(DemoState))
+        self.assertTrue(group.suspended)
+        group.resume()
+        self.assertFalse(group.suspended)
+
+    def test_reset(self):
+        """
+        Test resetting the registry drops group subscriptions
+        """
+        self.state.subscribe(StateModel, AsyncMock())
+        self.state.reset()
+        self.assertFalse(self.state._groups)
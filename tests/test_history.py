@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+History Store Unittests
+=======================
+Modified: 2026-10
+"""
+
+import os
+import unittest
+import logging
+import tempfile
+from unittest.mock import patch
+
+from myosin import State
+from myosin.state import history
+from myosin.exceptions.cache import NullCachePathError
+from myosin.exceptions.state import ModelNotFound
+from tests.resources.models import DemoState
+
+
+class TestHistory(unittest.TestCase):
+
+    def setUp(self) -> None:
+        logging.disable()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "DemoState")
+        self.test_state = DemoState(1)
+        self.test_state.name = 0
+        self.state = State()
+        self.state.load(self.test_state)
+
+    def tearDown(self) -> None:
+        self.state._ssm.clear()
+        self.tmp.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def commit(self, *values) -> None:
+        with State(DemoState) as state:
+            for value in values:
+                model = state.checkout(DemoState)
+                model.name = value
+                state.commit(model)
+
+    @patch.object(history.time, "time")
+    def test_range(self, mock_time):
+        """
+        Test rows are appended on commit and selected by time range
+        """
+        store = self.state.history(DemoState, ["name"], path=self.path)
+        for now, value in ((10, 1), (20, 2), (30, 3), (40, 4)):
+            mock_time.return_value = now
+            self.commit(value)
+        self.assertEqual(len(store), 4)
+        rows = store.range(start=20, end=40)
+        self.assertEqual(list(rows["name"]), [2, 3])
+        self.assertEqual(list(rows["timestamp"]), [20, 30])
+        self.assertEqual(list(store.range(start=35)["name"]), [4])
+        self.assertEqual(list(store.range(fields=[])), ["timestamp"])
+        store.close()
+
+    def test_grow_and_reopen(self):
+        """
+        Test full columns are grown and recorded rows persist across instances
+        """
+        store = self.state.history(DemoState, ["name"], path=self.path, capacity=2)
+        self.commit(1, 2, 3, 4, 5)
+        self.assertEqual(list(store.range()["name"]), [1, 2, 3, 4, 5])
+        store.close()
+        self.commit(6)
+        store = self.state.history(DemoState, ["name"], path=self.path, capacity=2)
+        self.assertEqual(len(store), 5)
+        self.commit(7)
+        rows = store.range()
+        self.assertEqual(list(rows["name"]), [1, 2, 3, 4, 5, 7])
+        self.assertEqual(list(rows["timestamp"]), sorted(rows["timestamp"]))
+        store.close()
+
+    def test_closed(self):
+        """
+        Test closed history stops recording and rejects range queries
+        """
+        store = self.state.history(DemoState, ["name"], path=self.path)
+        self.commit(1)
+        store.close()
+        self.commit(2)
+        with self.assertRaisesRegex(ValueError, "history closed"):
+            store.range()
+
+    def test_default_path(self):
+        """
+        Test the history directory defaults to the caching base path
+        """
+        with patch.dict(os.environ, {"MYOSIN_CACHE_BASE_PATH": self.tmp.name}):
+            store = self.state.history(DemoState, ["name"])
+        self.assertEqual(store.path, os.path.join(self.tmp.name, "history", "DemoState"))
+        store.close()
+        with patch.dict(os.environ, {"MYOSIN_CACHE_BASE_PATH": ""}):
+            with self.assertRaises(NullCachePathError):
+                self.state.history(DemoState, ["name"])
+
+    def test_invalid(self):
+        """
+        Test reserved field names and unregistered models
+        """
+        with self.assertRaises(ValueError):
+            self.state.history(DemoState, ["timestamp"], path=self.path)
+        with self.assertRaises(ModelNotFound):
+            self.state.history(State, ["name"], path=self.path)  # type: ignore
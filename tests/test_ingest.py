@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Ingestion Ring Unittests
+========================
+Modified: 2026-10
+"""
+
+import unittest
+import logging
+from threading import Thread
+
+from myosin import State
+from myosin.state.ingest import Ingest
+from myosin.utils.metrics import MemorySink, NullSink, metrics
+from myosin.exceptions.state import ModelNotFound
+from tests.resources.models import DemoState
+
+
+class TestIngest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        logging.disable()
+        self.sink = MemorySink()
+        metrics.use(self.sink)
+        self.state = State()
+        self.test_state = DemoState(1)
+        self.test_state.name = 0
+        self.state.load(self.test_state)
+
+    def tearDown(self) -> None:
+        self.state._ssm.clear()
+        metrics.use(NullSink())
+        logging.disable(logging.NOTSET)
+
+    def test_batch(self):
+        """
+        Test pending updates are conflated into a single commit
+        """
+        ingest = Ingest(DemoState)
+        for i in range(1, 11):
+            ingest.push(name=i)
+        version = self.state.version(DemoState)
+        self.assertEqual(ingest.apply(), 10)
+        self.assertEqual(self.state.version(DemoState), version + 1)
+        self.assertEqual(self.state.checkout(DemoState).name, 10)
+        self.assertEqual(ingest.apply(), 0)
+        self.assertEqual(self.sink.histogram("ingest_lag", "DemoState").count, 1)  # type: ignore
+
+    def test_batch_size(self):
+        """
+        Test batches are bounded and flushing applies every update
+        """
+        ingest = Ingest(DemoState, batch=4)
+        for i in range(10):
+            ingest.push(name=i)
+        self.assertEqual(ingest.apply(), 4)
+        self.assertEqual(self.state.checkout(DemoState).name, 3)
+        self.assertEqual(ingest.flush(), 6)
+        self.assertEqual(ingest.applied, 10)
+
+    def test_capacity(self):
+        """
+        Test the capacity is rounded up to a power of two
+        """
+        self.assertEqual(Ingest(DemoState, capacity=100).capacity, 128)
+        with self.assertRaises(ValueError):
+            Ingest(DemoState, capacity=0)
+
+    def test_drop(self):
+        """
+        Test updates overwritten by lapping producers are counted as drops
+        """
+        ingest = Ingest(DemoState, capacity=8)
+        for i in range(20):
+            ingest.push(name=i)
+        self.assertEqual(ingest.flush(), 8)
+        self.assertEqual(ingest.dropped, 12)
+        self.assertEqual(self.sink.value("ingest_drop", "DemoState"), 12)
+        self.assertEqual(self.state.checkout(DemoState).name, 19)
+
+    def test_producers(self):
+        """
+        Test concurrent producers with a running applier
+        """
+        with self.state.ingest(DemoState, capacity=1 << 16) as ingest:
+            def produce():
+                for i in range(1000):
+                    ingest.push(name=i)
+            producers = [Thread(target=produce) for _ in range(4)]
+            for producer in producers:
+                producer.start()
+            for producer in producers:
+                producer.join()
+        self.assertEqual(ingest.applied + ingest.dropped, 4000)
+        self.assertEqual(ingest.dropped, 0)
+        self.assertEqual(self.state.checkout(DemoState).name, 999)
+
+    def test_not_found(self):
+        """
+        Test ingestion of unregistered models raises
+        """
+        with self.assertRaises(ModelNotFound):
+            self.state.ingest(MagicModel)
+
+
+class MagicModel(DemoState):
+    pass
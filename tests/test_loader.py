@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Read-Through Model Unittests
+============================
+Modified: 2026-10
+"""
+
+import time
+import unittest
+import logging
+from threading import Event, Thread
+from unittest.mock import MagicMock
+
+from myosin import State
+from myosin.utils.metrics import MemorySink, NullSink, metrics
+from tests.resources.models import DemoState
+
+
+class TestLoader(unittest.TestCase):
+
+    def setUp(self) -> None:
+        logging.disable()
+        self.sink = MemorySink()
+        metrics.use(self.sink)
+        self.state = State()
+        self.test_state = DemoState(1)
+        self.test_state.name = "default"
+        self.source = MagicMock(return_value={'name': "loaded"})
+
+    def tearDown(self) -> None:
+        self.state._ssm.clear()
+        metrics.use(NullSink())
+        logging.disable(logging.NOTSET)
+
+    def test_lazy(self):
+        """
+        Test the loader runs on first checkout and is cached while fresh
+        """
+        self.state.load(self.test_state, loader=self.source, ttl=60)
+        self.source.assert_not_called()
+        self.assertEqual(self.state.checkout(DemoState).name, "loaded")
+        self.assertEqual(self.state.read(DemoState, ["name"]).name, "loaded")
+        self.source.assert_called_once()
+        self.assertEqual(self.sink.histogram("loader_latency", "DemoState").count, 1)  # type: ignore
+
+    def test_model(self):
+        """
+        Test loaders may return a model of the registered type
+        """
+        loaded = DemoState(1)
+        loaded.name = "model"
+        self.state.load(self.test_state, loader=lambda: loaded)
+        self.assertEqual(self.state.checkout(DemoState).name, "model")
+
+    def test_expiry(self):
+        """
+        Test expired models are reloaded
+        """
+        self.state.load(self.test_state, loader=self.source, ttl=0.01)
+        self.state.checkout(DemoState)
+        time.sleep(0.02)
+        self.source.return_value = {'name': "reloaded"}
+        self.assertEqual(self.state.checkout(DemoState).name, "reloaded")
+        self.assertEqual(self.source.call_count, 2)
+
+    def test_coalesce(self):
+        """
+        Test concurrent checkouts of an expired model run the loader once
+        """
+        release = Event()
+
+        def slow():
+            release.wait()
+            return {'name': "loaded"}
+
+        source = MagicMock(side_effect=slow)
+        self.state.load(self.test_state, loader=source, ttl=60)
+        names = []
+        readers = [Thread(target=lambda: names.append(State().checkout(DemoState).name)) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        time.sleep(0.05)
+        release.set()
+        for reader in readers:
+            reader.join()
+        source.assert_called_once()
+        self.assertEqual(names, ["loaded"] * 4)
+
+    def test_stale(self):
+        """
+        Test expired models are served while they are revalidated in the background
+        """
+        self.state.load(self.test_state, loader=self.source, ttl=0.01, stale=True)
+        self.assertEqual(self.state.checkout(DemoState).name, "loaded")
+        time.sleep(0.02)
+        release = Event()
+
+        def slow():
+            release.wait()
+            return {'name': "reloaded"}
+
+        self.source.side_effect = slow
+        self.assertEqual(self.state.checkout(DemoState).name, "loaded")
+        loader = self.state._ssm[hash(DemoState)].loader
+        self.assertTrue(loader.refreshing)  # type: ignore
+        release.set()
+        while loader.refreshing:  # type: ignore
+            time.sleep(0.001)
+        self.assertEqual(self.state.checkout(DemoState).name, "reloaded")
+
+    def test_error(self):
+        """
+        Test loader exceptions are raised by blocking checkouts and counted
+        """
+        self.source.side_effect = OSError("source unavailable")
+        self.state.load(self.test_state, loader=self.source, ttl=60)
+        with self.assertRaises(OSError):
+            self.state.checkout(DemoState)
+        self.assertEqual(self.sink.value("loader_error", "DemoState"), 1)
+
+    def test_locked(self):
+        """
+        Test checkouts inside a model context reload the model
+        """
+        self.state.load(self.test_state, loader=self.source, ttl=60)
+        with State(DemoState) as state:
+            self.assertEqual(state.checkout(DemoState).name, "loaded")
+
+    def test_ttl(self):
+        """
+        Test negative time to live is rejected
+        """
+        with self.assertRaises(ValueError):
+            self.state.load(self.test_state, loader=self.source, ttl=-1)
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Metrics Unittests
+=================
+Modified: 2026-10
+"""
+
+import os
+import sys
+import unittest
+import subprocess
+import logging
+import importlib.util
+from unittest.mock import patch
+
+from myosin.utils.metrics import (METRICS_ENV_VAR, Histogram, MemorySink, Metrics, NullSink,
+                                  PrometheusSink)
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self) -> None:
+        logging.disable()
+        self.metrics = Metrics()
+
+    def tearDown(self) -> None:
+        del self.metrics
+        logging.disable(logging.NOTSET)
+
+    def test_default_sink(self):
+        """
+        Test default sink resolution from the environment
+        """
+        with patch.dict(os.environ, {METRICS_ENV_VAR: "none"}):
+            self.assertIsInstance(self.metrics.sink, NullSink)
+        with patch.dict(os.environ, {METRICS_ENV_VAR: "memory"}):
+            self.assertIsInstance(Metrics().sink, MemorySink)
+
+    def test_use(self):
+        """
+        Test recording methods are rebound to the active sink
+        """
+        sink = MemorySink()
+        self.metrics.use(sink)
+        self.metrics.inc("exc_count", "Model")
+        self.metrics.inc("exc_count", "Model", amount=2)
+        self.metrics.inc("active_contexts")
+        self.metrics.dec("active_contexts")
+        self.metrics.set("active_contexts", 5)
+        with self.metrics.time("commit_latency", "Model"):
+            pass
+        self.assertEqual(sink.value("exc_count", "Model"), 3)
+        self.assertEqual(sink.value("active_contexts"), 5)
+        self.assertEqual(sink.histogram("commit_latency", "Model").count, 1)  # type: ignore
+        self.assertIn("commit_latency", sink.snapshot())
+
+    def test_null_sink(self):
+        """
+        Test the null sink reuses a single timing context
+        """
+        sink = NullSink()
+        self.assertIs(sink.time("commit_latency", "a"), sink.time("checkout_latency", "b"))
+
+    def test_deferred_imports(self):
+        """
+        Test importing the engine does not import optional dependencies and feature modules
+        """
+        deferred = ("prometheus_client", "numpy", "msgpack", "pickle", "mmap", "tracemalloc",
+                    "myosin.state.window", "myosin.state.history", "myosin.state.columns", "myosin.state.replay")
+        probe = f"import sys, myosin; print([name for name in {deferred!r} if name in sys.modules])"
+        env = dict(os.environ, **{METRICS_ENV_VAR: "none"})
+        output = subprocess.run([sys.executable, "-c", probe], env=env, check=True, capture_output=True, text=True)
+        self.assertEqual(output.stdout.strip(), "[]")
+
+    @unittest.skipUnless(importlib.util.find_spec("prometheus_client"), "prometheus_client is not installed")
+    def test_prometheus_sink(self):
+        """
+        Test prometheus collectors are created on first use
+        """
+        from prometheus_client import CollectorRegistry
+        registry = CollectorRegistry()
+        sink = PrometheusSink(registry)
+        sink.inc("exc_count", "Model")
+        sink.observe("commit_latency", 0.5, "Model")
+        self.assertEqual(registry.get_sample_value("myosin_cb_exc_count_total", {'model': "Model"}), 1)
+        self.assertEqual(registry.get_sample_value("myosin_commit_latency_sum", {'model': "Model"}), 0.5)
+        # collectors are shared between sinks on the same registry
+        PrometheusSink(registry).inc("exc_count", "Model")
+        self.assertEqual(registry.get_sample_value("myosin_cb_exc_count_total", {'model': "Model"}), 2)
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_quantile(self):
+        """
+        Test quantiles are bounded by observed extremes
+        """
+        histogram = Histogram()
+        self.assertEqual(histogram.quantile(0.5), 0.0)
+        for value in (0.001, 0.002, 0.003, 1.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.mean, 1.006 / 4)
+        self.assertLessEqual(histogram.quantile(0.5), 0.0032)
+        self.assertEqual(histogram.quantile(1.0), 1.0)
+        self.assertEqual(histogram.quantile(0.0), 0.001)
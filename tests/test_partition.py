@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Partitioned Registry Unittests
+==============================
+Modified: 2026-10
+"""
+
+import time
+import unittest
+import logging
+from typing import List
+
+from myosin.state.partition import Partitions, partition
+from myosin.exceptions.state import ModelNotFound
+from tests.resources.models import DemoState
+
+
+class Sensor(DemoState):
+
+    def __init__(self, _id) -> None:
+        super().__init__(_id)
+        self.name = f"sensor_{_id}"
+
+
+class Indoor(Sensor):
+    pass
+
+
+class Outdoor(Sensor):
+    pass
+
+
+class Basement(Sensor):
+    pass
+
+
+class TestPartitions(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.partitions = Partitions(workers=2)
+        cls.ids = [0, 4, 5]
+        cls.indices = [cls.partitions.load(model(i)) for i, model in zip(cls.ids, (Indoor, Outdoor, Basement))]
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.partitions.close()
+
+    def setUp(self) -> None:
+        logging.disable()
+
+    def tearDown(self) -> None:
+        logging.disable(logging.NOTSET)
+
+    def test_partition(self):
+        """
+        Test models are sharded by a stable hash of their id
+        """
+        self.assertEqual(self.indices, [partition(Indoor(i), 2) for i in self.ids])
+        self.assertEqual(len(set(self.indices)), 2)
+
+    def test_duplicate(self):
+        """
+        Test a second model of a registered type is rejected instead of rerouting the type
+        """
+        index = self.partitions._route(Indoor)
+        with self.assertRaises(ValueError):
+            self.partitions.load(Indoor(5))
+        self.assertEqual(self.partitions._route(Indoor), index)
+        self.assertEqual(self.partitions.checkout(Indoor).name, "sensor_0")
+
+    def test_checkout_commit(self):
+        """
+        Test checkouts and commits are routed to the owning partition
+        """
+        model = self.partitions.checkout(Outdoor)
+        self.assertEqual(model.name, "sensor_4")
+        model.name = "committed"
+        self.partitions.commit(model)
+        self.assertEqual(self.partitions.checkout(Outdoor).name, "committed")
+        self.partitions.update(Outdoor, name="sensor_4")
+        self.assertEqual(self.partitions.checkout(Outdoor).name, "sensor_4")
+
+    def test_query(self):
+        """
+        Test batched commits and reads across partitions
+        """
+        models = [self.partitions.checkout(state_type) for state_type in (Indoor, Basement)]
+        for model in models:
+            model.name = f"batch_{model.id}"
+        self.partitions.commit_all(models)
+        result = self.partitions.query([Indoor, Basement], ["name"])
+        self.assertEqual(result[Indoor].name, "batch_0")
+        self.assertEqual(result[Basement].name, "batch_5")
+        self.partitions.commit_all([Indoor(0), Basement(5)])
+        self.partitions.update_all({Indoor: {'name': "updated"}, Outdoor: {'name': "updated"}})
+        result = self.partitions.query([Indoor, Outdoor], ["name"])
+        self.assertEqual({projection.name for projection in result.values()}, {"updated"})
+        self.partitions.commit_all([Indoor(0), Outdoor(4)])
+
+    def test_subscribe(self):
+        """
+        Test subscribers in the router receive commits of partitioned models
+        """
+        received: List[str] = []
+
+        async def callback(model: Basement) -> None:
+            received.append(model.name)
+
+        subscriber = self.partitions.subscribe(Basement, callback)
+        self.partitions.update(Basement, name="subscribed")
+        deadline = time.monotonic() + 5
+        while not received and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(received, ["subscribed"])
+        self.assertEqual(subscriber.latency.count, 1)
+        self.partitions.update(Basement, name="sensor_5")
+
+    def test_not_found(self):
+        """
+        Test unregistered models and worker errors are raised in the router
+        """
+        with self.assertRaises(ModelNotFound):
+            self.partitions.checkout(Sensor)
+        with self.assertRaises(AttributeError):
+            self.partitions.query([Indoor], ["missing"])
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Model Projection Unittests
+==========================
+Modified: 2026-10
+"""
+
+import unittest
+import logging
+
+from myosin import State
+from myosin.state.projection import Projection
+from myosin.exceptions.state import ModelNotFound
+from tests.resources.models import DemoState
+
+
+class TestProjection(unittest.TestCase):
+
+    def setUp(self) -> None:
+        logging.disable()
+        self.test_state = DemoState(1)
+        self.test_state.name = ["a", "b"]
+        self.state = State()
+        self.state.load(self.test_state)
+
+    def tearDown(self) -> None:
+        self.state._ssm.clear()
+        logging.disable(logging.NOTSET)
+
+    def test_checkout(self):
+        """
+        Test projected checkouts copy only the requested fields
+        """
+        with State(DemoState) as state:
+            projection = state.checkout(DemoState, fields=["name"])
+        self.assertIsInstance(projection, Projection)
+        self.assertEqual(projection.name, ["a", "b"])
+        self.assertIsNot(projection.name, self.test_state.name)
+        self.assertEqual(list(projection.fields), ["name"])
+        self.assertEqual(projection.serialize(), {'name': ["a", "b"]})
+        with self.assertRaises(AttributeError):
+            projection.id
+
+    def test_read(self):
+        """
+        Test reads share the committed field values
+        """
+        projection = self.state.read(DemoState, ["id", "name"])
+        self.assertEqual(projection.id, 1)
+        self.assertIs(projection.name, self.test_state.name)
+        self.assertEqual(projection, Projection.of(self.test_state, ["id", "name"]))
+        self.assertNotEqual(projection, self.test_state)
+
+    def test_read_only(self):
+        """
+        Test projection fields cannot be reassigned
+        """
+        projection = self.state.read(DemoState, ["name"])
+        with self.assertRaises(AttributeError):
+            projection.name = "c"
+
+    def test_invalid(self):
+        """
+        Test projecting unknown fields and unregistered models
+        """
+        with self.assertRaises(AttributeError):
+            self.state.read(DemoState, ["unknown"])
+        with self.assertRaises(AttributeError):
+            self.state.checkout(DemoState, fields=["unknown"])
+        with self.assertRaises(ModelNotFound):
+            self.state.read(State, ["name"])  # type: ignore
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Commit Record and Replay Unittests
+==================================
+Modified: 2026-10
+"""
+
+import os
+import json
+import unittest
+import logging
+import tempfile
+
+from myosin import State
+from myosin.state.replay import Replayer
+from myosin.exceptions.state import ModelNotFound
+from tests.resources.models import DemoState
+
+
+class TestReplay(unittest.TestCase):
+
+    def setUp(self) -> None:
+        logging.disable()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "commits.jsonl")
+        self.test_state = DemoState(1)
+        self.test_state.name = "test"
+        self.state = State()
+        self.state.load(self.test_state)
+
+    def tearDown(self) -> None:
+        self.state._ssm.clear()
+        self.tmp.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def commit(self, *names) -> None:
+        with State(DemoState) as state:
+            for name in names:
+                model = state.checkout(DemoState)
+                model.name = name
+                state.commit(model)
+
+    def test_record(self):
+        """
+        Test commits are recorded with their offset, model type and payload
+        """
+        with self.state.record(self.path, DemoState) as recorder:
+            self.commit("a", "b")
+        self.commit("c")
+        self.assertEqual(recorder.count, 2)
+        with open(self.path, encoding='utf-8') as recording:
+            entries = [json.loads(line) for line in recording]
+        self.assertEqual([e['payload'] for e in entries], [{'id': 1, 'name': "a"}, {'id': 1, 'name': "b"}])
+        self.assertEqual({e['model'] for e in entries}, {"DemoState"})
+        self.assertLessEqual(entries[0]['t'], entries[1]['t'])
+        self.assertEqual(self.state._ssm[hash(DemoState)].observers, [])
+
+    def test_replay(self):
+        """
+        Test replaying a recording commits the recorded payloads and reports latency
+        """
+        with self.state.record(self.path):
+            self.commit("a", "b", "c")
+        with open(self.path, 'a', encoding='utf-8') as recording:
+            recording.write(json.dumps({'t': 0, 'model': "Unknown", 'payload': {}}) + "\n")
+        report = Replayer(self.path, speed=None).run()
+        self.assertEqual(report['commits'], 3)
+        self.assertEqual(report['skipped'], 1)
+        self.assertLessEqual(report['p50'], report['p99'])
+        self.assertLessEqual(report['p99'], report['max'])
+        self.assertEqual(self.state.version(DemoState), 6)
+        self.assertEqual(self.state.checkout(DemoState).name, "c")
+
+    def test_paced_replay(self):
+        """
+        Test paced replays keep the recorded commit offsets
+        """
+        with open(self.path, 'w', encoding='utf-8') as recording:
+            for offset, name in ((0, "a"), (0.05, "b")):
+                recording.write(json.dumps({'t': offset, 'model': "DemoState",
+                                            'payload': {'name': name}}) + "\n")
+        self.assertGreaterEqual(Replayer(self.path).run()['elapsed'], 0.05)
+        self.assertLess(Replayer(self.path, speed=10).run()['elapsed'], 0.05)
+
+    def test_invalid(self):
+        """
+        Test recording unregistered models and negative replay speeds
+        """
+        with self.assertRaises(ModelNotFound):
+            self.state.record(self.path, State)  # type: ignore
+        with self.assertRaises(ValueError):
+            Replayer(self.path, speed=-1)
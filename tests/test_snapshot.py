@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Multi-Version Snapshot Unittests
+================================
+Modified: 2026-10
+"""
+
+import gc
+import weakref
+import unittest
+import logging
+from threading import Event, Thread
+
+from myosin import State
+from myosin.state.snapshot import clock
+from myosin.exceptions.state import ModelNotFound
+from tests.resources.models import DemoState
+
+
+class OtherState(DemoState):
+    pass
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self) -> None:
+        logging.disable()
+        self.state = State()
+        for model_type in (DemoState, OtherState):
+            model = model_type(1)
+            model.name = 0
+            self.state.load(model)
+
+    def tearDown(self) -> None:
+        self.state._ssm.clear()
+        logging.disable(logging.NOTSET)
+
+    def test_snapshot(self):
+        """
+        Test snapshots are not affected by later commits
+        """
+        snapshot = self.state.snapshot(DemoState, OtherState)
+        self.state.update(DemoState, name=1)
+        self.assertEqual(snapshot[DemoState].name, 0)
+        self.assertEqual(snapshot.version(DemoState), 0)
+        self.assertEqual(self.state.snapshot()[DemoState].name, 1)
+        self.assertIn(OtherState, snapshot)
+        copied = snapshot.checkout(DemoState)
+        copied.name = 2
+        self.assertEqual(snapshot[DemoState].name, 0)
+
+    def test_consistent(self):
+        """
+        Test snapshots observe a consistent cut of commits to several models
+        """
+        done = Event()
+
+        def write() -> None:
+            for i in range(1, 2000):
+                self.state.update(DemoState, name=i)
+                self.state.update(OtherState, name=i)
+            done.set()
+        writer = Thread(target=write)
+        writer.start()
+        while not done.is_set():
+            snapshot = self.state.snapshot(OtherState, DemoState)
+            self.assertIn(snapshot[DemoState].name - snapshot[OtherState].name, (0, 1))
+        writer.join()
+
+    def test_reclaim(self):
+        """
+        Test old versions are reclaimed once no snapshot refers to them
+        """
+        ssm = self.state._ssm[hash(DemoState)]
+        snapshot = self.state.snapshot(DemoState)
+        old = weakref.ref(snapshot[DemoState])
+        self.state.update(DemoState, name=1)
+        self.state.update(DemoState, name=2)
+        self.assertEqual(len(ssm.versions), 1)
+        self.assertEqual(clock.readers, [])
+        self.assertIsNotNone(old())
+        del snapshot
+        gc.collect()
+        self.assertIsNone(old())
+
+    def test_invalid(self):
+        """
+        Test snapshots of unregistered models and models outside the snapshot
+        """
+        with self.assertRaises(ModelNotFound):
+            self.state.snapshot(State)  # type: ignore
+        with self.assertRaises(ModelNotFound):
+            self.state.snapshot(DemoState)[OtherState]
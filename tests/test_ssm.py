@@ -5,6 +5,7 @@ SSM Unittests
 Modified: 2022-04
 """
 
+import time
 import asyncio
 from asyncio.events import AbstractEventLoop
 import unittest
@@ -12,6 +13,8 @@ import logging
 from unittest.mock import AsyncMock, MagicMock, patch
 from threading import Lock
 from myosin.state.ssm import SSM
+from myosin.state.subscriber import Subscriber
+from myosin.utils.metrics import MemorySink, NullSink, metrics
 from tests.resources.models import DemoState
 
 
@@ -24,6 +27,7 @@ class TestAsync(unittest.IsolatedAsyncioTestCase):
 
     def tearDown(self) -> None:
         del self.ssm
+        metrics.use(NullSink())
         logging.disable(logging.NOTSET)
 
     async def test_cb_runner(self):
@@ -33,11 +37,49 @@ class TestAsync(unittest.IsolatedAsyncioTestCase):
         alpha_cb = AsyncMock()
         alpha_cb.side_effect = BaseException
         beta_cb = AsyncMock()
-        self.ssm.queue = [alpha_cb, beta_cb]
+        self.ssm.queue = [Subscriber(alpha_cb), Subscriber(beta_cb)]
+        sink = MemorySink()
+        metrics.use(sink)
         await self.ssm.cb_runner()
-        alpha_cb.assert_called_once()
-        beta_cb.assert_called_once()
+        alpha_cb.assert_called_once_with(self.test_state)
+        beta_cb.assert_called_once_with(self.test_state)
+        self.assertEqual(sink.value("exc_count", "DemoState"), 1)
+        # delivery statistics are recorded for failed and successful callbacks
+        for subscriber in self.ssm.queue:
+            self.assertEqual(subscriber.latency.count, 1)
+            self.assertEqual(subscriber.lag.count, 1)
+
+    async def test_ordered_delivery(self):
+        """
+        Test commits are delivered in order through a single worker per subscriber
+        """
+        received = []
+
+        async def callback(model: DemoState) -> None:
+            await asyncio.sleep(0)
+            received.append(model.id)
 
+        self.ssm.queue = [Subscriber(callback)]
+        for i in range(2, 12):
+            self.ssm.install(DemoState(i))
+            self.ssm.execute()
+        subscriber = self.ssm.queue[0]
+        _, queue, _ = subscriber._workers[id(asyncio.get_running_loop())]
+        await queue.join()
+        self.assertEqual(received, list(range(2, 12)))
+        self.assertEqual(subscriber.delivered, 10)
+        self.assertEqual(len(asyncio.all_tasks()), 2)
+
+    async def test_cb_runner_suspended(self):
+        """
+        Test suspended subscribers are skipped
+        """
+        alpha_cb = AsyncMock()
+        subscriber = Subscriber(alpha_cb)
+        subscriber.suspended = True
+        self.ssm.queue = [subscriber]
+        await self.ssm.cb_runner()
+        alpha_cb.assert_not_called()
 
 class TestSSM(unittest.TestCase):
 
@@ -84,12 +126,21 @@ class TestSSM(unittest.TestCase):
         self.ssm.ref = new_state
         self.assertEqual(self.ssm.ref, new_state)
 
+    def test_install(self):
+        """
+        Test installing a reference advances the sequence number
+        """
+        new_state = DemoState(2)
+        self.assertEqual(self.ssm.install(new_state), 1)
+        self.assertEqual(self.ssm.ref, new_state)
+        self.assertEqual(self.ssm.version, 1)
+
     def test_queue(self):
         """
         Test async queue callback get/set
         """
         async def async_callback(_: DemoState): ...
-        new_queue = [async_callback]
+        new_queue = [Subscriber(async_callback)]
         self.ssm.queue = new_queue
         self.assertEqual(self.ssm.queue, new_queue)
 
@@ -101,19 +152,37 @@ class TestSSM(unittest.TestCase):
         """
         mock_loop = MagicMock(spec=AbstractEventLoop)
         _get_asyncio_ctx.return_value = mock_loop
+        subscriber = MagicMock(spec=Subscriber)
+        subscriber.suspended = False
+        self.ssm.queue = [subscriber]
         # test running loop ctx
         mock_loop.is_running.return_value = True
         self.ssm.execute()
-        mock_loop.create_task.assert_called_once()
+        subscriber.enqueue.assert_called_once()
+        self.assertEqual(subscriber.enqueue.call_args.args[0], mock_loop)
         mock_loop.run_until_complete.assert_not_called()
         mock_loop.reset_mock()
+        subscriber.reset_mock()
         # test running loop ctx
         mock_loop.is_running.return_value = False
         self.ssm.execute()
-        mock_loop.create_task.assert_not_called()
+        subscriber.enqueue.assert_not_called()
         self.assertEqual(mock_loop.run_until_complete.call_count, 2)
         mock_loop.close.assert_called_once()
 
+    def test_execute_timeout(self):
+        """
+        Test a hung subscriber only blocks a synchronous commit until its timeout
+        """
+        async def hang(_: DemoState) -> None:
+            await asyncio.sleep(10)
+        beta_cb = AsyncMock()
+        self.ssm.queue = [Subscriber(hang, timeout=0.05), Subscriber(beta_cb)]
+        start = time.perf_counter()
+        self.ssm.execute()
+        self.assertLess(time.perf_counter() - start, 1)
+        beta_cb.assert_called_once()
+
     @patch.object(asyncio, "new_event_loop")
     @patch.object(asyncio, "get_running_loop")
     def test_get_asyncio_ctx(self, get_running_loop: MagicMock, new_event_loop: MagicMock) -> None:
@@ -16,6 +16,7 @@ from unittest.mock import MagicMock, patch
 from myosin.models.state import StateModel
 from myosin import State
 from myosin.state.ssm import SSM
+from myosin.state.subscriber import Subscriber
 from myosin.exceptions.state import ModelNotFound, UninitializedStateError
 
 
@@ -28,6 +29,7 @@ class TestState(unittest.TestCase):
         self.test_state.__typehash__.return_value = hash(MagicMock)
         self.test_ssm = MagicMock(spec=SSM)
         self.test_ssm.ref = self.test_state
+        self.test_ssm.loader = None
         self.state = State()
 
     def tearDown(self) -> None:
@@ -81,6 +83,36 @@ class TestState(unittest.TestCase):
         self.assertIsNotNone(ssm)
         self.assertEqual(res_state, self.test_state)
 
+    @patch.object(SSM, "__init__", lambda x, y: None)
+    @patch("myosin.state.state.pformat", lambda x: None)
+    def test_load_all(self):
+        """
+        Test batch registration reads each document through the worker pool
+        """
+        models = [MagicMock(spec=StateModel) for _ in range(3)]
+        for i, model in enumerate(models):
+            model._cpath = f"missing/{i}.json"
+            model.__typehash__ = MagicMock(return_value=i)
+        res = self.state.load_all(models)
+        self.assertEqual(res, models)
+        for i, model in enumerate(models):
+            model.load.assert_called_once()
+            self.assertIn(i, self.state._ssm)
+
+    @patch("myosin.state.state.pformat", lambda x: None)
+    def test_uninitialized_load_all(self):
+        """
+        Test batch registration is all or nothing
+        """
+        models = [MagicMock(spec=StateModel) for _ in range(2)]
+        for i, model in enumerate(models):
+            model._cpath = f"missing/{i}.json"
+            model.__typehash__ = MagicMock(return_value=i)
+        models[1].serialize.side_effect = AttributeError
+        with self.assertRaises(UninitializedStateError):
+            self.state.load_all(models)
+        self.assertEqual(len(self.state._ssm), 0)
+
     def test_null_checkout(self):
         """
         Test null checkout fails with ModelNotFound
@@ -127,6 +159,25 @@ class TestState(unittest.TestCase):
         self.state._ssm[self.test_state.__typehash__()] = self.test_ssm
         self.state.commit(self.test_state)
 
+    @patch.object(copy, "deepcopy")
+    def test_transfer_commit(self, mock_deepcopy: MagicMock):
+        """
+        Test ownership transfer commits freeze and install the model without a copy
+        """
+        self.state._ssm[self.test_state.__typehash__()] = self.test_ssm
+        self.state.commit(self.test_state, transfer=True)
+        mock_deepcopy.assert_not_called()
+        self.test_state.freeze.assert_called_once()
+        self.test_ssm.install.assert_called_once_with(self.test_state)
+
+    def test_unregistered_transfer_commit(self):
+        """
+        Test models are not frozen if the transfer commit fails
+        """
+        with self.assertRaises(ModelNotFound):
+            self.state.commit(self.test_state, transfer=True)
+        self.test_state.freeze.assert_not_called()
+
     @unittest.skip("Refactoring async implementation")
     @patch.object(copy, "deepcopy")
     @patch.object(asyncio, 'run')
@@ -166,7 +217,22 @@ class TestState(unittest.TestCase):
         async def callback(_: MagicMock) -> None: ...
         self.state._ssm[self.test_state.__typehash__()] = self.test_ssm
         self.state.subscribe(MagicMock, callback)
-        self.test_ssm.queue.append.assert_called_once_with(callback)
+        self.test_ssm.add_subscriber.assert_called_once()
+        subscriber = self.test_ssm.add_subscriber.call_args.args[0]
+        self.assertEqual(subscriber.callback, callback)
+
+    def test_slow_subscribers(self):
+        """
+        Test subscriber report is ordered by total callback time
+        """
+        fast, slow = Subscriber(MagicMock()), Subscriber(MagicMock())
+        fast.latency.observe(0.001)
+        slow.latency.observe(0.5)
+        self.test_ssm.queue = [fast, slow]
+        self.state._ssm[self.test_state.__typehash__()] = self.test_ssm
+        report = self.state.slow_subscribers()
+        self.assertEqual([x['subscriber'] for x in report], [slow.name, fast.name])
+        self.assertEqual(len(self.state.slow_subscribers(limit=1)), 1)
 
     @staticmethod
     def mock_ssm(ssm: Dict) -> MagicMock:
@@ -2,19 +2,23 @@
 """
 State Model Unittests
 =====================
-Modified: 2022-09
+Modified: 2026-10
 """
 
 import os
+import copy
 import json
 import builtins
 import unittest
 import logging
+from concurrent.futures import Future
 from unittest.mock import MagicMock, patch, mock_open
 from tests.resources.errors import JSON_DECODE_ERROR
-from tests.resources.models import SERIALIZED_MODEL
+from tests.resources.models import SERIALIZED_MODEL, DemoState
 
+from myosin.utils import codecs
 from myosin.models.state import StateModel
+from myosin.exceptions.state import FrozenModelError
 from myosin.exceptions.cache import CachePathError, NullCachePathError
 
 
@@ -48,15 +52,32 @@ class TestStateModel(unittest.TestCase):
         self.assertEqual(self.state.__typehash__(), self.comparator.__typehash__())
 
     @patch.object(StateModel, "serialize")
-    @patch("myosin.models.state.pformat")
-    def test_repr(self, mock_pformat: MagicMock, mock_serialize: MagicMock):
+    @patch.object(codecs, "encode")
+    def test_repr(self, mock_encode: MagicMock, mock_serialize: MagicMock):
         """
         Test state model repr
         """
         mock_serial = MagicMock()
         mock_serialize.return_value = mock_serial
         self.state.__repr__()
-        mock_pformat.assert_called_once_with(mock_serial)
+        mock_encode.assert_called_once_with(mock_serial, codecs.PRETTY)
+
+    def test_freeze(self):
+        """
+        Test frozen models reject assignment and their copies are writable
+        """
+        model = DemoState(1)
+        model.name = "test"
+        model.freeze()
+        self.assertTrue(model.frozen)
+        with self.assertRaises(FrozenModelError):
+            model.name = "changed"
+        with self.assertRaises(AttributeError):
+            del model.id
+        clone = copy.deepcopy(model)
+        self.assertFalse(clone.frozen)
+        clone.name = "changed"
+        self.assertEqual(model.name, "test")
 
     def test_eq(self):
         """
@@ -93,17 +114,17 @@ class TestStateModel(unittest.TestCase):
         with self.assertRaises(CachePathError):
             self.state.cache()
 
-    @patch.object(json, 'dump')
-    @patch('builtins.open', mock_open())
+    @patch('builtins.open', new_callable=mock_open)
     @patch.object(StateModel, 'serialize')
-    def test_cache(self, dump: MagicMock, serialize: MagicMock):
+    def test_cache(self, serialize: MagicMock, mock_file: MagicMock):
         """
         Test caching mechanism
         """
+        serialize.return_value = SERIALIZED_MODEL
         self.state.cache_base_path = '.'
         self.state.cache()
-        dump.assert_called_once()
         serialize.assert_called_once()
+        mock_file().write.assert_called_once_with(json.dumps(SERIALIZED_MODEL, separators=(",", ":")).encode())
 
     @patch.object(json, 'load')
     @patch('builtins.open', mock_open())
@@ -133,6 +154,20 @@ class TestStateModel(unittest.TestCase):
         load.assert_called_once()
         deserialize.assert_called_once()
 
+    @patch.object(StateModel, 'deserialize')
+    def test_load_document(self, deserialize: MagicMock):
+        """
+        Test loading from a pending document read
+        """
+        document = Future()
+        document.set_result(SERIALIZED_MODEL)
+        self.state.load(document)
+        deserialize.assert_called_once_with(**SERIALIZED_MODEL)
+        # errors raised in the worker are handled like a local read
+        document = Future()
+        document.set_exception(FileNotFoundError())
+        self.state.load(document)
+
     @patch.object(os.path, 'exists')
     @patch.object(os, 'remove')
     def test_clear(self, remove: MagicMock, exists: MagicMock):
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+State Stream Unittests
+======================
+Modified: 2026-10
+"""
+
+import asyncio
+import unittest
+import logging
+from threading import Thread
+
+from myosin import State
+from myosin.exceptions.state import ModelNotFound
+from tests.resources.models import DemoState
+
+
+class TestStream(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        logging.disable()
+        self.test_state = DemoState(1)
+        self.test_state.name = "test"
+        self.state = State()
+        self.state.load(self.test_state)
+
+    def tearDown(self) -> None:
+        self.state._ssm.clear()
+        logging.disable(logging.NOTSET)
+
+    def commit(self, name: str) -> None:
+        with State(DemoState) as state:
+            model = state.checkout(DemoState)
+            model.name = name
+            state.commit(model)
+
+    async def test_stream(self):
+        """
+        Test committed snapshots are yielded in order
+        """
+        async with self.state.stream(DemoState) as stream:
+            for name in ("a", "b", "c"):
+                self.commit(name)
+            names = [(await stream.__anext__()).name for _ in range(3)]
+        self.assertEqual(names, ["a", "b", "c"])
+        self.assertEqual(stream.version, 3)
+        self.assertEqual(len(self.state._ssm[hash(DemoState)].streams), 0)
+
+    async def test_buffer(self):
+        """
+        Test full buffers drop the oldest snapshot and conflation keeps the latest
+        """
+        stream = self.state.stream(DemoState, buffer=2)
+        conflated = self.state.stream(DemoState, conflate=True)
+        for name in ("a", "b", "c"):
+            self.commit(name)
+        stream.close()
+        conflated.close()
+        self.assertEqual([x.name async for x in stream], ["b", "c"])
+        self.assertEqual(stream.dropped, 1)
+        self.assertEqual([x.name async for x in conflated], ["c"])
+        self.assertEqual(conflated.dropped, 0)
+
+    async def test_threaded_commit(self):
+        """
+        Test commits from other threads wake a waiting consumer
+        """
+        async with self.state.stream(DemoState) as stream:
+            producer = Thread(target=self.commit, args=("thread",))
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.01, producer.start)
+            model = await asyncio.wait_for(stream.__anext__(), 1)
+            producer.join()
+        self.assertEqual(model.name, "thread")
+
+    async def test_cancel(self):
+        """
+        Test a cancelled consumer can resume iteration
+        """
+        stream = self.state.stream(DemoState)
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(stream.__anext__(), 0.01)
+        self.commit("after")
+        self.assertEqual((await stream.__anext__()).name, "after")
+        stream.close()
+
+    def test_unregistered(self):
+        """
+        Test streaming an unregistered model
+        """
+        with self.assertRaises(ModelNotFound):
+            self.state.stream(State)  # type: ignore
+        with self.assertRaises(ValueError):
+            self.state.stream(DemoState, buffer=0)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Subscriber Unittests
+====================
+Modified: 2026-10
+"""
+
+import time
+import asyncio
+import unittest
+import logging
+from unittest.mock import AsyncMock
+
+from myosin.state.subscriber import DETACH, Subscriber
+from tests.resources.models import DemoState
+
+
+class TestSubscriber(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        logging.disable()
+        self.test_state = DemoState(1)
+
+    def tearDown(self) -> None:
+        logging.disable(logging.NOTSET)
+
+    async def test_deliver(self):
+        """
+        Test delivery result and timing statistics
+        """
+        callback = AsyncMock(return_value=1)
+        subscriber = Subscriber(callback)
+        self.assertEqual(await subscriber.deliver("DemoState", self.test_state, time.perf_counter()), 1)
+        callback.assert_awaited_once_with(self.test_state)
+        self.assertEqual(subscriber.latency.count, 1)
+        self.assertEqual(subscriber.lag.count, 1)
+        self.assertEqual(subscriber.serialize()['count'], 1)
+
+    async def test_timeout_cancel(self):
+        """
+        Test timed out callbacks are cancelled
+        """
+        cancelled = asyncio.Event()
+
+        async def hang(_: DemoState) -> None:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        subscriber = Subscriber(hang, timeout=0.01)
+        with self.assertRaises(asyncio.TimeoutError):
+            await subscriber.deliver("DemoState", self.test_state, time.perf_counter())
+        self.assertTrue(cancelled.is_set())
+        self.assertEqual(subscriber.timeouts, 1)
+
+    async def test_timeout_detach(self):
+        """
+        Test timed out callbacks continue in the background when detached
+        """
+        done = asyncio.Event()
+
+        async def slow(_: DemoState) -> None:
+            await asyncio.sleep(0.05)
+            done.set()
+
+        subscriber = Subscriber(slow, timeout=0.01, policy=DETACH)
+        with self.assertRaises(asyncio.TimeoutError):
+            await subscriber.deliver("DemoState", self.test_state, time.perf_counter())
+        await asyncio.wait_for(done.wait(), 1)
+
+    async def test_suspend(self):
+        """
+        Test subscribers are suspended after consecutive failures and can be resumed
+        """
+        callback = AsyncMock(side_effect=ValueError)
+        subscriber = Subscriber(callback, max_failures=2)
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                await subscriber.deliver("DemoState", self.test_state, time.perf_counter())
+        self.assertTrue(subscriber.suspended)
+        subscriber.resume()
+        self.assertFalse(subscriber.suspended)
+        self.assertEqual(subscriber.failures, 0)
+
+    def test_policy(self):
+        """
+        Test unknown timeout policies are rejected
+        """
+        with self.assertRaises(ValueError):
+            Subscriber(AsyncMock(), policy="ignore")
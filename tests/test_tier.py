@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Tiered Storage Unittests
+========================
+Modified: 2026-10
+"""
+
+import os
+import unittest
+import logging
+import tempfile
+from threading import Thread
+from unittest.mock import patch
+
+from myosin import State
+from myosin.state.tier import tier
+from myosin.utils.metrics import MemorySink, NullSink, metrics
+from tests.resources.models import DemoState
+
+
+class ColdState(DemoState):
+    pass
+
+
+class WarmState(DemoState):
+    pass
+
+
+class TestTier(unittest.TestCase):
+
+    def setUp(self) -> None:
+        logging.disable()
+        self.sink = MemorySink()
+        metrics.use(self.sink)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.env = patch.dict(os.environ, {"MYOSIN_CACHE_BASE_PATH": self.tmp.name})
+        self.env.start()
+        self.state = State()
+        for model_type in (ColdState, WarmState, DemoState):
+            model = model_type(1)
+            model.name = model_type.__name__ * 100
+            self.state.load(model)
+        self.ssms = {model_type: self.state._ssm[hash(model_type)] for model_type in (ColdState, WarmState, DemoState)}
+        # instance dictionaries of a type may differ in size once it was copied or reloaded
+        self.size = max(ssm.footprint for ssm in self.ssms.values())
+
+    def tearDown(self) -> None:
+        self.state.budget(None)
+        self.state._ssm.clear()
+        self.env.stop()
+        self.tmp.cleanup()
+        metrics.use(NullSink())
+        logging.disable(logging.NOTSET)
+
+    def test_evict_lru(self):
+        """
+        Test the least recently used models are evicted to meet the budget
+        """
+        self.state.read(ColdState, ["name"])
+        self.state.read(WarmState, ["name"])
+        self.state.read(DemoState, ["name"])
+        self.state.budget(2 * self.size + self.size // 2)
+        self.assertTrue(self.ssms[ColdState].evicted)
+        self.assertFalse(self.ssms[WarmState].evicted)
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, "ColdState.json")))
+        self.assertEqual(self.sink.value("tier_eviction", "ColdState"), 1)
+        self.assertEqual(self.sink.value("resident_models"), 2)
+
+    def test_restore(self):
+        """
+        Test evicted models are reloaded transparently on access
+        """
+        self.state.budget(self.size)
+        self.assertEqual(self.sink.value("resident_models"), 1)
+        model = self.state.checkout(ColdState)
+        self.assertEqual(model.name, "ColdState" * 100)
+        self.assertEqual(self.sink.value("tier_miss", "ColdState"), 1)
+        self.assertFalse(self.ssms[ColdState].evicted)
+        self.assertEqual(self.state.read(ColdState, ["name"]).name, "ColdState" * 100)
+        self.assertEqual(self.sink.value("tier_hit", "ColdState"), 1)
+        snapshot = self.state.snapshot(WarmState, DemoState)
+        self.assertEqual(snapshot[WarmState].name, "WarmState" * 100)
+        self.assertEqual(snapshot[DemoState].name, "DemoState" * 100)
+        self.assertEqual(sum(not ssm.evicted for ssm in self.ssms.values()), 1)
+
+    def test_commit_evicted(self):
+        """
+        Test commits to evicted models install the new reference
+        """
+        self.state.budget(self.size)
+        self.assertTrue(self.ssms[WarmState].evicted)
+        self.state.update(WarmState, name="updated")
+        self.assertEqual(self.state.read(WarmState, ["name"]).name, "updated")
+        self.assertEqual(self.state.version(WarmState), 1)
+
+    def test_commit_during_eviction(self):
+        """
+        Test commits wait for an eviction in progress instead of being replaced by the cached model
+        """
+        threads = []
+        blocked = []
+        cache = ColdState.cache
+
+        def commit_while_caching(model: ColdState) -> None:
+            thread = Thread(target=self.state.update, args=(ColdState,), kwargs={'name': "v1"})
+            thread.start()
+            threads.append(thread)
+            # the committer is held back by the model lock
+            thread.join(0.05)
+            blocked.append(thread.is_alive())
+            cache(model)
+
+        with patch.object(ColdState, "cache", autospec=True, side_effect=commit_while_caching):
+            self.state.budget(2 * self.size + self.size // 2)
+        threads[0].join(1)
+        self.assertEqual(blocked, [True])
+        self.assertEqual(self.state.version(ColdState), 1)
+        self.assertEqual(self.state.checkout(ColdState).name, "v1")
+
+    def test_pinned(self):
+        """
+        Test locked models and models with consumers stay resident
+        """
+        async def callback(model: DemoState) -> None: ...
+        self.state.subscribe(ColdState, callback)
+        with State(WarmState):
+            self.state.budget(0)
+            self.assertFalse(self.ssms[ColdState].evicted)
+            self.assertFalse(self.ssms[WarmState].evicted)
+        self.assertTrue(self.ssms[DemoState].evicted)
+
+    def test_disabled(self):
+        """
+        Test nothing is evicted without a budget
+        """
+        self.state.budget(None)
+        self.assertFalse(any(ssm.evicted for ssm in self.ssms.values()))
+        self.assertFalse(tier.enabled)
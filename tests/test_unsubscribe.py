@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Unsubscribe Unittests
+=====================
+Modified: 2026-10
+"""
+
+import gc
+import sys
+import asyncio
+import unittest
+import logging
+import weakref
+from threading import Thread
+from typing import List
+from unittest.mock import AsyncMock
+
+from myosin import State
+from myosin.models.state import StateModel
+from tests.resources.models import DemoState
+
+
+class Handler:
+
+    def __init__(self) -> None:
+        self.received: List[int] = []
+
+    async def report(self, model: DemoState) -> None:
+        self.received.append(model.name)
+
+
+class Sensor(DemoState):
+
+    def __init__(self, _id) -> None:
+        super().__init__(_id)
+        self.name = 0
+
+
+class TestUnsubscribe(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        logging.disable()
+        self.state = State()
+        self.test_state = DemoState(1)
+        self.test_state.name = 0
+        self.state.load(self.test_state)
+        self.ssm = self.state._ssm[hash(DemoState)]
+
+    def tearDown(self) -> None:
+        self.state._ssm.clear()
+        self.state._groups.clear()
+        logging.disable(logging.NOTSET)
+
+    def commit(self, name: int, **kwargs):
+        with State(DemoState) as state:
+            model = state.checkout(DemoState)
+            model.name = name
+            return state.commit(model, **kwargs)
+
+    async def test_unsubscribe(self):
+        """
+        Test unsubscribed subscribers skip queued commits and release their callback
+        """
+        callback = AsyncMock()
+        subscriber = self.state.subscribe(DemoState, callback)
+        self.commit(1)
+        subscriber.unsubscribe()
+        self.assertEqual(self.ssm.queue, [])
+        self.assertIsNone(subscriber.callback)
+        self.commit(2)
+        await asyncio.sleep(0)
+        callback.assert_not_awaited()
+        subscriber.unsubscribe()
+
+    async def test_worker_exit(self):
+        """
+        Test workers are released once they exit
+        """
+        subscriber = self.state.subscribe(DemoState, AsyncMock())
+        self.commit(1)
+        self.assertEqual(len(subscriber._workers), 1)
+        subscriber.unsubscribe()
+        for _ in range(3):
+            await asyncio.sleep(0)
+        self.assertEqual(subscriber._workers, {})
+
+    def test_concurrent(self):
+        """
+        Test concurrent subscriptions and unsubscriptions of a model are not lost
+        """
+        async def callback(model: DemoState) -> None: ...
+        removed = [self.state.subscribe(DemoState, callback) for _ in range(2000)]
+        added = []
+
+        def subscribe() -> None:
+            for _ in range(2000):
+                added.append(self.state.subscribe(DemoState, callback))
+
+        threads = [Thread(target=subscribe), *(Thread(target=subscriber.unsubscribe) for subscriber in removed)]
+        interval = sys.getswitchinterval()
+        # switch threads as often as possible to interleave the queue updates
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        self.assertEqual(self.ssm.queue, added)
+
+    async def test_completion(self):
+        """
+        Test pending delivery futures resolve when their subscriber unsubscribes
+        """
+        subscriber = self.state.subscribe(DemoState, AsyncMock())
+        delivery = self.commit(1, future=True)
+        subscriber.unsubscribe()
+        self.assertEqual(await delivery, {})
+
+    def test_strong(self):
+        """
+        Test subscribers keep their bound method instances alive by default
+        """
+        handler = Handler()
+        reference = weakref.ref(handler)
+        self.state.subscribe(DemoState, handler.report)
+        del handler
+        gc.collect()
+        self.assertIsNotNone(reference())
+        self.assertEqual(len(self.ssm.queue), 1)
+
+    def test_weak(self):
+        """
+        Test weak subscribers are pruned once their instance is collected
+        """
+        handler = Handler()
+        subscriber = self.state.subscribe(DemoState, handler.report, weak=True)
+        self.commit(1)
+        self.assertEqual(handler.received, [1])
+        del handler
+        gc.collect()
+        self.assertTrue(subscriber.closed)
+        self.assertEqual(self.ssm.queue, [])
+        self.commit(2)
+
+    def test_weak_function(self):
+        """
+        Test callbacks other than bound methods are held strongly
+        """
+        received = []
+
+        async def callback(model: DemoState) -> None:
+            received.append(model.name)
+
+        self.state.subscribe(DemoState, callback, weak=True)
+        del callback
+        gc.collect()
+        self.commit(1)
+        self.assertEqual(received, [1])
+
+    def test_group(self):
+        """
+        Test unsubscribed groups leave every model and skip models registered later
+        """
+        group = self.state.subscribe(StateModel, AsyncMock())
+        group.unsubscribe()
+        self.assertEqual(self.ssm.queue, [])
+        self.state.load(Sensor(2))
+        self.assertEqual(self.state._ssm[hash(Sensor)].queue, [])
+        self.state.subscribe(StateModel, AsyncMock())
+        self.assertEqual(len(self.state._groups), 1)
+
+    def test_weak_group(self):
+        """
+        Test weak groups are pruned once their instance is collected
+        """
+        handler = Handler()
+        group = self.state.subscribe(StateModel, handler.report, weak=True)
+        del handler
+        gc.collect()
+        self.assertTrue(group.closed)
+        self.state.load(Sensor(2))
+        self.assertEqual(self.ssm.queue, [])
+        self.assertEqual(self.state._ssm[hash(Sensor)].queue, [])
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Atomic Update Unittests
+=======================
+Modified: 2026-10
+"""
+
+import unittest
+import logging
+from threading import Thread
+
+from myosin import State
+from myosin.exceptions.state import FrozenModelError, ModelNotFound
+from tests.resources.models import DemoState
+
+
+class OtherState(DemoState):
+    pass
+
+
+class TestUpdate(unittest.TestCase):
+
+    def setUp(self) -> None:
+        logging.disable()
+        self.test_state = DemoState(1)
+        self.test_state.name = 0
+        self.state = State()
+        self.state.load(self.test_state)
+
+    def tearDown(self) -> None:
+        self.state._ssm.clear()
+        logging.disable(logging.NOTSET)
+
+    def test_fields(self):
+        """
+        Test the field assignment fast path shares unchanged fields with the previous version
+        """
+        self.test_state.tags = ["a"]
+        model = self.state.update(DemoState, name=5)
+        self.assertEqual(self.state.checkout(DemoState).name, 5)
+        self.assertIs(model.tags, self.test_state.tags)
+        self.assertEqual(self.test_state.name, 0)
+        self.assertEqual(self.state.version(DemoState), 1)
+        with self.assertRaises(FrozenModelError):
+            model.name = 6
+
+    def test_fn(self):
+        """
+        Test update functions returning changed fields, a new model or modifying in place
+        """
+        self.state.update(DemoState, lambda x: {'name': x.name + 1})
+        self.assertEqual(self.state.checkout(DemoState).name, 1)
+
+        def replace(model: DemoState) -> DemoState:
+            new = DemoState(model.id)
+            new.name = model.name + 10
+            return new
+        self.state.update(DemoState, replace)
+        self.assertEqual(self.state.checkout(DemoState).name, 11)
+
+        def increment(model: DemoState) -> None:
+            model.name += 1
+        model = self.state.update(DemoState, increment, name=0)
+        self.assertEqual(model.name, 0)
+        self.assertEqual(self.state.version(DemoState), 3)
+
+    def test_atomic(self):
+        """
+        Test concurrent updates are not lost
+        """
+        def work() -> None:
+            for _ in range(200):
+                self.state.update(DemoState, lambda x: {'name': x.name + 1})
+        threads = [Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.state.checkout(DemoState).name, 800)
+
+    def test_reentrant(self):
+        """
+        Test updates inside a state context of the same model do not deadlock
+        """
+        with State(DemoState) as state:
+            state.update(DemoState, name=1)
+            self.assertEqual(state.checkout(DemoState).name, 1)
+
+    def test_invalid(self):
+        """
+        Test updates of unregistered models and updates returning another model type
+        """
+        with self.assertRaises(ModelNotFound):
+            self.state.update(OtherState, name=1)
+        with self.assertRaises(TypeError):
+            self.state.update(DemoState, lambda x: OtherState(1))
+        self.assertEqual(self.state.version(DemoState), 0)
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Commit Waiter Unittests
+=======================
+Modified: 2026-10
+"""
+
+import asyncio
+import unittest
+import logging
+from threading import Thread, Timer
+
+from myosin import State
+from myosin.state.waiter import Waiter
+from myosin.exceptions.state import ModelNotFound
+from tests.resources.models import DemoState
+
+
+def commit(name: str) -> None:
+    with State(DemoState) as state:
+        model = state.checkout(DemoState)
+        model.name = name
+        state.commit(model)
+
+
+class TestWaiter(unittest.TestCase):
+
+    def setUp(self) -> None:
+        logging.disable()
+        self.test_state = DemoState(1)
+        self.test_state.name = "test"
+        self.state = State()
+        self.state.load(self.test_state)
+
+    def tearDown(self) -> None:
+        self.state._ssm.clear()
+        logging.disable(logging.NOTSET)
+
+    def test_match(self):
+        """
+        Test waiter version and predicate matching
+        """
+        waiter = Waiter(lambda x: x.name == "b", after_version=1)
+        self.assertFalse(waiter.match(1, self.test_state))
+        self.test_state.name = "a"
+        self.assertFalse(waiter.match(2, self.test_state))
+        self.test_state.name = "b"
+        self.assertTrue(waiter.match(3, self.test_state))
+        self.assertEqual(waiter.result, (3, self.test_state))
+        self.assertTrue(waiter.wait(0))
+
+    def test_wait_current(self):
+        """
+        Test the current model is matched without waiting
+        """
+        model = self.state.wait_for(DemoState, lambda x: x.name == "test")
+        self.assertEqual(model.name, "test")  # type: ignore
+        self.assertIsNot(model, self.test_state)
+
+    def test_wait_for(self):
+        """
+        Test waiting threads are woken by a matching commit
+        """
+        Timer(0.01, commit, args=("a",)).start()
+        Timer(0.02, commit, args=("b",)).start()
+        model = self.state.wait_for(DemoState, lambda x: x.name == "b", timeout=1)
+        self.assertEqual(model.name, "b")  # type: ignore
+        self.assertEqual(self.state.version(DemoState), 2)
+        self.assertEqual(self.state._ssm[hash(DemoState)].waiters, [])
+
+    def test_wait_for_version(self):
+        """
+        Test commits landing between consecutive waits are matched by the next wait
+        """
+        Timer(0.01, commit, args=("a",)).start()
+        version, model = self.state.wait_for_version(DemoState, after_version=0, timeout=1)
+        self.assertEqual((version, model.name), (1, "a"))  # type: ignore
+        commit("b")
+        version, model = self.state.wait_for_version(DemoState, after_version=version, timeout=0)
+        self.assertEqual((version, model.name), (2, "b"))  # type: ignore
+
+    def test_commit_race(self):
+        """
+        Test a commit landing while a waiter is registered wakes the waiter
+        """
+        committers = []
+
+        def predicate(model: DemoState) -> bool:
+            if not committers:
+                committer = Thread(target=commit, args=("match",))
+                committers.append(committer)
+                committer.start()
+                committer.join(0.05)
+            return model.name == "match"
+
+        model = self.state.wait_for(DemoState, predicate, timeout=1)
+        committers[0].join(1)
+        self.assertEqual(model.name, "match")  # type: ignore
+        self.assertEqual(self.state.version(DemoState), 1)
+
+    def test_timeout(self):
+        """
+        Test waiting times out and deregisters the waiter
+        """
+        self.assertIsNone(self.state.wait_for(DemoState, after_version=0, timeout=0.01))
+        self.assertEqual(self.state._ssm[hash(DemoState)].waiters, [])
+
+    def test_predicate_error(self):
+        """
+        Test predicate exceptions are raised in the waiting thread
+        """
+        with self.assertRaises(ZeroDivisionError):
+            self.state.wait_for(DemoState, lambda x: 1 / 0)
+
+    def test_unregistered(self):
+        """
+        Test waiting on an unregistered model
+        """
+        with self.assertRaises(ModelNotFound):
+            self.state.wait_for(State)  # type: ignore
+        with self.assertRaises(ModelNotFound):
+            self.state.version(State)  # type: ignore
+
+
+class TestAsyncWaiter(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        logging.disable()
+        self.test_state = DemoState(1)
+        self.test_state.name = "test"
+        self.state = State()
+        self.state.load(self.test_state)
+
+    def tearDown(self) -> None:
+        self.state._ssm.clear()
+        logging.disable(logging.NOTSET)
+
+    async def test_async_wait_for(self):
+        """
+        Test waiting coroutines are woken by commits from other threads
+        """
+        Timer(0.01, commit, args=("thread",)).start()
+        model = await self.state.async_wait_for(DemoState, after_version=0, timeout=1)
+        self.assertEqual(model.name, "thread")  # type: ignore
+
+    async def test_async_wait_for_version(self):
+        """
+        Test waiting coroutines receive the version of the matching commit
+        """
+        Timer(0.01, commit, args=("thread",)).start()
+        version, model = await self.state.async_wait_for_version(DemoState, after_version=0, timeout=1)
+        self.assertEqual(version, 1)
+        self.assertEqual(model.name, "thread")  # type: ignore
+
+    async def test_async_timeout(self):
+        """
+        Test waiting coroutines time out and deregister the waiter
+        """
+        self.assertIsNone(await self.state.async_wait_for(DemoState, after_version=0, timeout=0.01))
+        self.assertEqual(self.state._ssm[hash(DemoState)].waiters, [])
+        # waiting does not block the event loop
+        await asyncio.sleep(0)
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Lock Watchdog Unittests
+=======================
+Modified: 2026-10
+"""
+
+import unittest
+import logging
+from unittest.mock import patch
+
+from myosin import State, metrics
+from myosin.state import Watchdog
+from myosin.utils.metrics import MemorySink
+from tests.resources.models import DemoState
+
+
+class TestWatchdog(unittest.TestCase):
+
+    def setUp(self) -> None:
+        logging.disable()
+        self.sink = MemorySink()
+        metrics.use(self.sink)
+        self.test_state = DemoState(1)
+        self.test_state.name = "test"
+        State().load(self.test_state)
+        self.watchdog = Watchdog(threshold=0.0, interval=60)
+
+    def tearDown(self) -> None:
+        self.watchdog.stop()
+        State._ssm.clear()
+        logging.disable(logging.NOTSET)
+
+    def test_lock_timing(self):
+        """
+        Test lock wait and hold times are observed per model
+        """
+        with State(DemoState):
+            pass
+        self.assertEqual(self.sink.histogram("lock_wait", "DemoState").count, 1)  # type: ignore
+        self.assertEqual(self.sink.histogram("lock_hold", "DemoState").count, 1)  # type: ignore
+        self.assertEqual(self.sink.value("lock_contention", "DemoState"), 0)
+
+    def test_scan(self):
+        """
+        Test held locks are reported once per acquisition
+        """
+        self.assertEqual(self.watchdog.scan(), 0)
+        with patch.object(self.watchdog, "_logger") as logger:
+            with State(DemoState):
+                self.assertEqual(self.watchdog.scan(), 1)
+                self.assertEqual(self.watchdog.scan(), 0)
+            logger.warning.assert_called_once()
+        self.assertEqual(self.watchdog.scan(), 0)
+        self.assertEqual(self.sink.value("lock_watchdog", "DemoState"), 1)
+
+    def test_start_stop(self):
+        """
+        Test watchdog thread lifecycle
+        """
+        with self.watchdog:
+            self.assertTrue(self.watchdog._thread.is_alive())  # type: ignore
+        self.assertIsNone(self.watchdog._thread)
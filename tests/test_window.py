@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Windowed Aggregation Unittests
+==============================
+Modified: 2026-10
+"""
+
+import math
+import unittest
+import logging
+from unittest.mock import patch
+
+from myosin import State
+from myosin.state import window
+from tests.resources.models import DemoState
+
+
+class TestWindow(unittest.TestCase):
+
+    def setUp(self) -> None:
+        logging.disable()
+        self.test_state = DemoState(1)
+        self.test_state.name = 0
+        self.state = State()
+        self.state.load(self.test_state)
+
+    def tearDown(self) -> None:
+        self.state._ssm.clear()
+        logging.disable(logging.NOTSET)
+
+    def commit(self, *values) -> None:
+        with State(DemoState) as state:
+            for value in values:
+                model = state.checkout(DemoState)
+                model.name = value
+                state.commit(model)
+
+    def test_count_window(self):
+        """
+        Test count window aggregates track the most recent commits
+        """
+        win = self.state.window(DemoState, "name", size=3)
+        self.assertEqual(win.count, 0)
+        self.assertTrue(math.isnan(win.mean))
+        self.commit(5, 1, 3, 2, 4)
+        self.assertEqual(win.count, 3)
+        self.assertEqual(win.sum, 9)
+        self.assertEqual(win.mean, 3)
+        self.assertEqual(win.min, 2)
+        self.assertEqual(win.max, 4)
+        self.assertEqual(win.last, 4)
+        self.assertEqual(list(win.values()), [3, 2, 4])
+
+    @patch.object(window.time, "monotonic")
+    def test_time_window(self, mock_time):
+        """
+        Test time window expiry and rate of change
+        """
+        win = self.state.window(DemoState, "name", period=10)
+        for now, value in ((0, 10), (5, 20), (10, 30), (15, 40)):
+            mock_time.return_value = now
+            self.commit(value)
+        self.assertEqual(win.count, 3)
+        self.assertEqual(win.min, 20)
+        self.assertEqual(win.rate, 2)
+        mock_time.return_value = 30
+        self.assertEqual(win.count, 0)
+
+    def test_capacity(self):
+        """
+        Test full time windows drop the oldest samples
+        """
+        win = self.state.window(DemoState, "name", period=60, capacity=2)
+        self.commit(9, 1, 2)
+        self.assertEqual(win.serialize()['count'], 2)
+        self.assertEqual(win.max, 2)
+
+    def test_close(self):
+        """
+        Test closed windows and non-numeric values are not updated
+        """
+        win = self.state.window(DemoState, "name", size=2)
+        self.commit("a")
+        self.assertEqual(win.count, 0)
+        win.close()
+        self.commit(1)
+        self.assertEqual(win.count, 0)
+
+    def test_invalid(self):
+        """
+        Test window configuration validation
+        """
+        with self.assertRaises(ValueError):
+            self.state.window(DemoState, "name")
+        with self.assertRaises(ValueError):
+            self.state.window(DemoState, "name", size=1, period=1)
+        with self.assertRaises(ValueError):
+            self.state.window(DemoState, "name", size=0)